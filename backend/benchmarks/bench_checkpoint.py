@@ -0,0 +1,147 @@
+"""
+Cost of session checkpoints and how fast a show resumes from one.
+
+  - write: snapshot + encode on the event loop, then the SQLite write on the
+    checkpoint thread, for a show `--rounds` rounds in;
+  - resume: a fresh store (as in a new job process) loading and restoring
+    the snapshot, then the host's first audio through a stand-in TTS.
+
+    uv run python benchmarks/bench_checkpoint.py --writes 500 --resumes 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import AgentSession
+
+from agent import REACTION_TEMPLATES, SpotlightHost, catalog_store
+from checkpoint import Checkpointer, CheckpointStore, encode, restore, snapshot
+from performance import PerformanceAnalyzer
+from scenario_catalog import ScenarioDeck
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM
+
+PERFORMANCE = (
+    "Your majesty, I assure you the crown was never lost, merely relocated by a cat with impeccable taste. "
+    "As your royal caretaker I have followed the paw prints to the bakery, where the suspect was seen "
+    "wearing it at a jaunty angle and demanding croissants. "
+)
+
+
+def show_state(rounds: int) -> SessionState:
+    state = SessionState("bench")
+    state.deck = ScenarioDeck(catalog_store)
+    state.player_name = "Ana"
+    analyzer = PerformanceAnalyzer()
+    for i in range(rounds):
+        scene = state.deck.draw()
+        analyzer.start(scene)
+        analyzer.observe(PERFORMANCE, is_final=True, at=float(i))
+        state.rounds.append({
+            "round_index": i + 1,
+            "scenario_id": scene.get("id"),
+            "scenario_title": scene.get("title"),
+            "scenario_prompt": scene.get("scenario"),
+            "player_text": PERFORMANCE,
+            "host_reaction": REACTION_TEMPLATES["positive"][i % 3],
+            "reaction_tone": "positive",
+            "performance": analyzer.finish().summary(),
+            "timestamp": "2026-01-01T00:00:00Z",
+        })
+    state.current_round = rounds
+    state.current_scenario = state.deck.draw()
+    state.phase = "waiting_for_improv"
+    return state
+
+
+def pct(samples: list, q: float) -> float:
+    return sorted(samples)[min(int(len(samples) * q), len(samples) - 1)]
+
+
+async def bench_writes(path: str, state: SessionState, writes: int) -> None:
+    encode_us, write_ms = [], []
+    store = CheckpointStore(path)
+    for _ in range(writes):
+        started = time.perf_counter()
+        body = encode(snapshot(state))
+        encoded = time.perf_counter()
+        store.save("room", body, time.time())
+        encode_us.append((encoded - started) * 1e6)
+        write_ms.append((time.perf_counter() - encoded) * 1000)
+    store.close()
+    print(f"snapshot: {len(body)} bytes compressed ({len(json.dumps(snapshot(state)))} as JSON)")
+    print(f"  on the loop (snapshot + encode): median {statistics.median(encode_us):6.1f} us, p95 {pct(encode_us, 0.95):6.1f} us")
+    print(f"  sqlite write (checkpoint thread): median {statistics.median(write_ms):6.2f} ms, p95 {pct(write_ms, 0.95):6.2f} ms")
+
+    # the host's view: save() returns before the write
+    checkpoints = Checkpointer(CheckpointStore(path))
+    calls = []
+    for _ in range(writes):
+        started = time.perf_counter()
+        checkpoints.save("room", state)
+        calls.append((time.perf_counter() - started) * 1e6)
+        await asyncio.sleep(0)
+    await checkpoints.flush()
+    print(f"  Checkpointer.save() call: median {statistics.median(calls):6.1f} us ({checkpoints.written} of {writes} written after collapsing)")
+    await checkpoints.aclose()
+
+
+async def resume_once(path: str, tts_latency: float) -> tuple:
+    started = time.perf_counter()
+    checkpoints = Checkpointer(CheckpointStore(path))
+    state = SessionState("resumed")
+    state.deck = ScenarioDeck(catalog_store)
+    restore(state, await checkpoints.load("room"))
+    restored = time.perf_counter()
+
+    scripted = ScriptedLLM(lambda _ctx: "Hello!", ttft=0.5)
+    session = AgentSession(llm=scripted, tts=FakeTTS(latency=tts_latency))
+    audio = CaptureAudioOutput()
+    session.output.audio = audio
+    try:
+        entered = time.perf_counter()
+        await session.start(SpotlightHost(state))
+        first = await audio.wait_for_first_frame()
+    finally:
+        await session.aclose()
+    await checkpoints.aclose()
+    return (restored - started) * 1000, (first - entered) * 1000, scripted.requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=3, help="rounds played before the snapshot")
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--tts-latency", type=float, default=0.25, help="stand-in TTS first byte (s)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.db")
+        await bench_writes(path, show_state(args.rounds), args.writes)
+
+        restore_ms, audio_ms, requests = [], [], 0
+        for _ in range(args.resumes):
+            r, a, n = await resume_once(path, args.tts_latency)
+            restore_ms.append(r)
+            audio_ms.append(a)
+            requests += n
+        print(f"resume: load + restore median {statistics.median(restore_ms):6.2f} ms, p95 {pct(restore_ms, 0.95):6.2f} ms")
+        print(
+            f"  first audio after start median {statistics.median(audio_ms):6.0f} ms"
+            f" (TTS first byte {args.tts_latency * 1000:.0f} ms, {requests} LLM requests)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""
+Cold-start benchmark for the agent worker, offline with stand-in plugins.
+
+Measures:
+  1. process spawn -> ready to accept a job (interpreter start, imports, prewarm)
+  2. job assignment -> first greeting audio, with prewarmed assets vs built cold
+
+    uv run python benchmarks/bench_cold_start.py --spawns 5 --jobs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+
+def use_stand_ins(agent_module) -> None:
+    """
+    Swap the network-backed factories for local stand-ins. VAD, noise
+    cancellation options, catalog and prompt stay real.
+    """
+    from stand_ins import FakeSTT, FakeTTS, ScriptedLLM
+    from tts_cache import CachedTTS
+
+    agent_module.build_stt = lambda: FakeSTT()
+    agent_module.build_llm = lambda: ScriptedLLM(lambda _ctx: "Welcome to Improv Spotlight!", ttft=0.2)
+    agent_module.build_cached_tts = lambda: CachedTTS(FakeTTS(latency=0.1), voice="stand-in")
+    agent_module.build_turn_detector = lambda: None  # needs a real job context
+
+
+def _child() -> None:
+    started = time.time()
+    import agent
+
+    imported = time.time()
+    use_stand_ins(agent)
+    userdata: dict = {}
+    report = agent.run_prewarm(userdata, agent.prewarm_steps())
+    print(json.dumps({
+        "ready_at": time.time(),
+        "started_at": started,
+        "import_ms": (imported - started) * 1000,
+        "report": report,
+    }))
+
+
+def measure_spawns(n: int) -> None:
+    totals, imports = [], []
+    steps: dict = {}
+    for _ in range(n):
+        spawned = time.time()
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        ).stdout.strip().splitlines()[-1]
+        res = json.loads(out)
+        totals.append((res["ready_at"] - spawned) * 1000)
+        imports.append(res["import_ms"])
+        for name, r in res["report"].items():
+            steps.setdefault(name, []).append(r["ms"])
+
+    print(f"spawn -> ready: median {statistics.median(totals):.0f} ms (n={n})")
+    print(f"  imports:          {statistics.median(imports):8.1f} ms")
+    for name, ms in steps.items():
+        print(f"  prewarm {name:<18}{statistics.median(ms):8.1f} ms")
+
+
+async def _greeting_latency(prewarmed: bool) -> float:
+    import agent
+    from session_state import SessionState
+    from stand_ins import CaptureAudioOutput
+
+    userdata: dict = {}
+    if prewarmed:
+        agent.run_prewarm(userdata, agent.prewarm_steps())
+    else:
+        # without prewarm the first draw reads the scenarios file on the job path
+        agent.catalog_store._catalog = None
+
+    assigned = time.perf_counter()
+    session = agent.build_session(userdata)
+    audio = CaptureAudioOutput()
+    session.output.audio = audio
+    host = agent.SpotlightHost(
+        SessionState(),
+        instructions=agent.take_asset(userdata, "host_prompt", agent.host_system_prompt),
+    )
+    await session.start(host)
+    first = await audio.wait_for_first_frame()
+    await session.aclose()
+    return (first - assigned) * 1000
+
+
+async def measure_jobs(n: int) -> None:
+    import agent
+
+    use_stand_ins(agent)
+    for prewarmed in (False, True):
+        samples = [await _greeting_latency(prewarmed) for _ in range(n)]
+        label = "prewarmed" if prewarmed else "cold"
+        print(f"job -> first greeting ({label:>9}): median {statistics.median(samples):7.1f} ms (n={n})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--spawns", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child()
+        return
+    measure_spawns(args.spawns)
+    asyncio.run(measure_jobs(args.jobs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Prompt size per LLM request across a whole show, with the bounded context
+view (earlier rounds summarized) and with the full chat history.
+
+Runs offline with the load harness's scripted host; prompt tokens are the
+stand-in LLM's estimate (about 4 characters per token):
+
+    uv run python benchmarks/bench_context.py --rounds 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import Agent, AgentSession
+
+from agent import SpotlightHost
+from load_harness import host_script
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM
+from tracing import TurnTracer
+
+
+class FullContextHost(SpotlightHost):
+    """
+    The host without the context window: every request gets the whole history.
+    """
+
+    async def llm_node(self, chat_ctx, tools, model_settings):
+        async for chunk in Agent.default.llm_node(self, chat_ctx, tools, model_settings):
+            yield chunk
+
+
+async def prompt_tokens_per_round(host_cls: type, rounds: int):
+    state = SessionState("bench-context")
+    state.max_rounds = rounds
+    tracer = TurnTracer(state)
+    session = AgentSession(llm=ScriptedLLM(host_script, ttft=0, token_delay=0), tts=FakeTTS(latency=0))
+    session.output.audio = CaptureAudioOutput()
+    tracer.attach(session)
+    try:
+        await session.start(host_cls(state))
+        await session.run(user_input="My name is Ada")
+        for _ in range(rounds):
+            await session.run(user_input="I'm ready")
+            await session.run(user_input="I hand the talking soup a tiny microphone and let it host the dinner. " * 6)
+            await session.run(user_input="End scene")
+    finally:
+        await session.aclose()
+    return tracer.prompt_tokens
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=4)
+    args = parser.parse_args()
+
+    results = {
+        "full": await prompt_tokens_per_round(FullContextHost, args.rounds),
+        "bounded": await prompt_tokens_per_round(SpotlightHost, args.rounds),
+    }
+    print("max prompt tokens per request, by round")
+    print(f"{'round':>5} {'full':>8} {'bounded':>8}")
+    for round_no in sorted(results["full"]):
+        full = max(results["full"][round_no])
+        bounded = max(results["bounded"].get(round_no, [0]))
+        print(f"{round_no:>5} {full:>8} {bounded:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Time to first reaction audio after "End scene", with and without the
+fast-reaction path (SPOTLIGHT_FAST_REACTIONS).
+
+Runs offline against the real SpotlightHost using stand-in LLM and TTS:
+
+    uv run python benchmarks/bench_fast_reactions.py --rounds 20 --ttft 0.4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import AgentSession, llm
+
+from agent import SpotlightHost
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM, ToolCall, last_item
+
+REACTION_STAND_IN = (
+    "Great energy throughout! Consider letting the reaction breathe a little longer for bigger laughs."
+)
+
+
+class ReactionOnlyHost(SpotlightHost):
+    """
+    Scene look-ahead off, so each boundary times the reaction alone.
+    """
+
+    def _prepare_round(self, round_number: int) -> None:
+        pass
+
+
+def host_script(chat_ctx: llm.ChatContext):
+    """
+    Minimal LLM behaviour for one round boundary.
+    """
+    item = last_item(chat_ctx)
+    if item is None:
+        return None
+    if item.type == "message" and item.role == "user":
+        return ToolCall("complete_improv")
+    if item.type == "function_call_output" and item.name == "complete_improv":
+        if "reaction_spoken" in item.output:
+            return ToolCall("next_scene")
+        return REACTION_STAND_IN
+    if item.type == "function_call_output" and item.name == "next_scene":
+        return "Round two! You are a chef whose soup keeps talking back."
+    return None
+
+
+async def time_round_boundaries(fast: bool, rounds: int, ttft: float, tts_latency: float) -> list:
+    state = SessionState()
+    state.max_rounds = rounds + 1  # keep every boundary on the "continue" path
+    host = ReactionOnlyHost(state, fast_reactions=fast)
+    audio = CaptureAudioOutput()
+    session = AgentSession(llm=ScriptedLLM(host_script, ttft=ttft), tts=FakeTTS(latency=tts_latency))
+    session.output.audio = audio
+    await session.start(host)
+
+    samples = []
+    try:
+        for _ in range(rounds):
+            await host.next_scene(None)
+            audio.reset()
+            started = time.perf_counter()
+            result = session.run(user_input="End scene")
+            first_audio = await audio.wait_for_first_frame()
+            samples.append(first_audio - started)
+            await result
+    finally:
+        await session.aclose()
+    return samples
+
+
+def _report(label: str, samples: list) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    print(
+        f"{label:>5}: median {statistics.median(ms):7.1f} ms"
+        f"  p95 {ms[int(0.95 * (len(ms) - 1))]:7.1f} ms  (n={len(ms)})"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--ttft", type=float, default=0.4, help="stand-in LLM time to first token (s)")
+    parser.add_argument("--tts-latency", type=float, default=0.1, help="stand-in TTS first-byte latency (s)")
+    args = parser.parse_args()
+
+    print(f"time to first reaction audio after 'End scene' (LLM ttft={args.ttft}s, TTS={args.tts_latency}s)")
+    for fast in (False, True):
+        samples = await time_round_boundaries(fast, args.rounds, args.ttft, args.tts_latency)
+        _report("on" if fast else "off", samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Time to first audio of streamed LLM replies: whole-sentence tokenizer (the
+previous default) versus sending the first clause early.
+
+The LLM and TTS are stand-ins: the reply streams word by word after `--ttft`,
+and every TTS request answers after `--tts-latency`. Audio goes through the
+same StreamAdapter with text pacing the worker uses.
+
+    uv run python benchmarks/bench_first_clause.py --runs 5 --word-delay 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import Agent, AgentSession, tokenize, tts
+
+from first_clause import FirstClauseTokenizer
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM
+
+INTROS = [
+    "Ladies and gentlemen, welcome back to the stage for round two, where our fearless performer "
+    "becomes a wedding planner whose bride has just eloped with the caterer. Take it away!",
+    "Round three is a doozy: you are a pirate landlord collecting rent in doubloons from tenants "
+    "who insist they paid in seashells last Tuesday. Show me what you've got.",
+    "What a performance that was, truly one for the history books, full of heart and nonsense in "
+    "equal measure. Let's see if you can top it.",
+    "Picture a quiet library at midnight where every book is whispering its own ending and you are "
+    "the only librarian brave enough to listen. Begin whenever you're ready.",
+]
+
+
+def tokenizers(args: argparse.Namespace) -> dict:
+    sentences = tokenize.basic.SentenceTokenizer(min_sentence_len=2)
+    return {
+        "sentence": sentences,
+        "first clause": FirstClauseTokenizer(sentences, max_words=args.max_words, max_wait=args.max_wait),
+    }
+
+
+async def time_to_first_audio(tokenizer: tokenize.SentenceTokenizer, intro: str, args: argparse.Namespace) -> tuple:
+    synth = FakeTTS(latency=args.tts_latency)
+    audio = CaptureAudioOutput()
+    session = AgentSession(
+        llm=ScriptedLLM(lambda _ctx: intro, ttft=args.ttft, token_delay=args.word_delay),
+        tts=tts.StreamAdapter(tts=synth, sentence_tokenizer=tokenizer, text_pacing=True),
+    )
+    session.output.audio = audio
+    try:
+        await session.start(Agent(instructions="You are the host."))
+        started = time.perf_counter()
+        result = session.run(user_input="Next scene please")
+        first = await audio.wait_for_first_frame()
+        await result
+    finally:
+        await session.aclose()
+    return (first - started) * 1000, synth.calls[0]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--ttft", type=float, default=0.3, help="stand-in LLM time to first token (s)")
+    parser.add_argument("--word-delay", type=float, default=0.02, help="stand-in LLM delay per word (s)")
+    parser.add_argument("--tts-latency", type=float, default=0.25, help="stand-in TTS first byte (s)")
+    parser.add_argument("--max-words", type=int, default=12)
+    parser.add_argument("--max-wait", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for label, tokenizer in tokenizers(args).items():
+        samples, firsts = [], []
+        for _ in range(args.runs):
+            for intro in INTROS:
+                ms, first_chunk = await time_to_first_audio(tokenizer, intro, args)
+                samples.append(ms)
+                firsts.append(len(first_chunk.split()))
+        print(
+            f"{label:>12}: time to first audio median {statistics.median(samples):6.0f} ms,"
+            f" max {max(samples):6.0f} ms, first chunk {statistics.median(firsts):.0f} words (n={len(samples)})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
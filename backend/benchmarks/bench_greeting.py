@@ -0,0 +1,100 @@
+"""
+Time from session start to the first greeting audio, for the previous
+greeting (one LLM reply after a one-off name lookup) and the speculative one
+(fixed opening line straight away, name folded in when it arrives).
+
+Runs offline with stand-in LLM/TTS and a fake room whose player joins
+`--name-delay` seconds after the session starts:
+
+    uv run python benchmarks/bench_greeting.py --runs 10 --ttft 0.4 --name-delay 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import AgentSession
+
+import agent
+from player_identity import PlayerNameResolver, player_name_from_metadata
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeRoom, FakeTTS, ScriptedLLM
+
+
+class PreviousGreetingHost(agent.SpotlightHost):
+    """
+    The greeting as it was: look the name up once, then one LLM reply that
+    either uses it or asks for it.
+    """
+
+    async def on_enter(self) -> None:
+        self.state.phase = "intro"
+        room = self.player_names.room
+        for participant in room.remote_participants.values():
+            self.state.player_name = player_name_from_metadata(participant.metadata)
+        if self.state.player_name:
+            instructions = f"Welcome {self.state.player_name}, then explain: '{agent.RULES_SCRIPT}'"
+        else:
+            instructions = f"Explain: '{agent.RULES_SCRIPT} {agent.ASK_NAME_LINE}'"
+        await self.session.generate_reply(instructions=instructions)
+
+
+async def greet_once(host_cls: type, ttft: float, tts_latency: float, name_delay: float):
+    room = FakeRoom()
+    resolver = PlayerNameResolver(room)
+    resolver.start()
+    state = SessionState()
+    asked_name = []
+
+    def script(chat_ctx):
+        last = chat_ctx.items[-1] if chat_ctx.items else None
+        asked_name.append(last is not None and agent.ASK_NAME_LINE in (last.text_content or ""))
+        return "Here is how the show works."
+
+    audio = CaptureAudioOutput()
+    session = AgentSession(llm=ScriptedLLM(script, ttft=ttft), tts=FakeTTS(latency=tts_latency))
+    session.output.audio = audio
+
+    async def player_joins():
+        await asyncio.sleep(name_delay)
+        room.join("guest", json.dumps({"playerName": "Ada"}))
+
+    joiner = asyncio.create_task(player_joins())
+    started = time.perf_counter()
+    await session.start(host_cls(state, player_names=resolver))
+    first = await audio.wait_for_first_frame()
+    await joiner
+    await asyncio.sleep(ttft + 0.1)
+    await session.aclose()
+    return (first - started) * 1000, any(asked_name)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--ttft", type=float, default=0.4, help="stand-in LLM time to first token (s)")
+    parser.add_argument("--tts-latency", type=float, default=0.1, help="stand-in TTS first byte (s)")
+    parser.add_argument("--name-delay", type=float, default=0.3, help="player joins this late (s)")
+    args = parser.parse_args()
+
+    for label, host_cls in (("previous", PreviousGreetingHost), ("speculative", agent.SpotlightHost)):
+        results = [
+            await greet_once(host_cls, args.ttft, args.tts_latency, args.name_delay)
+            for _ in range(args.runs)
+        ]
+        ms = [r[0] for r in results]
+        asked = sum(r[1] for r in results)
+        print(
+            f"{label:>11}: first audio median {statistics.median(ms):7.1f} ms,"
+            f" asked for the name in {asked}/{len(results)} runs"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""
+Import-time budget for the agent module, based on `python -X importtime`.
+
+Runs a fresh interpreter per sample so module caches don't hide regressions,
+prints the heaviest direct imports, and exits non-zero if the median
+cumulative time for `import agent` exceeds --budget-ms or if any model plugin
+is imported eagerly:
+
+    uv run python benchmarks/bench_import_time.py --samples 5 --budget-ms 4000
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_profile(code: str) -> dict:
+    """
+    Cumulative microseconds per top-level import, and per direct dependency
+    of a top-level import, for one fresh interpreter.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": SRC},
+    )
+    top: dict = {}
+    children: dict = {}
+    loaded = []
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if not m:
+            continue
+        _self_us, cumulative_us, indent, name = m.groups()
+        loaded.append(name)
+        if not indent:
+            top[name] = int(cumulative_us)
+        elif len(indent) == 2:
+            children[name] = int(cumulative_us)
+    return {"top": top, "children": children, "loaded": loaded}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_profile("import agent") for _ in range(args.samples)]
+    agent_ms = statistics.median(r["top"].get("agent", 0) / 1000 for r in runs)
+    eager_plugins = sorted({m for r in runs for m in r["loaded"] if m.startswith("livekit.plugins.")})
+
+    print(f"import agent: median {agent_ms:.0f} ms (n={args.samples})")
+    heaviest = sorted(runs[-1]["children"].items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+    for name, us in heaviest:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    full = import_profile("import agent, providers; providers.import_plugins(providers.plugins_for_session())")
+    full_ms = sum(full["top"].values()) / 1000
+    print(f"import agent + all session plugins: {full_ms:.0f} ms")
+
+    failed = False
+    if eager_plugins:
+        print(f"FAIL: plugins imported by `import agent`: {', '.join(eager_plugins)}")
+        failed = True
+    if args.budget_ms is not None and agent_ms > args.budget_ms:
+        print(f"FAIL: import agent took {agent_ms:.0f} ms, budget {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+VAD inference: one Silero session per job process (today) versus the shared,
+batching sidecar.
+
+  throughput  N streams push 32 ms windows as fast as they are answered.
+              In process, each stream has its own ONNX session like separate
+              job processes do; with the sidecar they share one.
+  memory      private memory (USS) a job process spends on VAD, measured in a
+              fresh process, and the sidecar's own footprint.
+
+    uv run python benchmarks/bench_inference_sidecar.py --streams 1 8 32 64
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+import numpy as np  # noqa: E402
+
+WINDOW = 512
+
+
+def _windows(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (0.1 * rng.standard_normal((n, WINDOW))).astype(np.float32)
+
+
+def run_streams(models: list, windows: int) -> dict:
+    latencies: list = []
+    lock = threading.Lock()
+
+    def worker(model, audio) -> None:
+        mine = []
+        for w in audio:
+            started = time.perf_counter()
+            model(w)
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=worker, args=(m, _windows(windows, i))) for i, m in enumerate(models)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "rate": len(ms) / elapsed,
+        "p50": statistics.median(ms),
+        "p95": ms[int(0.95 * (len(ms) - 1))],
+    }
+
+
+def in_process_models(n: int) -> list:
+    from livekit.plugins.silero import onnx_model
+
+    return [
+        onnx_model.OnnxModel(onnx_session=onnx_model.new_inference_session(force_cpu=True), sample_rate=16000)
+        for _ in range(n)
+    ]
+
+
+def _uss_mb() -> float:
+    import psutil
+
+    return psutil.Process().memory_full_info().uss / 2**20
+
+
+def _job_child(mode: str, socket_path: str) -> None:
+    """
+    What a job process holds for VAD: a loaded VAD and one open stream.
+    """
+    import asyncio
+
+    from livekit.plugins import silero  # plugin import cost is paid either way
+
+    async def main() -> float:
+        before = _uss_mb()
+        if mode == "sidecar":
+            from inference_sidecar import SidecarVAD
+
+            vad = SidecarVAD(socket_path)
+        else:
+            vad = silero.VAD.load()
+        stream = vad.stream()
+        stream._model(np.zeros(WINDOW, dtype=np.float32))  # first inference allocates its buffers
+        used = _uss_mb() - before
+        await stream.aclose()
+        return used
+
+    print(json.dumps({"uss_mb": asyncio.run(main())}))
+
+
+def _sidecar_child(socket_path: str) -> None:
+    import asyncio
+
+    from inference_sidecar import serve
+
+    asyncio.run(serve(socket_path))
+
+
+def start_sidecar(socket_path: str) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, __file__, "--sidecar", socket_path], stderr=subprocess.DEVNULL)
+    while not os.path.exists(socket_path):
+        time.sleep(0.05)
+    return proc
+
+
+def job_uss(mode: str, socket_path: str) -> float:
+    out = subprocess.run(
+        [sys.executable, __file__, "--job", mode, socket_path], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])["uss_mb"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--windows", type=int, default=200, help="windows per stream")
+    parser.add_argument("--sidecar", help=argparse.SUPPRESS)
+    parser.add_argument("--job", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.sidecar:
+        _sidecar_child(args.sidecar)
+        return
+    if args.job:
+        _job_child(*args.job)
+        return
+
+    import psutil
+
+    from inference_sidecar import RemoteVADModel
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "vad.sock")
+        sidecar = start_sidecar(socket_path)
+        try:
+            print("throughput (windows/s, per-window latency)")
+            for n in args.streams:
+                local = run_streams(in_process_models(n), args.windows)
+                remote = run_streams(
+                    [RemoteVADModel(socket_path, 16000, fallback=lambda: None) for _ in range(n)], args.windows
+                )
+                print(
+                    f"  {n:3d} streams  in process {local['rate']:7.0f}/s p95 {local['p95']:5.2f} ms"
+                    f"   sidecar {remote['rate']:7.0f}/s p95 {remote['p95']:5.2f} ms"
+                )
+
+            local_mb = statistics.median(job_uss("local", socket_path) for _ in range(3))
+            client_mb = statistics.median(job_uss("sidecar", socket_path) for _ in range(3))
+            sidecar_mb = psutil.Process(sidecar.pid).memory_full_info().uss / 2**20
+            print("memory (USS)")
+            print(f"  per job: in-process VAD +{local_mb:.1f} MB, sidecar client +{client_mb:.1f} MB")
+            print(f"  sidecar process: {sidecar_mb:.1f} MB")
+            for n in args.streams:
+                print(
+                    f"  {n:3d} jobs: in process {n * local_mb:7.1f} MB"
+                    f"   sidecar {n * client_mb + sidecar_mb:7.1f} MB"
+                )
+        finally:
+            sidecar.terminate()
+            sidecar.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Scenario catalog load time and memory: JSON file vs compiled (memory-mapped
+SQLite) file, at a small and a very large catalog size.
+
+Each measurement runs in a fresh process that loads the catalog and draws a
+show's worth of scenarios. USS is the memory private to that process; pages
+of the compiled file stay in the shared page cache.
+
+    uv run python benchmarks/bench_scenario_store.py --sizes 100 100000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+CATEGORIES = ("comedy", "drama", "horror", "romance", "sci-fi", "western")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def write_catalog(path: str, n: int) -> None:
+    scenarios = [
+        {
+            "id": f"scenario-{i:06d}",
+            "title": f"The Improbable Situation No. {i}",
+            "scenario": (
+                f"You are character {i}, and something has gone delightfully wrong in scene {i}. "
+                "A stranger arrives with a strange request, the clock is ticking, and everyone "
+                "around you is counting on you to keep a straight face while it all unravels."
+            ),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "difficulty": DIFFICULTIES[i % len(DIFFICULTIES)],
+        }
+        for i in range(n)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"scenarios": scenarios}, f)
+
+
+def _child(path: str) -> None:
+    import psutil
+
+    from scenario_catalog import CatalogStore, ScenarioDeck
+
+    proc = psutil.Process()
+    before = proc.memory_full_info()
+    started = time.perf_counter()
+    store = CatalogStore(path)
+    store.load()
+    loaded = time.perf_counter()
+    deck = ScenarioDeck(store)
+    for _ in range(4):
+        deck.draw()
+    drawn = time.perf_counter()
+    after = proc.memory_full_info()
+    print(json.dumps({
+        "load_ms": (loaded - started) * 1000,
+        "draw_ms": (drawn - loaded) * 1000,
+        "rss_mb": (after.rss - before.rss) / 2**20,
+        "uss_mb": (after.uss - before.uss) / 2**20,
+    }))
+
+
+def measure(path: str, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", path], check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 100000])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child)
+        return
+
+    from scenario_store import compile_catalog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            json_path = os.path.join(tmp, f"scenarios-{n}.json")
+            db_path = os.path.join(tmp, f"scenarios-{n}.db")
+            write_catalog(json_path, n)
+            started = time.perf_counter()
+            compile_catalog(json_path, db_path)
+            compile_ms = (time.perf_counter() - started) * 1000
+            print(
+                f"{n} scenarios: json {os.path.getsize(json_path) / 2**20:.1f} MB,"
+                f" compiled {os.path.getsize(db_path) / 2**20:.1f} MB in {compile_ms:.0f} ms"
+            )
+            for label, path in (("json", json_path), ("compiled", db_path)):
+                m = measure(path, args.runs)
+                print(
+                    f"  {label:>8}: load {m['load_ms']:8.1f} ms  draw x4 {m['draw_ms']:6.2f} ms"
+                    f"  rss +{m['rss_mb']:6.1f} MB  uss +{m['uss_mb']:6.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
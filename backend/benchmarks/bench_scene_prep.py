@@ -0,0 +1,89 @@
+"""
+Gap between "End scene" and the first audio of the next scene's intro, with
+the next scene prepared during the performance and without.
+
+Fast reactions are on in both runs, so the only difference is whether the
+LLM has to call next_scene and write the intro after the reaction:
+
+    uv run python benchmarks/bench_scene_prep.py --rounds 3 --ttft 0.4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import AgentSession, llm
+
+from agent import SpotlightHost
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM, ToolCall, last_item
+
+
+class UnpreparedHost(SpotlightHost):
+    """
+    The host without look-ahead: every scene is picked and written on demand.
+    """
+
+    def _prepare_round(self, round_number: int) -> None:
+        pass
+
+
+def host_script(chat_ctx: llm.ChatContext):
+    item = last_item(chat_ctx)
+    if item is None:
+        return None
+    if item.type == "message" and item.role == "user":
+        if item.text_content == "End scene":
+            return ToolCall("complete_improv")
+        return ToolCall("next_scene")
+    if item.type == "function_call_output" and item.name == "complete_improv":
+        return ToolCall("next_scene")
+    if item.type == "function_call_output" and item.name == "next_scene":
+        return "Round two! You are a chef whose soup keeps talking back. Start when you're ready."
+    return None
+
+
+async def round_gaps(host_cls: type, rounds: int, ttft: float, tts_latency: float) -> list:
+    state = SessionState()
+    state.max_rounds = rounds + 1  # keep every boundary on the "continue" path
+    audio = CaptureAudioOutput()
+    session = AgentSession(llm=ScriptedLLM(host_script, ttft=ttft), tts=FakeTTS(latency=tts_latency))
+    session.output.audio = audio
+    await session.start(host_cls(state, fast_reactions=True))
+
+    gaps = []
+    try:
+        await session.run(user_input="I'm ready")
+        for _ in range(rounds):
+            # the player performs long enough for the next intro to render
+            await asyncio.sleep(0.5)
+            audio.reset()
+            started = time.perf_counter()
+            await session.run(user_input="End scene")
+            while len(audio.segment_starts) < 2:
+                await asyncio.sleep(0.005)
+            gaps.append((audio.segment_starts[1] - started) * 1000)
+    finally:
+        await session.aclose()
+    return gaps
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--ttft", type=float, default=0.4)
+    parser.add_argument("--tts-latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    for label, host_cls in (("on demand", UnpreparedHost), ("prepared", SpotlightHost)):
+        gaps = await round_gaps(host_cls, args.rounds, args.ttft, args.tts_latency)
+        print(f"{label:>9}: End scene -> next intro audio median {statistics.median(gaps):7.1f} ms (n={len(gaps)})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""
+Time from the player finishing "End scene" to the first audio of the host's
+reaction: through the normal turn (final transcript, endpointing, LLM tool
+call) versus keyword spotting on interim transcripts. The spotter acts on the
+second interim that ends with the phrase, or on the final if that comes first.
+
+The STT and turn-detector delays are simulated; LLM and TTS are stand-ins:
+
+    uv run python benchmarks/bench_stop_phrase.py --rounds 5 --ttft 0.4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import AgentSession, UserInputTranscribedEvent, llm
+
+from agent import STOP_PHRASES, SpotlightHost
+from session_state import SessionState
+from stand_ins import (
+    CaptureAudioOutput,
+    FakeTTS,
+    ScriptedLLM,
+    ToolCall,
+    last_item,
+    transcribe,
+)
+from stop_phrases import StopPhraseSpotter
+
+
+def host_script(chat_ctx: llm.ChatContext):
+    item = last_item(chat_ctx)
+    if item is None:
+        return None
+    if item.type == "message" and item.role == "user":
+        return ToolCall("complete_improv")
+    if item.type == "function_call_output" and item.name == "complete_improv":
+        if "reaction_spoken" in item.output:
+            return None
+        return "Great energy throughout! Consider letting the reaction breathe a little longer."
+    return None
+
+
+async def time_reactions(mode: str, args: argparse.Namespace) -> list:
+    state = SessionState()
+    state.max_rounds = args.rounds + 1
+    spotter = StopPhraseSpotter(STOP_PHRASES) if mode == "spotted" else None
+    host = SpotlightHost(state, fast_reactions=(mode != "turn"), stop_phrases=spotter)
+    # time the reaction alone, not a prepared next scene
+    host._prepare_round = lambda _n: None
+    audio = CaptureAudioOutput()
+    session = AgentSession(llm=ScriptedLLM(host_script, ttft=args.ttft), tts=FakeTTS(latency=args.tts_latency))
+    session.output.audio = audio
+    await session.start(host)
+
+    samples = []
+    try:
+        for _ in range(args.rounds):
+            await host.next_scene(None)
+            await asyncio.sleep(0)
+            while session.current_speech is not None:
+                await session.current_speech.wait_for_playout()
+                await asyncio.sleep(0)
+            transcribe(session, "I juggle the talking soup.")
+            audio.reset()
+            host._stop_task = None
+            spoken = time.perf_counter()  # the player just finished "End scene"
+            if mode == "spotted":
+                await asyncio.sleep(args.interim_delay)
+                elapsed = args.interim_delay
+                while host._stop_task is None and elapsed < args.final_delay:
+                    session.emit(
+                        "user_input_transcribed",
+                        UserInputTranscribedEvent(transcript="end scene", is_final=False),
+                    )
+                    await asyncio.sleep(args.interim_interval)
+                    elapsed += args.interim_interval
+                if host._stop_task is None:
+                    session.emit(
+                        "user_input_transcribed",
+                        UserInputTranscribedEvent(transcript="end scene", is_final=True),
+                    )
+                await audio.wait_for_first_frame()
+                await host._stop_task
+            else:
+                await asyncio.sleep(args.final_delay + args.endpointing)
+                result = session.run(user_input="End scene")
+                await audio.wait_for_first_frame()
+                await result
+            samples.append((audio.first_frame_at - spoken) * 1000)
+            await asyncio.sleep(host.stop_phrases.debounce if host.stop_phrases else 0)
+    finally:
+        await session.aclose()
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--ttft", type=float, default=0.4, help="stand-in LLM time to first token (s)")
+    parser.add_argument("--tts-latency", type=float, default=0.1, help="stand-in TTS first byte (s)")
+    parser.add_argument("--interim-delay", type=float, default=0.15, help="speech -> first interim (s)")
+    parser.add_argument("--interim-interval", type=float, default=0.05, help="between interims (s)")
+    parser.add_argument("--final-delay", type=float, default=0.3, help="speech -> final transcript (s)")
+    parser.add_argument("--endpointing", type=float, default=0.5, help="end-of-turn decision delay (s)")
+    args = parser.parse_args()
+
+    labels = {
+        "turn": "turn + LLM reaction",
+        "turn-fast": "turn + fast reaction",
+        "spotted": "keyword spotted",
+    }
+    for mode, label in labels.items():
+        ms = await time_reactions(mode, args)
+        print(f"{label:>21}: utterance -> reaction audio median {statistics.median(ms):7.1f} ms (n={len(ms)})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+Multi-session load test for one worker process, fully offline.
+
+Runs N concurrent simulated shows (greeting, name, every round) against the
+real SpotlightHost tools with stand-in LLM/TTS and a simulated STT delay, and
+reports tool-call latency percentiles, event-loop lag and RSS per session.
+With --ramp it increases N until the process saturates:
+
+    uv run python benchmarks/load_test.py --sessions 50
+    uv run python benchmarks/load_test.py --ramp 10,25,50,100,200,400
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from load_harness import LoadConfig, LoadReport, find_saturation, run_load
+
+
+def print_report(report: LoadReport) -> None:
+    s = report.summary()
+    print(
+        f"{s['sessions']:>5} sessions | tool p50/p95/p99 "
+        f"{s['tool_p50_ms']:6.1f}/{s['tool_p95_ms']:6.1f}/{s['tool_p99_ms']:6.1f} ms"
+        f" | loop lag p50/p95/p99 {s['loop_lag_p50_ms']:6.1f}/{s['loop_lag_p95_ms']:6.1f}/"
+        f"{s['loop_lag_p99_ms']:6.1f} ms | RSS/session {s['rss_per_session_kib']:7.1f} KiB"
+        f" | {s['wall_s']:5.1f} s | failures {s['failures']}"
+    )
+    for failure in report.failures[:5]:
+        print(f"    {failure}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--ramp", type=str, default=None, help="comma-separated session counts")
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--stt-latency", type=float, default=0.15)
+    parser.add_argument("--llm-ttft", type=float, default=0.3)
+    parser.add_argument("--tts-latency", type=float, default=0.1)
+    parser.add_argument("--perform", type=float, default=1.0, help="seconds each improv lasts")
+    parser.add_argument("--max-lag-ms", type=float, default=100.0)
+    parser.add_argument("--max-tool-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    cfg = LoadConfig(
+        stt_latency=args.stt_latency,
+        llm_ttft=args.llm_ttft,
+        tts_latency=args.tts_latency,
+        perform_seconds=args.perform,
+        rounds=args.rounds,
+    )
+
+    if args.ramp:
+        levels = [int(n) for n in args.ramp.split(",")]
+        saturated = await find_saturation(
+            levels, cfg, args.max_lag_ms / 1000, args.max_tool_ms / 1000, on_level=print_report
+        )
+        if saturated is None:
+            print(f"no saturation up to {levels[-1]} sessions")
+        else:
+            print(f"saturated at {saturated} sessions (p95 lag > {args.max_lag_ms} ms or tool > {args.max_tool_ms} ms)")
+    else:
+        print_report(await run_load(args.sessions, cfg))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+Replay a recorded show against this build and compare per-stage latencies.
+
+Record shows in the worker with SPOTLIGHT_RECORD_DIR=data/recordings, then:
+
+    uv run python benchmarks/replay_show.py data/recordings/<job>.trace.jsonl.gz
+    uv run python benchmarks/replay_show.py show.trace.jsonl.gz --tolerance 0.1 --save replay.trace.jsonl.gz
+
+Exits with status 1 when a stage's median got slower by more than
+--tolerance (and --min-ms), so it can gate a build.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agent import (
+    FAST_REACTIONS,
+    KEYWORD_STOP,
+    STOP_PHRASES,
+    TracedSpotlightHost,
+    host_system_prompt,
+)
+from replay import Trace, compare_traces, regressions, replay_show
+from stop_phrases import StopPhraseSpotter
+
+
+def build_host(state, tracer):
+    # the host as the worker's entrypoint configures it
+    return TracedSpotlightHost(
+        state,
+        fast_reactions=FAST_REACTIONS,
+        instructions=host_system_prompt(),
+        tracer=tracer,
+        stop_phrases=StopPhraseSpotter(STOP_PHRASES) if KEYWORD_STOP else None,
+    )
+
+
+def fmt(value) -> str:
+    return f"{value:8.1f}" if value is not None else f"{'-':>8}"
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("trace", help="recorded show trace (.jsonl or .jsonl.gz)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown of a stage median")
+    parser.add_argument("--min-ms", type=float, default=20.0, help="slowdowns below this are never flagged")
+    parser.add_argument("--save", help="write the replay's own trace here")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    recorded = Trace.load(args.trace)
+    replayed = await replay_show(recorded, build_host)
+    if args.save:
+        replayed.save(args.save)
+
+    rows = compare_traces(recorded, replayed)
+    slower = regressions(rows, args.tolerance, args.min_ms)
+    print(f"{'stage':<28}{'n rec/new':>10}{'rec p50':>9}{'new p50':>9}{'rec p95':>9}{'new p95':>9}")
+    for stage, row in rows.items():
+        print(
+            f"{stage:<28}{row['recorded_n']:>5}/{row['replayed_n']:<4}{fmt(row['recorded_p50'])} {fmt(row['replayed_p50'])}"
+            f" {fmt(row['recorded_p95'])} {fmt(row['replayed_p95'])}{'  SLOWER' if stage in slower else ''}"
+        )
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
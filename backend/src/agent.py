@@ -1,27 +1,64 @@
 import asyncio
-import json
+import contextlib
+import inspect
 import logging
 import os
-import random
+import sys
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from dotenv import load_dotenv
+from typing import Any, Callable, Optional
 
+from dotenv import load_dotenv
 from livekit.agents import (
     Agent,
     AgentSession,
     JobContext,
     JobProcess,
-    RunContext,
+    JobRequest,
     RoomInputOptions,
+    RunContext,
+    StopResponse,
+    UserInputTranscribedEvent,
     WorkerOptions,
     cli,
     function_tool,
+    llm,
+    stt,
     tokenize,
+    tts,
 )
+from livekit.agents.voice.room_io import TextInputEvent
+from livekit.agents.worker import AgentServer
 
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from aggregates import Scoreboard
+from checkpoint import Checkpointer, CheckpointStore, checkpoint_key, restore
+from context_window import ContextWindow
+from first_clause import FirstClauseTokenizer
+from performance import choose_reaction
+from player_identity import PlayerNameResolver
+from providers import (
+    import_plugins,
+    llm_providers,
+    load_silero_vad,
+    multilingual_turn_detector,
+    noise_cancellation_bvc,
+    plugins_for_session,
+    plugins_for_worker,
+    sidecar_silero_vad,
+    stt_providers,
+    tts_providers,
+)
+from replay import SessionRecorder
+from round_log import RoundLogStore, RoundLogWriter
+from scenario_catalog import Catalog, CatalogStore, ScenarioDeck
+from scenario_store import compile_catalog
+from scene_prep import PreparedScene, ScenePrep
+from session_state import SessionState, registry
+from stop_phrases import StopPhraseSpotter
+from tracing import TraceFile, TurnTracer, record_host_tool, timed_tools
+from tts_cache import CachedTTS, normalize_text
+from warmup import PrewarmStep, run_prewarm, take_asset
+from worker_load import LoopLagProbe, WorkerLoad
 
 # ---------------------------------------------------------
 #  Basic logger and env
@@ -32,60 +69,86 @@ logger = logging.getLogger("improv_spotlight")
 load_dotenv(".env.local")
 load_dotenv(".env")
 
+# speak template reactions with session.say instead of an extra LLM turn
+FAST_REACTIONS = os.getenv("SPOTLIGHT_FAST_REACTIONS", "0").lower() in ("1", "true", "yes")
+
+# completed rounds for analytics (SQLite, WAL mode)
+ROUND_LOG_PATH = os.getenv(
+    "ROUND_LOG_PATH", os.path.join(os.path.dirname(__file__), "../data/rounds.db")
+)
+
+# periodic snapshot of the cross-show scoreboard; a warm start for the next
+# worker, while the round log stays the complete record
+SCOREBOARD_PATH = os.getenv(
+    "SPOTLIGHT_SCOREBOARD_PATH", os.path.join(os.path.dirname(__file__), "../data/scoreboard.json")
+)
+
+# end scenes on "End scene" in interim transcripts instead of waiting for the turn
+KEYWORD_STOP = os.getenv("SPOTLIGHT_KEYWORD_STOP", "1").lower() in ("1", "true", "yes")
+
+# per-turn latency histograms on the worker's /metrics (unset = off), and an
+# optional JSONL trace of every stage timing
+METRICS_PORT = os.getenv("SPOTLIGHT_METRICS_PORT")
+METRICS_MULTIPROC_DIR = os.getenv(
+    "SPOTLIGHT_METRICS_DIR", os.path.join(os.path.dirname(__file__), "../.cache/prometheus")
+)
+TRACE_PATH = os.getenv("SPOTLIGHT_TRACE_PATH")
+# when set, every show is recorded here for offline replay (benchmarks/replay_show.py)
+RECORD_DIR = os.getenv("SPOTLIGHT_RECORD_DIR")
+
+# admission: the worker reports full (and refuses new shows) above this load;
+# load is the worse of process-tree CPU and job event-loop lag / LAG_BUDGET
+LOAD_THRESHOLD = float(os.getenv("SPOTLIGHT_LOAD_THRESHOLD", "0.7"))
+LAG_BUDGET = float(os.getenv("SPOTLIGHT_LAG_BUDGET", "0.1"))
+# most prewarmed job processes kept idle; unset leaves LiveKit's default (it shrinks the pool as load rises)
+IDLE_PROCESSES = os.getenv("SPOTLIGHT_IDLE_PROCESSES")
+LOOP_LAG_DIR = os.getenv(
+    "SPOTLIGHT_LOOP_LAG_DIR", os.path.join(os.path.dirname(__file__), "../.cache/loop_lag")
+)
+# resume a show mid-way when its room is dispatched again after a crash or reconnect
+CHECKPOINTS = os.getenv("SPOTLIGHT_CHECKPOINTS", "1").lower() in ("1", "true", "yes")
+CHECKPOINT_PATH = os.getenv(
+    "SPOTLIGHT_CHECKPOINT_PATH", os.path.join(os.path.dirname(__file__), "../data/checkpoints.db")
+)
+CHECKPOINT_MAX_AGE = float(os.getenv("SPOTLIGHT_CHECKPOINT_MAX_AGE", "900"))
+
+# when set, VAD runs in the shared sidecar on this socket (`python src/agent.py inference-sidecar`)
+INFERENCE_SOCKET = os.getenv("SPOTLIGHT_INFERENCE_SOCKET")
+
 # path to your scenarios JSON file
 SCENARIOS_PATH = os.path.join(os.path.dirname(__file__), "../data/access_data.json")
+# compiled, memory-mapped form of the same file (`python src/agent.py compile-scenarios`)
+SCENARIOS_DB_PATH = os.getenv(
+    "SPOTLIGHT_SCENARIOS_DB", os.path.join(os.path.dirname(__file__), "../data/scenarios.db")
+)
 
 
 # ---------------------------------------------------------
-#  Session state container
+#  Scenario utils
 # ---------------------------------------------------------
-class SessionState:
+def build_catalog_store() -> CatalogStore:
     """
-    Holds state for a single improv session.
+    The compiled catalog if one was built, recompiled whenever the JSON file
+    is edited; else the JSON file itself.
     """
+    if os.path.exists(SCENARIOS_DB_PATH):
+        return CatalogStore(SCENARIOS_DB_PATH, source=SCENARIOS_PATH)
+    return CatalogStore(SCENARIOS_PATH)
 
-    def __init__(self):
-        self.player_name: Optional[str] = None
-        self.current_round: int = 0
-        self.max_rounds: int = 4
-        self.rounds: List[Dict[str, Any]] = []  # each: {scenario_id, title, prompt, player_text, host_reaction}
-        self.phase: str = "intro"  # intro | waiting_for_improv | reacting | finished
-        self.current_scenario: Optional[Dict[str, Any]] = None
-        self.used_ids: List[str] = []
-        self.all_scenarios: List[Dict[str, Any]] = []
-        self.improv_turns: int = 0
 
+# parsed once per process (see prewarm) and hot-reloaded on mtime change
+catalog_store = build_catalog_store()
 
-state = SessionState()
+# one writer per process, shared by every session it hosts
+round_log = RoundLogWriter(RoundLogStore(ROUND_LOG_PATH))
+scoreboard = Scoreboard(path=SCOREBOARD_PATH)
+checkpoints = Checkpointer(CheckpointStore(CHECKPOINT_PATH), max_age=CHECKPOINT_MAX_AGE)
 
 
-# ---------------------------------------------------------
-#  Scenario utils
-# ---------------------------------------------------------
-def load_scenarios() -> List[Dict[str, Any]]:
-    try:
-        with open(SCENARIOS_PATH, "r", encoding="utf-8") as f:
-            payload = json.load(f)
-            return payload.get("scenarios", [])
-    except FileNotFoundError:
-        logger.error(f"Scenarios file not found at {SCENARIOS_PATH}")
-        return []
-    except Exception as e:
-        logger.exception("Failed to load scenarios: %s", e)
-        return []
-
-
-def choose_unused_scenario() -> Optional[Dict[str, Any]]:
-    available = [s for s in state.all_scenarios if s.get("id") not in state.used_ids]
-    if not available:
-        # reset used list if we've exhausted scenarios
-        state.used_ids = []
-        available = state.all_scenarios[:]
-    if not available:
-        return None
-    choice = random.choice(available)
-    state.used_ids.append(choice.get("id"))
-    return choice
+def choose_unused_scenario(state: SessionState) -> Optional[dict[str, Any]]:
+    if state.deck is None:
+        state.deck = ScenarioDeck(catalog_store)
+    return state.deck.draw()
 
 
 # ---------------------------------------------------------
@@ -112,11 +175,13 @@ Show format:
    - Tell the player to "Start when ready" and instruct them they may say "End scene" to finish or pause for ~2.5 seconds.
    - Wait for the player's improvisation. Detect end via explicit phrase or pause.
    - When the player finishes, offer a short reaction: mention one thing that worked and one suggestion to try.
-   - Randomize reaction tone per round with roughly this distribution: 50% positive, 30% neutral, 20% gentle critique.
+   - complete_improv picks the reaction and its tone from how the scene went; use the reaction it returns.
 3. OUTRO: when rounds complete, give a short closing summary that highlights 2-3 standout moments and a final tip.
 
 Behavior rules:
-- Save each round to session state with scenario, player text, and host reaction.
+- When the player finishes, call complete_improv with no arguments; the performance is transcribed for you, so never repeat it back.
+- If a tool result says "reaction_spoken": true, the reaction was already said aloud. Do not repeat it; call next_scene right away without extra commentary.
+- If next_scene or complete_improv returns no result, the host lines (including the next scene's intro) were already said aloud. Do not repeat them; wait for the player.
 - If player says "stop game" or "end show" at any time, confirm and end the session gracefully.
 - If the player's content includes disallowed material, redirect briefly and ask them to try a different direction.
 
@@ -129,241 +194,540 @@ Always use plain English and follow the structure above.
 """
 
 
+# ---------------------------------------------------------
+#  Fixed host lines (also pre-rendered into the TTS cache)
+# ---------------------------------------------------------
+REACTION_TEMPLATES: dict[str, list[str]] = {
+    "positive": [
+        "That was wonderful — your choices felt honest and clear. Try stretching the pause before the punchline next time.",
+        "Really enjoyable — you nailed the character. You could push the physicality a bit more to sell it.",
+        "Great energy throughout! Consider letting the reaction breathe a little longer for bigger laughs."
+    ],
+    "neutral": [
+        "Solid performance — the scene was easy to follow. You might experiment with raising the stakes.",
+        "Good clarity and voice. Try adding one strong, specific detail to make it pop next round.",
+        "Nice phrasing. A bolder choice in the middle could make the scene stand out more."
+    ],
+    "gentle_critique": [
+        "Interesting idea, but it felt rushed. Slow down and let moments land to build impact.",
+        "Good attempt, though the character was a bit flat. Pick one strong trait and commit.",
+        "You had good instincts, but the stakes were low — choose a clearer objective to drive the scene."
+    ],
+}
+
+# what each template above remarks on, in the same order (see Performance.cues)
+REACTION_CUES: dict[str, list[str]] = {
+    "positive": ["few_pauses", "rich_language", "fast_pace"],
+    "neutral": ["on_topic", "plain_language", "long_pauses"],
+    "gentle_critique": ["fast_pace", "plain_language", "off_topic"],
+}
+for _tone, _templates in REACTION_TEMPLATES.items():
+    if len(REACTION_CUES.get(_tone, ())) != len(_templates):
+        raise ValueError(f"REACTION_CUES[{_tone!r}] needs one cue per reaction template")
+
+# spoken straight away on entry, before the player's name is known
+OPENING_LINE = "Welcome to Improv Spotlight, the show where you're the star!"
+
+# how long the greeting waits for the name (overlaps the opening line's audio)
+NAME_GRACE_SECONDS = 1.0
+
+SCENE_INSTRUCTION = "Start when you're ready. Say 'End scene' or pause to finish."
+
+RULES_SCRIPT = (
+    "You'll get 4 short improv scenes. "
+    "I'll set each scene, you act it out, then say End scene or pause to finish. "
+    "I'll give a quick reaction after each."
+)
+
+ASK_NAME_LINE = "What's your name?"
+
+HANDOFF_LINE = "Get ready for the next scene!"
+
+# replaces the whole intro when a show is resumed from a checkpoint
+WELCOME_BACK_LINE = "Welcome back{name}! Let's pick up where we left off."
+
+# a spotted "stop game" only ends the show when said again within this many seconds
+STOP_CONFIRM_SECONDS = 10.0
+
+STOP_CONFIRM_LINE = "Do you want to end the show? Say 'end show' again to confirm."
+
+# spotted in the player's live transcript -> what the host does right away
+STOP_PHRASES = {
+    "end scene": "end_scene",
+    "stop game": "stop_game",
+    "end show": "stop_game",
+}
+
+
+def scene_intro_line(round_number: int, scene: dict[str, Any]) -> str:
+    """
+    Announcement for a prepared scene, spoken without an LLM turn.
+    """
+    return f"Round {round_number}: {scene.get('title')}. {scene.get('scenario')} {SCENE_INSTRUCTION}"
+
+
+def fixed_host_lines() -> list[str]:
+    """
+    Every line the host may say word for word.
+    """
+    lines = [OPENING_LINE, SCENE_INSTRUCTION, RULES_SCRIPT, ASK_NAME_LINE, HANDOFF_LINE, STOP_CONFIRM_LINE]
+    for templates in REACTION_TEMPLATES.values():
+        lines.extend(templates)
+    return lines
+
+
 # ---------------------------------------------------------
 #  Host agent class
 # ---------------------------------------------------------
 class SpotlightHost(Agent):
-    def __init__(self):
+    def __init__(
+        self,
+        state: Optional[SessionState] = None,
+        fast_reactions: bool = False,
+        instructions: Optional[str] = None,
+        round_log: Optional[RoundLogWriter] = None,
+        tracer: Optional[TurnTracer] = None,
+        player_names: Optional[PlayerNameResolver] = None,
+        stop_phrases: Optional[StopPhraseSpotter] = None,
+        scoreboard: Optional[Scoreboard] = None,
+        checkpoints: Optional[Checkpointer] = None,
+        checkpoint_key: Optional[str] = None,
+    ):
         logger.info(">>> Initializing SpotlightHost agent")
-        state.all_scenarios = load_scenarios()
-        super().__init__(instructions=host_system_prompt())
+        # each host owns its own show; entrypoint passes the registry entry
+        self.state = state if state is not None else SessionState()
+        # speak template reactions directly instead of through another LLM turn
+        self.fast_reactions = fast_reactions
+        # completed rounds are queued here and written in the background
+        self.round_log = round_log
+        # cross-show tallies per scenario, category and player
+        self.scoreboard = scoreboard
+        # the show is snapshotted here under `checkpoint_key` (per player) as it goes
+        self.checkpoints = checkpoints
+        self.checkpoint_key = checkpoint_key
+        # per-stage latency recorder (see TracedSpotlightHost)
+        self.tracer = tracer
+        # room watcher that reports the player's name whenever it shows up
+        self.player_names = player_names
+        self._name_task: Optional[asyncio.Task] = None
+        # cuts the scene as soon as "End scene" shows up in an interim transcript
+        self.stop_phrases = stop_phrases
+        self._stop_task: Optional[asyncio.Task] = None
+        self._stop_asked_at: Optional[float] = None  # when "end show?" was last asked
+        self._spotted_action: Optional[str] = None  # acted on, its turn not committed yet
+        # the LLM sees earlier rounds only as a short summary
+        self.context_window = ContextWindow()
+        # next round's scenario and intro audio, prepared while this one plays out
+        self.scene_prep = ScenePrep(
+            lambda: choose_unused_scenario(self.state), scene_intro_line, tts_sentence_tokenizer()
+        )
+        if self.state.deck is None:
+            self.state.deck = ScenarioDeck(catalog_store)
+        super().__init__(instructions=instructions or host_system_prompt())
 
     # called when the agent is started and connected to a room
     async def on_enter(self) -> None:
-        state.phase = "intro"
-        
-        # Try multiple ways to get player name
-        player_name_found = False
-        
-        # Method 1: Check participant metadata (MOST RELIABLE)
-        try:
-            if hasattr(self.session, 'room') and self.session.room:
-                # Get all participants
-                participants = list(self.session.room.remote_participants.values())
-                logger.info(f"Found {len(participants)} remote participants")
-                
-                for participant in participants:
-                    logger.info(f"Participant: {participant.identity}, metadata: {participant.metadata}")
-                    if participant.metadata:
-                        import json
-                        try:
-                            participant_metadata = json.loads(participant.metadata)
-                            if 'playerName' in participant_metadata:
-                                state.player_name = participant_metadata['playerName']
-                                player_name_found = True
-                                logger.info(f"✓ Player name from participant metadata: {state.player_name}")
-                                break
-                        except:
-                            pass
-                    
-                    # Also try participant identity/name as fallback
-                    if not player_name_found and participant.identity and participant.identity != 'agent':
-                        state.player_name = participant.identity
-                        player_name_found = True
-                        logger.info(f"✓ Player name from participant identity: {state.player_name}")
-                        break
-        except Exception as e:
-            logger.warning(f"Could not get participant metadata: {e}")
-        
-        # Method 2: Check room metadata
-        if not player_name_found:
-            try:
-                if hasattr(self.session, 'room') and self.session.room:
-                    logger.info(f"Room metadata: {self.session.room.metadata}")
-                    if self.session.room.metadata:
-                        import json
-                        room_metadata = json.loads(self.session.room.metadata)
-                        if 'playerName' in room_metadata:
-                            state.player_name = room_metadata['playerName']
-                            player_name_found = True
-                            logger.info(f"✓ Player name from room metadata: {state.player_name}")
-            except Exception as e:
-                logger.warning(f"Could not parse room metadata: {e}")
-        
-        # Generate welcome message
-        if player_name_found and state.player_name:
-            # Player name already known - greet them directly
-            logger.info(f"Greeting player by name: {state.player_name}")
+        self.session.on("user_input_transcribed", self._on_transcribed)
+        if self.player_names is not None:
+            self.player_names.subscribe(self._apply_player_name)
+        if self.state.rounds or self.state.current_scenario is not None:
+            # restored from a checkpoint: carry on instead of starting over
+            await self._resume()
+            return
+
+        self.state.phase = "intro"
+        # start talking right away; the name only matters for the next sentence,
+        # so it gets until the opening line is playing to turn up
+        self.session.say(OPENING_LINE)
+        name = self.state.player_name
+        if name is None and self.player_names is not None:
+            name = await self.player_names.wait(NAME_GRACE_SECONDS)
+
+        if name:
+            logger.info("Greeting player by name: %s", name)
             await self.session.generate_reply(
                 instructions=(
-                    f"Give a bright, energetic welcome specifically to {state.player_name}. "
-                    f"Say something like 'Welcome {state.player_name}! Great to have you here!' "
-                    "Then explain: 'You'll get 4 short improv scenes. "
-                    "I'll set each scene, you act it out, then say End scene or pause to finish. "
-                    "I'll give a quick reaction after each.' "
-                    "Keep it energetic and under 30 seconds. IMPORTANT: Use their name in the greeting."
+                    f"You already said: '{OPENING_LINE}' Do not repeat it. "
+                    f"Welcome {name} by name, then explain: '{RULES_SCRIPT}' "
+                    "Keep it energetic and under 30 seconds."
                 )
             )
         else:
-            # Ask for player name
-            logger.info("Player name not found, asking for it")
+            logger.info("Player name not known yet, asking for it")
             await self.session.generate_reply(
                 instructions=(
-                    "Give a bright, short welcome. Explain: 'You'll get 4 short improv scenes. "
-                    "I'll set each scene, you act it out, then say End scene or pause to finish. "
-                    "I'll give a quick reaction after each. What's your name?' "
+                    f"You already said: '{OPENING_LINE}' Do not repeat it. "
+                    f"Explain: '{RULES_SCRIPT} {ASK_NAME_LINE}' "
                     "Keep it energetic and under 30 seconds."
                 )
             )
+        # the first scene gets ready while the player answers
+        if self.state.phase == "intro":
+            self._prepare_round(1)
+
+    async def _resume(self) -> None:
+        """
+        Pick a restored show back up: one short line, then the scene that was
+        cut off (from the top) or the next one, with no LLM turn. A show
+        stopped after its last round goes straight to the closing summary.
+        """
+        name = self.state.player_name
+        line = WELCOME_BACK_LINE.format(name=f", {name}" if name else "")
+        round_number = self.state.current_round + 1
+        if self.state.phase != "waiting_for_improv" and round_number > self.state.max_rounds:
+            logger.info("Resuming show after its last round; closing it")
+            self.state.phase = "finished"
+            self._checkpoint()
+            self.session.say(f"{line} {await self._compose_closing_summary()}")
+            return
+        scene = self.state.current_scenario if self.state.phase == "waiting_for_improv" else None
+        if scene is None and round_number <= self.state.max_rounds:
+            scene = choose_unused_scenario(self.state)
+        logger.info("Resuming show at round %d of %d", round_number, self.state.max_rounds)
+        if scene is None:
+            self.session.say(line)
+            return
+        self._begin_round(scene)
+        self.session.say(f"{line} {scene_intro_line(round_number, scene)}")
+
+    async def on_exit(self) -> None:
+        self.session.off("user_input_transcribed", self._on_transcribed)
+
+    def _on_transcribed(self, ev: UserInputTranscribedEvent) -> None:
+        if self.stop_phrases is not None and self._on_stop_phrase(ev.transcript, ev.is_final):
+            return
+        # the round's transcript is built here, not copied back by the LLM
+        if self.state.phase == "waiting_for_improv":
+            self.state.performance.observe(ev.transcript, ev.is_final)
+            if ev.is_final:
+                self.state.transcript.append(ev.transcript)
+
+    def _on_stop_phrase(self, transcript: str, is_final: bool = True) -> bool:
+        """
+        Act on a spotted stop phrase without waiting for end of turn or the LLM.
+        """
+        action = self.stop_phrases.feed(transcript, is_final)
+        if action == "end_scene" and self.state.phase == "waiting_for_improv":
+            if not self.stop_phrases.fire(action):
+                return True
+            self._spotted_action = action
+            self._keep_performed(transcript)
+            logger.info("End scene spotted in transcript; cutting round %d", self.state.current_round + 1)
+            self.session.clear_user_turn()
+            self._stop_task = asyncio.create_task(self._end_scene_now())
+            return True
+        if action == "stop_game" and self.state.phase != "finished":
+            if not self.stop_phrases.fire(action):
+                return True
+            self._spotted_action = action
+            self._keep_performed(transcript)
+            self.session.clear_user_turn()
+            now = time.monotonic()
+            if self._stop_asked_at is None or now - self._stop_asked_at > STOP_CONFIRM_SECONDS:
+                # ending the show can't be undone: make sure it was meant
+                self._stop_asked_at = now
+                logger.info("Stop game spotted in transcript; asking to confirm")
+                self.session.say(STOP_CONFIRM_LINE)
+                return True
+            logger.info("Stop game confirmed; ending the show")
+            self._stop_task = asyncio.create_task(self._end_show_now())
+            return True
+        return False
+
+    def _keep_performed(self, transcript: str) -> None:
+        # the transcript that carries the stop phrase also carries the words said just before it
+        if self.state.phase != "waiting_for_improv":
+            return
+        performed = self.stop_phrases.cut_before(transcript)
+        if performed:
+            self.state.transcript.append(performed)
+            self.state.performance.observe(performed, is_final=True)
+
+    async def _end_scene_now(self) -> None:
+        result = await self._complete_round(speak=True)
+        if result is not None and result.get("status") == "continue":
+            # no scene was prepared: the LLM announces the next one
+            self.session.generate_reply(
+                instructions="The reaction was already spoken. Call next_scene now without extra commentary."
+            )
+
+    async def _end_show_now(self) -> None:
+        self.state.phase = "finished"
+        self.scene_prep.cancel()
+        self._checkpoint()
+        self.session.interrupt()
+        self.session.say(await self._compose_closing_summary())
+
+    def on_text_input(self, session: AgentSession, ev: TextInputEvent) -> None:
+        """
+        Room text input callback. Typed chat produces no STT events and never
+        reaches on_user_turn_completed (that runs for voice turns only), so a
+        scene typed in the chat box joins the round's transcript here.
+        """
+        if self.stop_phrases is not None and self._on_stop_phrase(ev.text):
+            return
+        if self.state.phase == "waiting_for_improv":
+            self.state.performance.observe(ev.text, is_final=True)
+            self.state.transcript.append(ev.text)
+        # then what the room does by default
+        session.interrupt()
+        session.generate_reply(user_input=ev.text)
+
+    async def on_user_turn_completed(self, turn_ctx: llm.ChatContext, new_message: llm.ChatMessage) -> None:
+        # the turn that carried a spotted stop phrase was already handled, however
+        # long endpointing took to commit it
+        spotted, self._spotted_action = self._spotted_action, None
+        if self.stop_phrases is not None:
+            action = self.stop_phrases.match(new_message.text_content or "")
+            if action is not None and (action == spotted or self.stop_phrases.recently_fired(action)):
+                raise StopResponse()
+
+    def _apply_player_name(self, name: str) -> None:
+        """
+        Take a name that arrived from the room, even mid-greeting, so the host
+        doesn't need a separate ask-your-name turn.
+        """
+        self.state.player_name = name
+        logger.info("Player set from room: %s", name)
+        # the greeting may already have asked; the next reply should just use it
+        self._name_task = asyncio.create_task(self._tell_llm_player_name(name))
+
+    async def _tell_llm_player_name(self, name: str) -> None:
+        chat_ctx = self.chat_ctx.copy()
+        chat_ctx.add_message(
+            role="system",
+            content=f"The player's name is {name}. Use it and do not ask for their name.",
+        )
+        await self.update_chat_ctx(chat_ctx)
+
+    async def llm_node(self, chat_ctx: llm.ChatContext, tools: list[Any], model_settings: Any):
+        chat_ctx = self.context_window.view(chat_ctx, self.state.player_name, self.state.rounds)
+        async for chunk in Agent.default.llm_node(self, chat_ctx, tools, model_settings):
+            yield chunk
 
     @function_tool()
     async def set_player(self, ctx: RunContext, name: str) -> str:
         """
         Set the player's name in the session.
         """
-        state.player_name = name.strip() if name else "Player"
-        logger.info("Player set to: %s", state.player_name)
-        return f"Great to meet you, {state.player_name}! Ready to play Improv Spotlight?"
+        self.state.player_name = name.strip() if name else "Player"
+        logger.info("Player set to: %s", self.state.player_name)
+        return f"Great to meet you, {self.state.player_name}! Ready to play Improv Spotlight?"
 
     @function_tool()
-    async def next_scene(self, ctx: RunContext) -> Dict[str, Any]:
+    async def next_scene(self, ctx: RunContext) -> Optional[dict[str, Any]]:
         """
         Start the next round by selecting a scenario and returning it.
         """
-        if state.current_round >= state.max_rounds:
+        if self.state.current_round >= self.state.max_rounds:
             return {"error": "All rounds are complete."}
 
-        scene = choose_unused_scenario()
+        prepared = self.scene_prep.take(self.state.current_round + 1)
+        if prepared is not None and self._running():
+            # picked and voiced while the last round played out: just announce it
+            self._announce(prepared)
+            return None
+
+        scene = prepared.scene if prepared is not None else choose_unused_scenario(self.state)
         if not scene:
             return {"error": "No scenarios available."}
-
-        state.current_scenario = scene
-        state.phase = "waiting_for_improv"
-        state.improv_turns = 0
-
-        logger.info("Starting round %d: %s", state.current_round + 1, scene.get("title"))
+        self._begin_round(scene)
 
         return {
-            "round_number": state.current_round + 1,
-            "max_rounds": state.max_rounds,
+            "round_number": self.state.current_round + 1,
+            "max_rounds": self.state.max_rounds,
             "title": scene.get("title"),
             "prompt": scene.get("scenario"),
-            "instruction": "Start when you're ready. Say 'End scene' or pause to finish."
+            "instruction": SCENE_INSTRUCTION,
         }
 
+    def _begin_round(self, scene: dict[str, Any]) -> None:
+        self.state.current_scenario = scene
+        self.state.phase = "waiting_for_improv"
+        # finished rounds drop out of the LLM's view from here on
+        self.context_window.mark_round_start(self.chat_ctx)
+        self.state.improv_turns = 0
+        self.state.transcript.clear()
+        self.state.performance.start(scene)
+
+        logger.info("Starting round %d: %s", self.state.current_round + 1, scene.get("title"))
+        self._prepare_round(self.state.current_round + 2)
+        self._checkpoint()
+
+    def _announce(self, prepared: PreparedScene) -> None:
+        self._begin_round(prepared.scene)
+        if prepared.has_audio:
+            self.session.say(prepared.intro, audio=prepared.audio())
+        else:
+            self.session.say(prepared.intro)
+
+    def _prepare_round(self, round_number: int) -> None:
+        if round_number > self.state.max_rounds:
+            return
+        # outside a session only the scenario is picked ahead
+        self.scene_prep.prepare(round_number, self.session.tts if self._running() else None)
+
+    def _checkpoint(self) -> None:
+        """
+        Snapshot the show in the background; a finished show's snapshot is dropped.
+        """
+        if self.checkpoints is None or self.checkpoint_key is None:
+            return
+        if self.state.phase == "finished":
+            self.checkpoints.clear(self.checkpoint_key)
+        else:
+            self.checkpoints.save(self.checkpoint_key, self.state)
+
+    def _running(self) -> bool:
+        # `self.session` raises outside a session; the activity is what it reads
+        return self._activity is not None
+
     @function_tool()
-    async def complete_improv(self, ctx: RunContext, player_text: Optional[str] = None) -> Dict[str, Any]:
+    async def complete_improv(self, ctx: RunContext) -> Optional[dict[str, Any]]:
         """
         Called when the player finishes a scene. Generate and store a host reaction,
         increment round counters, and indicate whether the game continues.
+        The performance itself is taken from the live transcript.
         """
-        state.improv_turns += 1
+        return await self._complete_round(speak=self.fast_reactions)
 
-        if not state.current_scenario:
+    async def _complete_round(self, speak: bool) -> Optional[dict[str, Any]]:
+        """
+        Store the round and react. With `speak` the reaction is said directly
+        instead of being handed to the LLM.
+        """
+        self.state.improv_turns += 1
+
+        # a second call for the same scene (e.g. the stop-phrase turn reaching the LLM) is a no-op
+        if self.state.phase != "waiting_for_improv" or not self.state.current_scenario:
             return {"error": "No active scenario to complete."}
+        scene = self.state.current_scenario
 
-        player_text = (player_text or "[performance delivered]").strip()
+        player_text = self.state.transcript.text() or "[performance delivered]"
+        self.state.transcript.clear()
 
-        # Reaction generation (simple randomized templates)
-        positive_templates = [
-            "That was wonderful — your choices felt honest and clear. Try stretching the pause before the punchline next time.",
-            "Really enjoyable — you nailed the character. You could push the physicality a bit more to sell it.",
-            "Great energy throughout! Consider letting the reaction breathe a little longer for bigger laughs."
-        ]
-        neutral_templates = [
-            "Solid performance — the scene was easy to follow. You might experiment with raising the stakes.",
-            "Good clarity and voice. Try adding one strong, specific detail to make it pop next round.",
-            "Nice phrasing. A bolder choice in the middle could make the scene stand out more."
-        ]
-        critique_templates = [
-            "Interesting idea, but it felt rushed. Slow down and let moments land to build impact.",
-            "Good attempt, though the character was a bit flat. Pick one strong trait and commit.",
-            "You had good instincts, but the stakes were low — choose a clearer objective to drive the scene."
-        ]
-
-        # Randomly pick tone with weighted distribution
-        tone_roll = random.random()
-        if tone_roll < 0.5:
-            reaction = random.choice(positive_templates)
-            tone = "positive"
-        elif tone_roll < 0.8:
-            reaction = random.choice(neutral_templates)
-            tone = "neutral"
-        else:
-            reaction = random.choice(critique_templates)
-            tone = "gentle_critique"
+        # features were updated as the scene went on: picking is instant
+        performance = self.state.performance.finish()
+        tone, reaction = choose_reaction(
+            performance, REACTION_TEMPLATES, REACTION_CUES, (r["host_reaction"] for r in self.state.rounds)
+        )
 
         # store round
-        state.rounds.append({
-            "round_index": state.current_round + 1,
-            "scenario_id": state.current_scenario.get("id"),
-            "scenario_title": state.current_scenario.get("title"),
-            "scenario_prompt": state.current_scenario.get("scenario"),
+        round_record = {
+            "round_index": self.state.current_round + 1,
+            "scenario_id": scene.get("id"),
+            "scenario_title": scene.get("title"),
+            "scenario_prompt": scene.get("scenario"),
             "player_text": player_text,
             "host_reaction": reaction,
             "reaction_tone": tone,
+            "performance": performance.summary(),
             "timestamp": datetime.utcnow().isoformat() + "Z",
-        })
+        }
+        self.state.rounds.append(round_record)
+        self.state.aggregates.add_round(round_record)
+        # leave the scene before any await, so a second completion finds no scene to record
+        self.state.current_round += 1
+        self.state.phase = "reacting"
+        self.state.current_scenario = None
+        if self.state.current_round < self.state.max_rounds:
+            # after the last round the show is checkpointed once it is finished
+            self._checkpoint()
 
-        state.current_round += 1
-        state.phase = "reacting"
+        if self.round_log is not None or self.scoreboard is not None:
+            shared_record = {
+                **round_record,
+                "session_key": self.state.session_key,
+                "player_name": self.state.player_name,
+            }
+            if self.scoreboard is not None:
+                self.scoreboard.add(shared_record, scene.get("category"))
+            if self.round_log is not None:
+                await self.round_log.put(shared_record)
 
-        logger.info("Round %d completed. Reaction tone: %s", state.current_round, tone)
+        logger.info("Round %d completed. Reaction tone: %s", self.state.current_round, tone)
 
-        if state.current_round >= state.max_rounds:
+        if self.state.current_round >= self.state.max_rounds:
             # game finished
             summary = await self._compose_closing_summary()
-            state.phase = "finished"
+            self.state.phase = "finished"
+            self.scene_prep.cancel()
+            self._checkpoint()
+            if speak:
+                # nothing left for the LLM to add: speak and end the turn
+                self.session.say(f"{reaction} {summary}")
+                return None
             return {
                 "status": "finished",
                 "reaction": reaction,
                 "closing_summary": summary,
-                "rounds": state.rounds
+                "rounds_completed": len(self.state.rounds),
             }
         else:
             # prepare for next round
+            if speak:
+                # the reaction plays while the LLM only has to call next_scene
+                self.session.say(f"{reaction} {HANDOFF_LINE}")
+                prepared = self.scene_prep.take(self.state.current_round + 1)
+                if prepared is not None and self._running():
+                    # the next scene follows the reaction with no LLM turn between
+                    self._announce(prepared)
+                    return None
+                return {
+                    "status": "continue",
+                    "reaction_spoken": True,
+                    "next_round_number": self.state.current_round + 1,
+                }
             return {
                 "status": "continue",
                 "reaction": reaction,
-                "next_round_number": state.current_round + 1,
-                "message": "Get ready for the next scene!"
+                "next_round_number": self.state.current_round + 1,
+                "message": HANDOFF_LINE
             }
 
     @function_tool()
-    async def finish_show(self, ctx: RunContext) -> Dict[str, Any]:
+    async def finish_show(self, ctx: RunContext) -> dict[str, Any]:
         """
         Forcefully end the show and return a final summary.
         """
-        state.phase = "finished"
+        self.state.phase = "finished"
+        self.scene_prep.cancel()
+        self._checkpoint()
         summary = await self._compose_closing_summary()
         return {
             "status": "ended",
-            "player_name": state.player_name,
-            "rounds_completed": state.current_round,
+            "player_name": self.state.player_name,
+            "rounds_completed": self.state.current_round,
             "summary": summary,
-            "rounds": state.rounds
         }
 
+    @function_tool()
+    async def round_details(self, ctx: RunContext, round_number: int) -> dict[str, Any]:
+        """
+        Return the full record of one finished round (1-based), for when the
+        player asks about an earlier scene.
+        """
+        for r in self.state.rounds:
+            if r["round_index"] == round_number:
+                return {
+                    "round_index": r["round_index"],
+                    "scenario_title": r["scenario_title"],
+                    "scenario_prompt": r["scenario_prompt"],
+                    "player_text": r["player_text"],
+                    "host_reaction": r["host_reaction"],
+                }
+        return {"error": f"Round {round_number} has not been played."}
+
     async def _compose_closing_summary(self) -> str:
         """
-        Create a short closing summary based on stored rounds.
+        Create a short closing summary from the show's running totals.
         """
-        if not state.rounds:
-            return f"Thanks for joining, {state.player_name or 'player'}! You showed great willingness to try — come back to practice and play again."
-
-        # pick highlights - choose up to two standout snippets from player_texts
-        highlights = []
-        for r in state.rounds[:2]:
-            snippet = r.get("player_text", "")
-            # shorten snippet for summary
-            snippet_short = (snippet[:60] + "...") if len(snippet) > 60 else snippet
-            highlights.append(f"Round {r['round_index']}: \"{snippet_short}\"")
-
-        # infer style heuristically from reactions
-        positive_count = sum(1 for r in state.rounds if r.get("reaction_tone") == "positive")
-        critique_count = sum(1 for r in state.rounds if r.get("reaction_tone") == "gentle_critique")
-
-        if positive_count >= critique_count:
+        if not self.state.aggregates.rounds:
+            return f"Thanks for joining, {self.state.player_name or 'player'}! You showed great willingness to try — come back to practice and play again."
+
+        # running totals, updated as each round completed
+        totals = self.state.aggregates
+        if totals.count("positive") >= totals.count("gentle_critique"):
             style = "you lean toward bold, playful choices"
         else:
             style = "you might focus on clearer objectives and steady pacing"
@@ -371,71 +735,354 @@ class SpotlightHost(Agent):
         tip = "Try committing to one clear objective per scene to make your choices bolder."
 
         return (
-            f"Final thoughts for {state.player_name or 'the player'}: {style}. "
-            f"Highlights: {' | '.join(highlights)}. {tip}"
+            f"Final thoughts for {self.state.player_name or 'the player'}: {style}. "
+            f"Highlights: {' | '.join(totals.highlights)}. {tip}"
         )
 
     @function_tool()
-    async def session_status(self, ctx: RunContext) -> Dict[str, Any]:
+    async def session_status(self, ctx: RunContext) -> dict[str, Any]:
         """
         Return a short status summary of the current session.
         """
         return {
-            "player_name": state.player_name,
-            "current_round": state.current_round,
-            "max_rounds": state.max_rounds,
-            "phase": state.phase,
-            "rounds_saved": len(state.rounds),
-            "current_title": state.current_scenario.get("title") if state.current_scenario else None
+            "player_name": self.state.player_name,
+            "current_round": self.state.current_round,
+            "max_rounds": self.state.max_rounds,
+            "phase": self.state.phase,
+            "rounds_saved": len(self.state.rounds),
+            "current_title": self.state.current_scenario.get("title") if self.state.current_scenario else None
         }
 
 
+# the host the worker runs: same tools, each call timed into its tracer
+TracedSpotlightHost = timed_tools(SpotlightHost, record_host_tool)
+
+
+# ---------------------------------------------------------
+#  Latency tracing
+# ---------------------------------------------------------
+_trace_file: Optional[TraceFile] = None
+
+
+def trace_file() -> Optional[TraceFile]:
+    """
+    The process-wide JSONL trace, opened on first use when SPOTLIGHT_TRACE_PATH is set.
+    """
+    global _trace_file
+    if _trace_file is None and TRACE_PATH:
+        _trace_file = TraceFile(TRACE_PATH)
+    return _trace_file
+
+
+def worker_metrics_options() -> dict[str, Any]:
+    """
+    WorkerOptions that expose the tracing histograms, merged across job processes.
+    """
+    if not METRICS_PORT:
+        return {}
+    # samples from a previous worker run would be merged into this one's
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    for name in os.listdir(METRICS_MULTIPROC_DIR):
+        if name.endswith(".db"):
+            os.remove(os.path.join(METRICS_MULTIPROC_DIR, name))
+    return {
+        "prometheus_port": int(METRICS_PORT),
+        "prometheus_multiproc_dir": METRICS_MULTIPROC_DIR,
+    }
+
+
+# created on first use in the worker process (job processes never need it)
+_worker_load: Optional[WorkerLoad] = None
+
+
+def worker_load() -> WorkerLoad:
+    global _worker_load
+    if _worker_load is None:
+        _worker_load = WorkerLoad(LOAD_THRESHOLD, lag_budget=LAG_BUDGET, report_dir=LOOP_LAG_DIR)
+    return _worker_load
+
+
+def report_load(worker: AgentServer) -> float:
+    """
+    WorkerOptions.load_fnc: CPU of every job process or loop lag, whichever is worse.
+    """
+    load = worker_load()
+    previous = load.load
+    value = load.update(len(worker.active_jobs))
+    if (previous < LOAD_THRESHOLD) != (value < LOAD_THRESHOLD):
+        logger.info(
+            "Worker load %.2f (cpu %.2f, loop lag %.0f ms, %d shows)",
+            value, load.cpu_load, load.worst_lag * 1000, load.active_jobs,
+        )
+    return value
+
+
+async def request_job(req: JobRequest) -> None:
+    """
+    WorkerOptions.request_fnc: refuse a show that would push the worker past
+    LOAD_THRESHOLD, so LiveKit hands it to another worker.
+    """
+    if worker_load().admit():
+        await req.accept()
+    else:
+        await req.reject()
+
+
+def worker_load_options() -> dict[str, Any]:
+    """
+    WorkerOptions for load reporting, admission and the warm process pool.
+    """
+    options: dict[str, Any] = {
+        "load_fnc": report_load,
+        "request_fnc": request_job,
+        "load_threshold": LOAD_THRESHOLD,
+    }
+    if IDLE_PROCESSES is not None:
+        # otherwise LiveKit's own default pool size
+        options["num_idle_processes"] = int(IDLE_PROCESSES)
+    return options
+
+
+# ---------------------------------------------------------
+#  TTS (Murf behind a sentence-level audio cache)
+# ---------------------------------------------------------
+TTS_VOICE = "en-US-ken"
+TTS_STYLE = "Conversation"
+TTS_CACHE_DIR = os.getenv(
+    "TTS_CACHE_DIR", os.path.join(os.path.dirname(__file__), "../.cache/tts")
+)
+
+
+# send a reply's first clause to TTS before its first sentence is complete
+FIRST_CLAUSE = os.getenv("SPOTLIGHT_FIRST_CLAUSE", "1").lower() in ("1", "true", "yes")
+FIRST_CLAUSE_MAX_WORDS = int(os.getenv("SPOTLIGHT_FIRST_CLAUSE_MAX_WORDS", "12"))
+FIRST_CLAUSE_MAX_WAIT = float(os.getenv("SPOTLIGHT_FIRST_CLAUSE_MAX_WAIT", "0.5"))
+
+
+def tts_sentence_tokenizer() -> tokenize.SentenceTokenizer:
+    sentences = tokenize.basic.SentenceTokenizer(min_sentence_len=2)
+    if not FIRST_CLAUSE:
+        return sentences
+    return FirstClauseTokenizer(sentences, max_words=FIRST_CLAUSE_MAX_WORDS, max_wait=FIRST_CLAUSE_MAX_WAIT)
+
+
+def build_cached_tts() -> CachedTTS:
+    fixed = {normalize_text(sentence) for line in fixed_host_lines()
+             for sentence in tts_sentence_tokenizer().tokenize(line)}
+    return CachedTTS(
+        tts_providers.create(voice=TTS_VOICE, style=TTS_STYLE),
+        voice=f"{tts_providers.selected()}:{TTS_VOICE}",
+        style=TTS_STYLE,
+        pacing="paced",
+        cache_dir=TTS_CACHE_DIR,
+        # only fixed lines go to disk; LLM-written sentences stay in the memory LRU
+        persist=lambda text: normalize_text(text) in fixed,
+    )
+
+
+def build_tts(cached: Optional[CachedTTS] = None) -> tts.TTS:
+    """
+    Split LLM output into sentences and synthesize each through the cache.
+    """
+    return tts.StreamAdapter(
+        tts=cached or build_cached_tts(),
+        sentence_tokenizer=tts_sentence_tokenizer(),
+        text_pacing=True,
+    )
+
+
+async def warm_tts_cache() -> None:
+    """
+    Pre-render every fixed host line to disk. Run with `python src/agent.py warm-tts-cache`.
+    """
+    cached = build_cached_tts()
+    try:
+        rendered = await cached.warm(fixed_host_lines(), tts_sentence_tokenizer())
+        logger.info("TTS cache warm: %d new sentences, stats=%s", rendered, cached.stats.snapshot())
+    finally:
+        await cached.aclose()
+
+
 # ---------------------------------------------------------
 #  Prewarm and entrypoint for job runner
 # ---------------------------------------------------------
+def build_stt() -> stt.STT:
+    return stt_providers.create()
+
+
+def build_llm() -> llm.LLM:
+    return llm_providers.create()
+
+
+def build_turn_detector() -> Any:
+    # needs the job context (it talks to the worker's shared inference process),
+    # so it can't be built in prewarm; construction itself is cheap
+    return multilingual_turn_detector()
+
+
+def build_noise_cancellation() -> Any:
+    return noise_cancellation_bvc()
+
+
+def load_vad() -> Optional[Any]:
+    try:
+        if INFERENCE_SOCKET:
+            return sidecar_silero_vad(INFERENCE_SOCKET)
+        return load_silero_vad()
+    except Exception as e:
+        logger.warning("Could not load VAD: %s", e)
+        return None
+
+
+def load_catalog() -> Optional[Catalog]:
+    catalog = catalog_store.load()
+    # an empty catalog means every next_scene call would fail; surface it here
+    return catalog if len(catalog) else None
+
+
+def prewarm_steps() -> list[PrewarmStep]:
+    """
+    Reusable assets built once per job process, in order. Each result lands in
+    proc.userdata under its name.
+    """
+    return [
+        ("catalog", load_catalog),
+        ("host_prompt", host_system_prompt),
+        ("vad", load_vad),
+        ("stt", build_stt),
+        ("llm", build_llm),
+        ("tts", build_cached_tts),
+        ("noise_cancellation", build_noise_cancellation),
+    ]
+
+
 def prewarm(proc: JobProcess):
     """
     Preload VAD model or other heavy assets for faster startup.
     """
-    try:
-        proc.userdata["vad"] = silero.VAD.load()
-        logger.info("Prewarmed silero VAD.")
-    except Exception as e:
-        logger.warning("Could not prewarm VAD: %s", e)
+    run_prewarm(proc.userdata, prewarm_steps())
 
 
-async def entrypoint(ctx: JobContext):
-    logger.info(">> Booting Improv Spotlight agent")
-    vad = ctx.proc.userdata.get("vad")
-    if vad is None:
-        # try lazy load
-        try:
-            vad = silero.VAD.load()
-            logger.info("Loaded VAD lazily in entrypoint.")
-        except Exception:
-            vad = None
-
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-ken",
-            style="Conversation",
-            tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=vad,
+def build_session(userdata: dict[str, Any], recorder: Optional[SessionRecorder] = None) -> AgentSession:
+    """
+    Assemble an AgentSession from prewarmed assets (built on the spot if missing).
+    """
+    model = take_asset(userdata, "llm", build_llm)
+    return AgentSession(
+        stt=take_asset(userdata, "stt", build_stt),
+        llm=recorder.wrap_llm(model) if recorder is not None else model,
+        tts=build_tts(take_asset(userdata, "tts", build_cached_tts)),
+        turn_detection=build_turn_detector(),
+        vad=take_asset(userdata, "vad", load_vad),
         preemptive_generation=True,
     )
 
+
+async def resume_state(state: SessionState, key: str) -> bool:
+    """
+    Restore `state` from the checkpoint under `key`, if there is a current one.
+    """
+    started = time.perf_counter()
+    data = await checkpoints.load(key)
+    if data is None:
+        return False
+    if state.deck is None:
+        state.deck = ScenarioDeck(catalog_store)
+    restore(state, data)
+    logger.info(
+        "Resuming show of %s at round %d (checkpoint restored in %.1f ms)",
+        key,
+        state.current_round + 1,
+        (time.perf_counter() - started) * 1000,
+    )
+    return True
+
+
+async def run_shutdown_steps(steps: list[tuple[str, Callable[[], Any]]]) -> None:
+    """
+    Run a job's shutdown steps in order. A step that fails is logged and the
+    rest still run, so one bad write doesn't lose the others.
+    """
+    for name, step in steps:
+        try:
+            result = step()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception("Shutdown step %r failed", name)
+
+
+async def entrypoint(ctx: JobContext):
+    logger.info(">> Booting Improv Spotlight agent")
+    catalog_store.start_watching()
+    round_log.start()
+    scoreboard.start()
+    userdata = ctx.proc.userdata
+
+    # one state per job so several shows can share this worker process
+    session_key = ctx.job.id
+    # checkpoints are per player: a reconnect comes back in a new room, a
+    # crashed worker's room as a new job
+    show_key = checkpoint_key(ctx.job.room.name)
+    recorder = SessionRecorder(session_key) if RECORD_DIR else None
+    session = build_session(userdata, recorder)
+    state = registry.acquire(session_key)
+    if CHECKPOINTS:
+        await resume_state(state, show_key)
+
+    tracer = TurnTracer(state, trace_file())
+    tracer.attach(session)
+    if recorder is not None:
+        recorder.attach(session, tracer)
+
+    # watch for the player's name from connect onwards instead of polling once
+    player_names = PlayerNameResolver(ctx.room)
+    player_names.start()
+
+    # lets the worker see this job's event-loop lag (see report_load)
+    lag_probe = LoopLagProbe(LOOP_LAG_DIR, ctx.job.id)
+    lag_probe.start()
+
+    async def _save_recording():
+        os.makedirs(RECORD_DIR, exist_ok=True)
+        await recorder.save(os.path.join(RECORD_DIR, f"{session_key}.trace.jsonl.gz"))
+
+    async def _release_state():
+        steps = [
+            ("player names", player_names.stop),
+            ("loop lag probe", lag_probe.stop),
+            ("session state", lambda: registry.release(session_key)),
+            ("round log", round_log.flush),
+            ("scoreboard", scoreboard.save),
+            ("checkpoints", checkpoints.flush),
+        ]
+        if recorder is not None:
+            steps.append(("recording", _save_recording))
+        await run_shutdown_steps(steps)
+
+    session.on("close", lambda _ev: registry.release(session_key))
+    ctx.add_shutdown_callback(_release_state)
+
     await ctx.connect()
 
+    host = TracedSpotlightHost(
+        state,
+        fast_reactions=FAST_REACTIONS,
+        instructions=take_asset(userdata, "host_prompt", host_system_prompt),
+        round_log=round_log,
+        scoreboard=scoreboard,
+        checkpoints=checkpoints if CHECKPOINTS else None,
+        checkpoint_key=show_key,
+        tracer=tracer,
+        player_names=player_names,
+        stop_phrases=StopPhraseSpotter(STOP_PHRASES) if KEYWORD_STOP else None,
+    )
     await session.start(
-        agent=SpotlightHost(),
+        agent=host,
         room=ctx.room,
         room_input_options=RoomInputOptions(
-            noise_cancellation=noise_cancellation.BVC(),
+            noise_cancellation=take_asset(userdata, "noise_cancellation", build_noise_cancellation),
+            text_input_cb=host.on_text_input,
         ),
     )
 
@@ -444,4 +1091,27 @@ async def entrypoint(ctx: JobContext):
 #  Run as a script
 # ---------------------------------------------------------
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file
+    command = sys.argv[1:2]
+    if command == ["warm-tts-cache"]:
+        asyncio.run(warm_tts_cache())
+        sys.exit(0)
+    if command == ["compile-scenarios"]:
+        compile_catalog(SCENARIOS_PATH, SCENARIOS_DB_PATH)
+        sys.exit(0)
+    if command == ["inference-sidecar"]:
+        from inference_sidecar import serve
+
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(serve(INFERENCE_SOCKET or os.path.join(os.path.dirname(__file__), "../.cache/inference.sock")))
+        sys.exit(0)
+    # job processes import their plugins lazily in prewarm; console runs the job
+    # in this process, so register everything here on the main thread instead
+    import_plugins(plugins_for_session() if command == ["console"] else plugins_for_worker())
+    cli.run_app(
+        WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+            **worker_load_options(),
+            **worker_metrics_options(),
+        )
+    )
@@ -0,0 +1,294 @@
+"""
+Running round aggregates.
+
+ShowAggregates keeps one show's tone counts and highlights current as each
+round completes, so the closing summary never rescans the rounds. Scoreboard
+keeps the same counters for every show in the process, keyed by scenario id,
+category and player, and publishes read-only snapshots for queries and disk.
+Every job process on the host shares one snapshot file: each merges only the
+rounds it counted since its last save into it, under a file lock.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; snapshots there are best effort
+    fcntl = None  # type: ignore[assignment]
+import contextlib
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Optional
+
+logger = logging.getLogger("improv_spotlight")
+
+TONES = ("positive", "neutral", "gentle_critique")
+DIMENSIONS = ("scenario", "category", "player")
+
+# rounds quoted in the closing summary
+HIGHLIGHTS = 2
+HIGHLIGHT_CHARS = 60
+
+# published rows: (rounds, positive, neutral, gentle_critique)
+Row = tuple[int, ...]
+_EMPTY: Mapping[str, Mapping[str, Row]] = MappingProxyType({d: MappingProxyType({}) for d in DIMENSIONS})
+
+
+def highlight_line(record: dict[str, Any]) -> str:
+    snippet = record.get("player_text", "")
+    if len(snippet) > HIGHLIGHT_CHARS:
+        snippet = snippet[:HIGHLIGHT_CHARS] + "..."
+    return f"Round {record['round_index']}: \"{snippet}\""
+
+
+class Tally:
+    """
+    Round and per-tone counts for one key.
+    """
+
+    __slots__ = ("rounds", "tones")
+
+    def __init__(self, row: Optional[Row] = None):
+        self.rounds = 0
+        self.tones = [0] * len(TONES)
+        if row is not None:
+            self.rounds = row[0]
+            self.tones = list(row[1:1 + len(TONES)])
+
+    def add(self, tone: Optional[str]) -> None:
+        self.rounds += 1
+        if tone in TONES:
+            self.tones[TONES.index(tone)] += 1
+
+    def merge(self, row: Row) -> None:
+        self.rounds += row[0]
+        for i, n in enumerate(row[1:1 + len(TONES)]):
+            self.tones[i] += n
+
+    def count(self, tone: str) -> int:
+        return self.tones[TONES.index(tone)]
+
+    def row(self) -> Row:
+        return (self.rounds, *self.tones)
+
+
+# ---------------------------------------------------------
+#  Per-show aggregates
+# ---------------------------------------------------------
+class ShowAggregates(Tally):
+    """
+    One show's running totals, updated once per completed round.
+    """
+
+    __slots__ = ("highlights",)
+
+    def __init__(self):
+        super().__init__()
+        self.highlights: list[str] = []
+
+    def add_round(self, record: dict[str, Any]) -> None:
+        self.add(record.get("reaction_tone"))
+        if len(self.highlights) < HIGHLIGHTS:
+            self.highlights.append(highlight_line(record))
+
+
+# ---------------------------------------------------------
+#  Cross-show scoreboard
+# ---------------------------------------------------------
+class Scoreboard:
+    """
+    Tallies per scenario id, category and player for every show in the process.
+
+    Each dimension keeps at most `max_keys` entries; past that the least
+    recently updated key is dropped. Updates run on the event loop and touch
+    only the live tallies. Queries (`top`, `row`) read `published`, an
+    immutable snapshot rebuilt by `publish()`, so they may run from any thread
+    and never hold up `add()`.
+    """
+
+    def __init__(self, max_keys: int = 5000, path: Optional[str] = None, interval: float = 5.0):
+        self.max_keys = max_keys
+        self.path = path
+        self.interval = interval
+        self._tallies: dict[str, OrderedDict[str, Tally]] = {d: OrderedDict() for d in DIMENSIONS}
+        self.published: Mapping[str, Mapping[str, Row]] = _EMPTY
+        self.evicted = 0
+        # rounds counted since the last save, merged into the shared file on save
+        self._unsaved: dict[str, dict[str, Tally]] = {d: {} for d in DIMENSIONS}
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, record: dict[str, Any], category: Optional[str] = None) -> None:
+        tone = record.get("reaction_tone")
+        self._count("scenario", record.get("scenario_id"), tone)
+        self._count("category", category, tone)
+        self._count("player", record.get("player_name"), tone)
+        self._dirty = True
+
+    def _count(self, dimension: str, key: Optional[str], tone: Optional[str]) -> None:
+        if not key:
+            return
+        tallies = self._tallies[dimension]
+        tally = tallies.get(key)
+        if tally is None:
+            if len(tallies) >= self.max_keys:
+                tallies.popitem(last=False)
+                self.evicted += 1
+            tally = tallies[key] = Tally()
+        else:
+            tallies.move_to_end(key)
+        tally.add(tone)
+        self._unsaved[dimension].setdefault(key, Tally()).add(tone)
+
+    def publish(self) -> Mapping[str, Mapping[str, Row]]:
+        """
+        Swap in a fresh read-only snapshot of every tally.
+        """
+        self.published = MappingProxyType({
+            d: MappingProxyType({k: t.row() for k, t in tallies.items()})
+            for d, tallies in self._tallies.items()
+        })
+        # rounds added while a save was in flight still need saving
+        self._dirty = bool(self.path) and any(self._unsaved.values())
+        return self.published
+
+    def row(self, dimension: str, key: str) -> Optional[Row]:
+        return self.published[dimension].get(key)
+
+    def top(self, dimension: str, k: int = 10, by: str = "rounds") -> list[tuple[str, int]]:
+        """
+        The `k` keys of `dimension` with the most rounds, or the most rounds of
+        tone `by`, as of the last publish.
+        """
+        col = 0 if by == "rounds" else 1 + TONES.index(by)
+        rows = self.published[dimension]
+        best = heapq.nlargest(k, rows.items(), key=lambda kv: kv[1][col])
+        return [(key, row[col]) for key, row in best if row[col]]
+
+    # -----------------------------------------------------
+    #  Snapshots on disk
+    # -----------------------------------------------------
+    def load(self) -> None:
+        """
+        Restore tallies from `path`, if a snapshot is there.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+        self._adopt(_read_snapshot(self.path))
+        self.publish()
+        logger.info("Scoreboard restored from %s", self.path)
+
+    def _adopt(self, data: dict[str, dict[str, list[int]]]) -> None:
+        """
+        Replace the live tallies with `data` plus whatever is still unsaved.
+        """
+        for d in DIMENSIONS:
+            tallies: OrderedDict[str, Tally] = OrderedDict()
+            # keep the most-played keys if the snapshot is larger than the cap
+            for key, row in sorted(data.get(d, {}).items(), key=lambda kv: kv[1][0])[-self.max_keys:]:
+                tallies[key] = Tally(tuple(row))
+            for key, delta in self._unsaved[d].items():
+                tally = tallies.get(key)
+                if tally is None:
+                    tally = tallies[key] = Tally()
+                tally.merge(delta.row())
+                tallies.move_to_end(key)
+            while len(tallies) > self.max_keys:
+                tallies.popitem(last=False)
+            self._tallies[d] = tallies
+
+    def start(self) -> None:
+        """
+        Load the last snapshot and start the publish/save task (idempotent).
+        """
+        if self._task is not None and not self._task.done():
+            return
+        if self._task is None:
+            self.load()
+        self._task = asyncio.create_task(self._run(), name="scoreboard_snapshots")
+
+    async def save(self) -> None:
+        """
+        Merge the rounds counted since the last save into the snapshot at
+        `path` off the event loop, then publish the merged tallies, which
+        include what other processes saved.
+        """
+        if not self.path:
+            self.publish()
+            return
+        deltas = {d: {k: t.row() for k, t in rows.items()} for d, rows in self._unsaved.items()}
+        self._unsaved = {d: {} for d in DIMENSIONS}
+        try:
+            merged = await asyncio.get_running_loop().run_in_executor(
+                None, _merge_snapshot, self.path, deltas, self.max_keys
+            )
+        except Exception:
+            # keep them for the next save
+            for d, rows in deltas.items():
+                for key, row in rows.items():
+                    self._unsaved[d].setdefault(key, Tally()).merge(row)
+            raise
+        self._adopt(merged)
+        self.publish()
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.save()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._dirty:
+                continue
+            try:
+                await self.save()
+            except Exception as e:
+                logger.error("Could not save scoreboard snapshot: %s", e)
+
+
+def _read_snapshot(path: str) -> dict[str, dict[str, list[int]]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable scoreboard snapshot %s: %s", path, e)
+        return {}
+    return {d: dict(data.get(d, {})) for d in DIMENSIONS}
+
+
+def _merge_snapshot(
+    path: str, deltas: dict[str, dict[str, Row]], max_keys: int
+) -> dict[str, dict[str, list[int]]]:
+    """
+    Add `deltas` to the snapshot at `path` and return the result. The lock
+    makes read-merge-replace atomic across the host's job processes.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file closes
+        data = _read_snapshot(path)
+        for d in DIMENSIONS:
+            rows = data.setdefault(d, {})
+            for key, delta in deltas.get(d, {}).items():
+                row = rows.get(key)
+                rows[key] = [a + b for a, b in zip(row, delta)] if row else list(delta)
+            if len(rows) > max_keys:
+                data[d] = dict(sorted(rows.items(), key=lambda kv: kv[1][0])[-max_keys:])
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        # readers of the file never see a half-written snapshot
+        os.replace(tmp, path)
+    return data
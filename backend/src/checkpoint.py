@@ -0,0 +1,235 @@
+"""
+Session checkpoints, so a show survives a worker crash or a reconnect.
+
+After every scene starts and every round completes the host writes a small
+snapshot of its SessionState (player, round counter, finished rounds, the
+scene in play and the scenarios already drawn), keyed by `checkpoint_key()`.
+When the player comes back in a new job, the entrypoint loads the snapshot
+and the host picks the show up with a one-line welcome back instead of the
+intro.
+
+The frontend opens a new room on every connect, named
+`improv-<player id>-<ms>` with a player id kept in the browser's
+localStorage, so the key is that player id rather than the room name.
+
+Snapshots are compact JSON, zlib-compressed, one row per show in a WAL-mode
+SQLite file next to the round log. Only the newest snapshot of a room
+matters, so writes queued while one is in flight are collapsed, and the disk
+work runs on a single thread off the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from session_state import SessionState
+
+logger = logging.getLogger("improv_spotlight")
+
+# bump when the snapshot layout changes; other versions are never resumed
+CHECKPOINT_VERSION = 1
+
+# phases a show can be resumed in; a finished show is not checkpointed
+RESUMABLE_PHASES = ("intro", "waiting_for_improv", "reacting")
+
+# room names from frontend/app/api/connection-details/route.ts
+PLAYER_ROOM = re.compile(r"improv-(?P<player>[A-Za-z0-9-]{1,64})-\d+")
+
+
+def checkpoint_key(room: str) -> str:
+    """
+    Key for a room's show: the player id in `improv-<player id>-<ms>`, so the
+    room of a reconnect finds it; any other room name is its own key.
+    """
+    match = PLAYER_ROOM.fullmatch(room)
+    return f"player:{match.group('player')}" if match else room
+
+
+def snapshot(state: SessionState) -> dict[str, Any]:
+    """
+    The parts of `state` needed to carry on the show; transient STT state is left out.
+    """
+    return {
+        "player_name": state.player_name,
+        "current_round": state.current_round,
+        "max_rounds": state.max_rounds,
+        "phase": state.phase,
+        "current_scenario": state.current_scenario,
+        "rounds": state.rounds,
+        "drawn": list(state.deck.drawn) if state.deck is not None else [],
+    }
+
+
+def restore(state: SessionState, data: dict[str, Any]) -> None:
+    """
+    Load a snapshot into a fresh `state`. Set `state.deck` first so the
+    scenarios already played are not drawn again.
+    """
+    state.player_name = data.get("player_name")
+    state.current_round = int(data.get("current_round", 0))
+    state.max_rounds = int(data.get("max_rounds", state.max_rounds))
+    phase = data.get("phase")
+    state.phase = phase if phase in RESUMABLE_PHASES else "intro"
+    state.current_scenario = data.get("current_scenario")
+    state.rounds = list(data.get("rounds") or [])
+    # totals are rebuilt rather than stored: a few rounds at most
+    for record in state.rounds:
+        state.aggregates.add_round(record)
+    if state.deck is not None:
+        state.deck.mark_drawn(data.get("drawn") or [])
+
+
+def encode(data: dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def decode(body: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(body))
+
+
+# ---------------------------------------------------------
+#  SQLite store (blocking; used from a single writer thread)
+# ---------------------------------------------------------
+class CheckpointStore:
+    """
+    Latest snapshot per show in a WAL-mode SQLite file; the `room` column holds
+    the `checkpoint_key()`.
+
+    Every job process on the host shares the file, so a show's new job finds
+    what the crashed or disconnected one wrote. synchronous=NORMAL skips the fsync per commit;
+    a power cut may lose the last snapshot, a process crash does not.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                " room TEXT PRIMARY KEY, version INTEGER, saved_at REAL, body BLOB)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def save(self, room: str, body: bytes, saved_at: float) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (room, version, saved_at, body) VALUES (?, ?, ?, ?)",
+                (room, CHECKPOINT_VERSION, saved_at, body),
+            )
+
+    def load(self, room: str) -> Optional[tuple[int, float, bytes]]:
+        """
+        (version, saved_at, body) of the room's snapshot, or None.
+        """
+        row = self._connect().execute(
+            "SELECT version, saved_at, body FROM checkpoints WHERE room = ?", (room,)
+        ).fetchone()
+        return tuple(row) if row is not None else None  # type: ignore[return-value]
+
+    def delete(self, room: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM checkpoints WHERE room = ?", (room,))
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ---------------------------------------------------------
+#  Async front end
+# ---------------------------------------------------------
+class Checkpointer:
+    """
+    `save()` and `clear()` return at once: the snapshot is encoded on the
+    loop (tens of microseconds) and written in the background. Snapshots
+    older than `max_age` seconds are not resumed; the player has moved on.
+    """
+
+    def __init__(self, store: CheckpointStore, max_age: float = 900.0):
+        self.store = store
+        self.max_age = max_age
+        # sqlite connections are thread-bound; keep every store call on one thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._pending: dict[str, Optional[bytes]] = {}  # room -> newest body, None to delete
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.last_write = 0.0  # seconds the last write spent in SQLite
+
+    def save(self, room: str, state: SessionState) -> None:
+        self._queue(room, encode(snapshot(state)))
+
+    def clear(self, room: str) -> None:
+        self._queue(room, None)
+
+    async def load(self, room: str) -> Optional[dict[str, Any]]:
+        """
+        The room's snapshot if there is a current one to resume.
+        """
+        await self.flush()
+        try:
+            row = await self._run(self.store.load, room)
+        except Exception as e:
+            logger.warning("Could not read checkpoint for %s: %s", room, e)
+            return None
+        if row is None:
+            return None
+        version, saved_at, body = row
+        age = time.time() - saved_at
+        if version != CHECKPOINT_VERSION or age > self.max_age:
+            logger.info("Ignoring checkpoint for %s (version %s, %.0f s old)", room, version, age)
+            self.clear(room)
+            return None
+        return decode(body)
+
+    async def flush(self) -> None:
+        """
+        Wait until every queued snapshot is on disk.
+        """
+        while self._task is not None and not self._task.done():
+            await asyncio.shield(self._task)
+
+    async def aclose(self) -> None:
+        await self.flush()
+        await self._run(self.store.close)
+
+    def _queue(self, room: str, body: Optional[bytes]) -> None:
+        # a newer snapshot of the same room replaces one that hasn't been written yet
+        self._pending[room] = body
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._write_pending(), name="checkpoint_writer")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _write_pending(self) -> None:
+        while self._pending:
+            room = next(iter(self._pending))
+            body = self._pending.pop(room)
+            started = time.perf_counter()
+            try:
+                if body is None:
+                    await self._run(self.store.delete, room)
+                else:
+                    await self._run(self.store.save, room, body, time.time())
+                    self.written += 1
+            except Exception as e:
+                logger.warning("Could not write checkpoint for %s: %s", room, e)
+            self.last_write = time.perf_counter() - started
@@ -0,0 +1,106 @@
+"""
+Bounded LLM context for the host.
+
+Every LLM request sees the static system prompt first (a stable, cacheable
+prefix), then one short summary of the rounds already played, then only the
+chat items of the current round. The full history stays in the session; only
+the view sent to the model is trimmed.
+"""
+
+import logging
+from typing import Any, Optional
+
+from livekit.agents import llm
+
+logger = logging.getLogger("improv_spotlight")
+
+SNIPPET_CHARS = 60
+
+# rough chars-per-token for English text, for offline estimates only
+CHARS_PER_TOKEN = 4
+
+
+def _snippet(text: Optional[str]) -> str:
+    text = (text or "").strip()
+    return text if len(text) <= SNIPPET_CHARS else text[:SNIPPET_CHARS] + "..."
+
+
+def round_summary_line(record: dict[str, Any]) -> str:
+    return (
+        f"Round {record.get('round_index')} \"{record.get('scenario_title')}\""
+        f" ({record.get('reaction_tone')}): player did \"{_snippet(record.get('player_text'))}\""
+    )
+
+
+def summarize_rounds(player_name: Optional[str], rounds: list[dict[str, Any]]) -> str:
+    lines = [f"Show so far for {player_name or 'the player'} ({len(rounds)} rounds done):"]
+    lines.extend(f"- {round_summary_line(r)}" for r in rounds)
+    lines.append("Call round_details for the full text of an earlier round.")
+    return "\n".join(lines)
+
+
+def estimate_tokens(chat_ctx: llm.ChatContext) -> int:
+    """
+    Approximate prompt size, for stand-in LLMs that can't count tokens.
+    """
+    chars = 0
+    for item in chat_ctx.items:
+        if item.type == "message":
+            chars += len(item.text_content or "")
+        elif item.type == "function_call":
+            chars += len(item.name) + len(item.arguments)
+        elif item.type == "function_call_output":
+            chars += len(item.name) + len(item.output)
+    return chars // CHARS_PER_TOKEN
+
+
+class ContextWindow:
+    """
+    Tracks where the current round starts in the chat history and builds the
+    trimmed view that is sent to the LLM.
+    """
+
+    def __init__(self):
+        self.round_start_id: Optional[str] = None
+        self._summary_rounds = -1
+        self._summary: Optional[llm.ChatMessage] = None
+
+    def mark_round_start(self, chat_ctx: llm.ChatContext) -> None:
+        """
+        Start the current round at the latest user message (the turn that
+        asked for the next scene).
+        """
+        for item in reversed(chat_ctx.items):
+            if item.type == "message" and item.role == "user":
+                self.round_start_id = item.id
+                return
+
+    def view(
+        self, chat_ctx: llm.ChatContext, player_name: Optional[str], rounds: list[dict[str, Any]]
+    ) -> llm.ChatContext:
+        if self.round_start_id is None:
+            return chat_ctx
+        start = chat_ctx.index_by_id(self.round_start_id)
+        if start is None:
+            return chat_ctx
+
+        items = chat_ctx.items
+        # leading system messages are the agent instructions: keep them verbatim
+        prefix = 0
+        while prefix < start and items[prefix].type == "message" and items[prefix].role == "system":
+            prefix += 1
+
+        view = list(items[:prefix])
+        if rounds:
+            view.append(self._summary_message(player_name, rounds))
+        view.extend(items[start:])
+        return llm.ChatContext(view)
+
+    def _summary_message(self, player_name: Optional[str], rounds: list[dict[str, Any]]) -> llm.ChatMessage:
+        # rebuilt once per round so the message (and its id) stays stable in between
+        if self._summary is None or self._summary_rounds != len(rounds):
+            self._summary = llm.ChatMessage(
+                role="system", content=[summarize_rounds(player_name, rounds)]
+            )
+            self._summary_rounds = len(rounds)
+        return self._summary
@@ -0,0 +1,159 @@
+"""
+Sentence tokenizer that lets the first clause of a reply go to TTS early.
+
+The StreamAdapter hands text to TTS one sentence at a time, and the basic
+tokenizer only releases a sentence once the next one has started. A long
+first line ("Welcome back to the stage, my fearless friend, for a scene
+that ...") therefore holds back the first audio until the LLM has written
+all of it. FirstClauseTokenizer releases the first piece of each stream as
+soon as it is a usable clause:
+
+  - at the first clause break (, ; : dash) or sentence end with at least
+    `min_words` words before it;
+  - else once `max_words` complete words have arrived;
+  - else, `max_wait` seconds after the first text, with whatever complete
+    words there are (at least `min_words`).
+
+Everything after that goes through the wrapped sentence tokenizer, so the
+rest of the reply keeps whole-sentence prosody. `tokenize()` makes the same
+split for text that is already complete, which keeps pre-rendered and
+cached audio in step with what the stream sends.
+"""
+
+import asyncio
+import re
+from typing import Optional
+
+from livekit.agents import tokenize, utils
+from livekit.agents.tokenize.tokenizer import TokenData
+
+# a clause break or a sentence end, followed by the whitespace that proves it is one
+CLAUSE_BREAK = re.compile(r"(?:[,;:.!?…]|\s[-–—]|—)[\"'”’)]*(?=\s)")  # noqa: RUF001
+# a word known to be complete because whitespace follows it
+WORD = re.compile(r"\S+(?=\s)")
+
+
+def first_clause(text: str, min_words: int, max_words: int) -> Optional[tuple[str, str]]:
+    """
+    (clause, rest) if `text` already holds a first clause, else None.
+    Only complete words count: the last word may still be growing.
+    """
+    for match in CLAUSE_BREAK.finditer(text):
+        head = text[: match.end()].strip()
+        if sum(any(c.isalnum() for c in w) for w in head.split()) >= min_words:
+            return head, text[match.end():]
+    return complete_words(text, max_words)
+
+
+def complete_words(text: str, count: int, take_all: bool = False) -> Optional[tuple[str, str]]:
+    """
+    (head, rest) cut after the first `count` complete words, or after all of
+    them with `take_all`; None if there are fewer than `count`.
+    """
+    ends = [m.end() for m in WORD.finditer(text)]
+    if len(ends) < count:
+        return None
+    cut = ends[-1] if take_all else ends[count - 1]
+    return text[:cut].strip(), text[cut:]
+
+
+class FirstClauseTokenizer(tokenize.SentenceTokenizer):
+    def __init__(
+        self,
+        sentences: tokenize.SentenceTokenizer,
+        min_words: int = 3,
+        max_words: int = 12,
+        max_wait: float = 0.5,
+    ):
+        self.sentences = sentences
+        self.min_words = min_words
+        self.max_words = max_words
+        self.max_wait = max_wait
+
+    def tokenize(self, text: str, *, language: Optional[str] = None) -> list[str]:
+        split = first_clause(text + " ", self.min_words, self.max_words)
+        if split is None or not split[1].strip():
+            return self.sentences.tokenize(text, language=language)
+        clause, rest = split
+        return [clause, *self.sentences.tokenize(rest.strip(), language=language)]
+
+    def stream(self, *, language: Optional[str] = None) -> "FirstClauseStream":
+        return FirstClauseStream(self, self.sentences.stream(language=language))
+
+
+class FirstClauseStream(tokenize.SentenceStream):
+    """
+    Holds text until the first clause is out, then passes everything to `inner`.
+    """
+
+    def __init__(self, tokenizer: FirstClauseTokenizer, inner: tokenize.SentenceStream):
+        super().__init__()
+        self.tokenizer = tokenizer
+        self.inner = inner
+        self._buf = ""
+        self._first = True
+        self._overdue = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._forward = asyncio.create_task(self._forward_sentences())
+
+    def push_text(self, text: str) -> None:
+        self._check_not_closed()
+        if not self._first:
+            self.inner.push_text(text)
+            return
+        self._buf += text
+        if self._timer is None and not self._overdue:
+            self._timer = asyncio.get_running_loop().call_later(self.tokenizer.max_wait, self._deadline)
+        self._try_release()
+
+    def flush(self) -> None:
+        self._check_not_closed()
+        if self._first and self._buf.strip():
+            self._release(self._buf.strip(), "")
+        self.inner.flush()
+
+    def end_input(self) -> None:
+        self.flush()
+        self.inner.end_input()
+
+    async def aclose(self) -> None:
+        self._cancel_timer()
+        await self.inner.aclose()
+        await utils.aio.cancel_and_wait(self._forward)
+        self._do_close()
+
+    def _try_release(self) -> None:
+        t = self.tokenizer
+        split = first_clause(self._buf, t.min_words, t.max_words)
+        if split is None and self._overdue:
+            # out of time: any complete words will do
+            split = complete_words(self._buf, t.min_words, take_all=True)
+        if split is not None:
+            self._release(*split)
+
+    def _release(self, clause: str, rest: str) -> None:
+        self._first = False
+        self._buf = ""
+        self._cancel_timer()
+        self._event_ch.send_nowait(TokenData(token=clause, segment_id=utils.shortuuid()))
+        if rest.strip():
+            self.inner.push_text(rest.lstrip())
+
+    def _deadline(self) -> None:
+        self._timer = None
+        self._overdue = True
+        if self._first and not self._event_ch.closed:
+            self._try_release()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _forward_sentences(self) -> None:
+        try:
+            async for ev in self.inner:
+                self._event_ch.send_nowait(ev)
+        finally:
+            self._cancel_timer()
+            self._do_close()
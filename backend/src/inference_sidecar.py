@@ -0,0 +1,332 @@
+"""
+Host-wide VAD inference sidecar.
+
+Without it every job process loads its own Silero VAD session and runs one
+32 ms window per call. The sidecar holds a single ONNX session and listens on
+a Unix socket: every VAD stream on the host opens one connection and sends
+its windows there. Windows arriving within `max_wait` of each other are run
+as one batch, with each stream's RNN state and context kept in the sidecar.
+
+    python src/agent.py inference-sidecar      # SPOTLIGHT_INFERENCE_SOCKET
+
+SidecarVAD is a drop-in for silero.VAD on the job side. When the sidecar
+cannot be reached a stream falls back to an in-process model.
+
+Turn detection needs nothing here: MultilingualModel already sends its
+requests to the worker's shared inference process, which holds one copy of
+the model for all jobs.
+
+Wire format: the client sends `HELLO` (magic, sample rate) and reads back the
+window size, then sends float32 windows and reads one float32 probability
+for each.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import struct
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import numpy as np
+from livekit.plugins import silero
+from livekit.plugins.silero import onnx_model
+
+logger = logging.getLogger("improv_spotlight")
+
+HELLO = struct.Struct("!4sI")
+MAGIC = b"VAD1"
+WINDOW_SIZE = struct.Struct("!I")
+PROBABILITY = struct.Struct("<f")
+
+# sample rate -> (window, context) samples, as in silero's OnnxModel
+WINDOWS: dict[int, tuple[int, int]] = {16000: (512, 64), 8000: (256, 32)}
+
+
+# ---------------------------------------------------------
+#  Batched model
+# ---------------------------------------------------------
+class StreamState:
+    """
+    RNN state and trailing context of one VAD stream.
+    """
+
+    __slots__ = ("context", "sample_rate", "state")
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = np.zeros(WINDOWS[sample_rate][1], dtype=np.float32)
+
+
+class BatchedVAD:
+    """
+    Runs windows from many streams of one sample rate through the model in a single call.
+    """
+
+    def __init__(self, session: Any):
+        self.session = session
+
+    def run(self, sample_rate: int, items: list[tuple[StreamState, np.ndarray]]) -> np.ndarray:
+        window, context = WINDOWS[sample_rate]
+        batch = len(items)
+        inputs = np.empty((batch, context + window), dtype=np.float32)
+        state = np.empty((2, batch, 128), dtype=np.float32)
+        for i, (stream, samples) in enumerate(items):
+            inputs[i, :context] = stream.context
+            inputs[i, context:] = samples
+            state[:, i] = stream.state[:, 0]
+        out, new_state = self.session.run(
+            None, {"input": inputs, "state": state, "sr": np.array(sample_rate, dtype=np.int64)}
+        )
+        for i, (stream, _) in enumerate(items):
+            stream.state = new_state[:, i:i + 1].copy()
+            stream.context = inputs[i, -context:].copy()
+        return out[:, 0]
+
+
+# ---------------------------------------------------------
+#  Sidecar server
+# ---------------------------------------------------------
+class InferenceSidecar:
+    """
+    Unix-socket server in front of one BatchedVAD.
+
+    A batch closes when it has `max_batch` windows or `max_wait` seconds after
+    its first window arrived; the model runs on its own thread so the next
+    batch keeps filling meanwhile.
+    """
+
+    def __init__(self, socket_path: str, max_batch: int = 64, max_wait: float = 0.002, session: Any = None):
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.model = BatchedVAD(session or onnx_model.new_inference_session(force_cpu=True))
+        self.batches = 0
+        self.windows = 0
+        self.streams = 0
+        self._pending: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad_sidecar")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)  # left over from a previous run
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        self._pending = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches(), name="vad_sidecar_batches")
+        self._server = await asyncio.start_unix_server(self._serve_stream, path=self.socket_path)
+        logger.info("VAD sidecar listening on %s", self.socket_path)
+
+    async def aclose(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._batcher is not None:
+            self._batcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._batcher
+        self._executor.shutdown(wait=False)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    async def _serve_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)  # type: ignore[arg-type]
+        try:
+            magic, sample_rate = HELLO.unpack(await reader.readexactly(HELLO.size))
+            if magic != MAGIC or sample_rate not in WINDOWS:
+                writer.write(WINDOW_SIZE.pack(0))
+                return
+            window = WINDOWS[sample_rate][0]
+            writer.write(WINDOW_SIZE.pack(window))
+            stream = StreamState(sample_rate)
+            self.streams += 1
+            loop = asyncio.get_running_loop()
+            while True:
+                data = await reader.readexactly(window * 4)
+                result = loop.create_future()
+                self._pending.put_nowait((stream, np.frombuffer(data, dtype="<f4"), result))  # type: ignore[union-attr]
+                writer.write(PROBABILITY.pack(await result))
+        except (asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # the stream closed, or the sidecar is shutting down
+        except Exception as e:
+            logger.warning("VAD sidecar stream failed: %s", e)
+        finally:
+            self._connections.discard(task)  # type: ignore[arg-type]
+            writer.close()
+
+    async def _run_batches(self) -> None:
+        pending = self._pending
+        assert pending is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await pending.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            for sample_rate in {stream.sample_rate for stream, _, _ in batch}:
+                group = [b for b in batch if b[0].sample_rate == sample_rate]
+                try:
+                    probs = await loop.run_in_executor(
+                        self._executor, self.model.run, sample_rate, [(s, x) for s, x, _ in group]
+                    )
+                except Exception as e:
+                    for _, _, result in group:
+                        if not result.done():
+                            result.set_exception(e)
+                    continue
+                for (_, _, result), p in zip(group, probs):
+                    if not result.done():
+                        result.set_result(float(p))
+            self.batches += 1
+            self.windows += len(batch)
+
+
+async def serve(socket_path: str) -> None:
+    sidecar = InferenceSidecar(socket_path)
+    await sidecar.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sidecar.aclose()
+
+
+# ---------------------------------------------------------
+#  Job side
+# ---------------------------------------------------------
+class RemoteVADModel:
+    """
+    Stands in for silero's OnnxModel inside a VADStream. Calls block (the
+    stream runs them on an executor thread) for one round trip to the sidecar;
+    the connection is opened by the first call, so the job's event loop never
+    waits on it. If the sidecar can't be reached or goes away, `fallback()`
+    provides a local model for the rest of the stream.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        sample_rate: int,
+        fallback: Callable[[], Any],
+        timeout: float = 1.0,
+    ):
+        if sample_rate not in WINDOWS:
+            raise ValueError("Silero VAD only supports 8KHz and 16KHz sample rates")
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sample_rate = sample_rate
+        self._window, self._context = WINDOWS[sample_rate]
+        self._fallback = fallback
+        self._sock: Optional[socket.socket] = None
+        self._local: Any = None
+        self._served = 0  # windows answered by the sidecar
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def window_size_samples(self) -> int:
+        return self._window
+
+    @property
+    def context_size(self) -> int:
+        return self._context
+
+    def __call__(self, x: np.ndarray) -> float:
+        if self._local is None:
+            try:
+                sock = self._sock or self._connect()
+                sock.sendall(np.ascontiguousarray(x, dtype="<f4").tobytes())
+                p = PROBABILITY.unpack(self._recv(sock, PROBABILITY.size))[0]
+                self._served += 1
+                return p
+            except OSError as e:
+                if self._served:
+                    # the local model starts from zeroed RNN state and no context
+                    logger.warning(
+                        "Lost the VAD sidecar after %d windows (%s), running VAD in process;"
+                        " the model state resets, so speech in progress may be cut or split",
+                        self._served, e,
+                    )
+                else:
+                    logger.warning("VAD sidecar unavailable (%s), running VAD in process", e)
+                self.close()
+                self._local = self._fallback()
+        return self._local(x)
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock = sock
+        weakref.finalize(self, sock.close)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        sock.sendall(HELLO.pack(MAGIC, self._sample_rate))
+        (window,) = WINDOW_SIZE.unpack(self._recv(sock, WINDOW_SIZE.size))
+        if window != self._window:
+            raise ConnectionError(f"sidecar refused {self._sample_rate} Hz windows")
+        return sock
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    @staticmethod
+    def _recv(sock: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("VAD sidecar closed the connection")
+            data += chunk
+        return data
+
+
+class SidecarVAD(silero.VAD):
+    """
+    silero.VAD whose streams run inference in the sidecar at `socket_path`.
+    No model is loaded in this process unless the sidecar is unreachable.
+
+    Builds on the plugin's private `_VADOptions` and `VADStream(vad, opts,
+    model)`, so livekit-plugins-silero is pinned in pyproject.toml and
+    tests/test_inference_sidecar.py fails if either changes shape.
+    """
+
+    def __init__(self, socket_path: str, sample_rate: int = 16000, **options: float):
+        defaults = {
+            "min_speech_duration": 0.05,
+            "min_silence_duration": 0.55,
+            "prefix_padding_duration": 0.5,
+            "max_buffered_speech": 60.0,
+            "activation_threshold": 0.5,
+        }
+        defaults.update(options)
+        # same defaults as silero.VAD.load()
+        super().__init__(session=None, opts=silero.vad._VADOptions(sample_rate=sample_rate, **defaults))
+        self.socket_path = socket_path
+
+    def stream(self) -> "silero.vad.VADStream":
+        model = RemoteVADModel(self.socket_path, self._opts.sample_rate, self._local_model)
+        stream = silero.vad.VADStream(self, self._opts, model)
+        self._streams.add(stream)
+        return stream
+
+    def _local_model(self) -> Any:
+        if self._onnx_session is None:
+            self._onnx_session = onnx_model.new_inference_session(force_cpu=True)
+        return onnx_model.OnnxModel(onnx_session=self._onnx_session, sample_rate=self._opts.sample_rate)
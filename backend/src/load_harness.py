@@ -0,0 +1,242 @@
+"""
+Offline load generator: N concurrent simulated shows against the real
+SpotlightHost tools, with scripted stand-in LLM/TTS and a simulated STT delay.
+
+Used by benchmarks/load_test.py; kept importable so tests can run a tiny load.
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import resource
+import time
+from typing import Callable, Optional
+
+from livekit.agents import AgentSession, llm
+
+from agent import SpotlightHost
+from session_state import SessionRegistry
+from stand_ins import (
+    CaptureAudioOutput,
+    FakeTTS,
+    ScriptedLLM,
+    ToolCall,
+    last_item,
+    transcribe,
+)
+from tracing import timed_tools
+
+logger = logging.getLogger("improv_spotlight")
+
+
+# ---------------------------------------------------------
+#  Config and report
+# ---------------------------------------------------------
+class LoadConfig:
+    def __init__(
+        self,
+        stt_latency: float = 0.15,
+        llm_ttft: float = 0.3,
+        llm_token_delay: float = 0.01,
+        tts_latency: float = 0.1,
+        perform_seconds: float = 1.0,
+        rounds: int = 4,
+        lag_interval: float = 0.05,
+    ):
+        self.stt_latency = stt_latency
+        self.llm_ttft = llm_ttft
+        self.llm_token_delay = llm_token_delay
+        self.tts_latency = tts_latency
+        self.perform_seconds = perform_seconds
+        self.rounds = rounds
+        self.lag_interval = lag_interval
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class LoadReport:
+    def __init__(self, sessions: int):
+        self.sessions = sessions
+        self.tool_latencies: dict[str, list[float]] = {}
+        self.loop_lag: list[float] = []
+        self.rss_baseline = 0
+        self.rss_peak = 0
+        self.wall_seconds = 0.0
+        self.failures: list[str] = []
+
+    def all_tool_latencies(self) -> list[float]:
+        return [v for values in self.tool_latencies.values() for v in values]
+
+    @property
+    def rss_per_session(self) -> float:
+        return max(self.rss_peak - self.rss_baseline, 0) / max(self.sessions, 1)
+
+    def summary(self) -> dict[str, float]:
+        tools = self.all_tool_latencies()
+        return {
+            "sessions": self.sessions,
+            "tool_calls": len(tools),
+            "tool_p50_ms": percentile(tools, 50) * 1000,
+            "tool_p95_ms": percentile(tools, 95) * 1000,
+            "tool_p99_ms": percentile(tools, 99) * 1000,
+            "loop_lag_p50_ms": percentile(self.loop_lag, 50) * 1000,
+            "loop_lag_p95_ms": percentile(self.loop_lag, 95) * 1000,
+            "loop_lag_p99_ms": percentile(self.loop_lag, 99) * 1000,
+            "rss_per_session_kib": self.rss_per_session / 1024,
+            "wall_s": self.wall_seconds,
+            "failures": len(self.failures),
+        }
+
+
+# ---------------------------------------------------------
+#  Measurement helpers
+# ---------------------------------------------------------
+def current_rss() -> int:
+    """
+    Resident set size in bytes (falls back to peak RSS where /proc is missing).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def timed_host_class(base: type, sink: dict[str, list[float]]) -> type:
+    """
+    Subclass of `base` whose tool calls append their wall time to `sink[name]`.
+    """
+    return timed_tools(base, lambda _host, name, seconds: sink.setdefault(name, []).append(seconds))
+
+
+async def monitor_loop_lag(samples: list[float], interval: float, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+# ---------------------------------------------------------
+#  Simulated show
+# ---------------------------------------------------------
+def host_script(chat_ctx: llm.ChatContext):
+    """
+    What a well-behaved host LLM does at each step of the show.
+    """
+    item = last_item(chat_ctx)
+    if item is None or (item.type == "message" and item.role == "assistant"):
+        return "Welcome to Improv Spotlight! What's your name?"
+    if item.type == "message" and item.role == "user":
+        text = item.text_content or ""
+        if text.startswith("My name is "):
+            return ToolCall("set_player", {"name": text[len("My name is "):]})
+        if text == "End scene":
+            return ToolCall("complete_improv")
+        return ToolCall("next_scene")
+    if item.type == "function_call_output":
+        if item.name == "set_player":
+            return "Great to meet you! Say ready when you want the first scene."
+        if item.name == "next_scene":
+            return "Here is your scene. You are a chef whose soup keeps talking back. Start when ready."
+        if item.name == "complete_improv":
+            return "That was wonderful. Get ready for the next scene!"
+    return None
+
+
+async def run_show(index: int, cfg: LoadConfig, host_cls: type, registry: SessionRegistry) -> None:
+    key = f"load-{index}"
+    state = registry.acquire(key)
+    state.max_rounds = cfg.rounds
+    session = AgentSession(
+        llm=ScriptedLLM(host_script, ttft=cfg.llm_ttft, token_delay=cfg.llm_token_delay),
+        tts=FakeTTS(latency=cfg.tts_latency),
+    )
+    session.output.audio = CaptureAudioOutput()
+    try:
+        await session.start(host_cls(state))
+
+        async def say(text: str) -> None:
+            # stand-in for the final transcript arriving from STT
+            await asyncio.sleep(cfg.stt_latency)
+            await session.run(user_input=text)
+
+        await say(f"My name is Player {index}")
+        for _ in range(cfg.rounds):
+            await say("I'm ready")
+            await asyncio.sleep(cfg.perform_seconds)
+            transcribe(session, "I juggle the talking soup.")
+            await say("End scene")
+    finally:
+        await session.aclose()
+
+
+async def run_load(sessions: int, cfg: Optional[LoadConfig] = None) -> LoadReport:
+    """
+    Run `sessions` concurrent shows on the current loop and collect latencies.
+    """
+    cfg = cfg or LoadConfig()
+    report = LoadReport(sessions)
+    registry = SessionRegistry()
+    host_cls = timed_host_class(SpotlightHost, report.tool_latencies)
+
+    gc.collect()
+    report.rss_baseline = current_rss()
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(monitor_loop_lag(report.loop_lag, cfg.lag_interval, stop))
+
+    async def sample_rss() -> None:
+        while not stop.is_set():
+            report.rss_peak = max(report.rss_peak, current_rss())
+            await asyncio.sleep(0.25)
+
+    rss_task = asyncio.create_task(sample_rss())
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_show(i, cfg, host_cls, registry) for i in range(sessions)), return_exceptions=True
+    )
+    report.wall_seconds = time.perf_counter() - started
+    report.rss_peak = max(report.rss_peak, current_rss())
+    stop.set()
+    await asyncio.gather(lag_task, rss_task)
+
+    for i, res in enumerate(results):
+        if isinstance(res, BaseException):
+            report.failures.append(f"session {i}: {res!r}")
+            continue
+        st = registry.get(f"load-{i}")
+        if st is None or st.player_name != f"Player {i}" or len(st.rounds) != cfg.rounds:
+            report.failures.append(f"session {i}: incomplete or mixed state")
+    return report
+
+
+async def find_saturation(
+    levels: list[int],
+    cfg: Optional[LoadConfig] = None,
+    max_loop_lag_p95: float = 0.1,
+    max_tool_p95: float = 0.25,
+    on_level: Optional[Callable[[LoadReport], None]] = None,
+) -> Optional[int]:
+    """
+    Ramp through `levels` and return the first session count at which p95 event-loop
+    lag or p95 tool latency exceeds its limit (None if none did).
+    """
+    for n in levels:
+        report = await run_load(n, cfg)
+        if on_level is not None:
+            on_level(report)
+        summary = report.summary()
+        if (
+            summary["loop_lag_p95_ms"] > max_loop_lag_p95 * 1000
+            or summary["tool_p95_ms"] > max_tool_p95 * 1000
+            or report.failures
+        ):
+            return n
+    return None
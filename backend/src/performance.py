@@ -0,0 +1,271 @@
+"""
+Incremental analysis of the player's performance, so a reaction can be
+chosen the moment a scene ends without another LLM call.
+
+Every STT event during a scene updates a fixed-size set of running
+statistics; nothing grows with the length of the scene:
+
+  - speaking rate: words over speaking time, each utterance timed from its
+    first interim transcript to its final one;
+  - pauses: the silence before each utterance, as a running total and a
+    histogram over PAUSE_BINS;
+  - lexical diversity: distinct words over all words. Words are hashed into
+    a bitmap and distinct words estimated by linear counting;
+  - scenario overlap: share of the scenario's keywords the player used,
+    marked in the same hash space;
+  - fillers ("um", "uh", ...) per word.
+
+`finish()` turns them into a Performance with a 0..1 score, and
+`choose_reaction()` maps that to a tone and picks the template whose cue
+best matches what stood out.
+"""
+
+import math
+import re
+import time
+import zlib
+from collections.abc import Iterable
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+HASH_SIZE = 4096  # bitmap slots; a scene uses a few hundred distinct words at most
+PAUSE_BINS = np.array([0.5, 1.0, 2.0, 4.0])  # seconds; histogram buckets are the gaps between
+LONG_PAUSE = 2.0
+LONG_BUCKET = int(np.searchsorted(PAUSE_BINS, LONG_PAUSE, side="right"))  # first bucket of pauses > LONG_PAUSE
+
+# score weights: length, pace, fluency, diversity, relevance
+WEIGHTS = np.array([0.25, 0.15, 0.2, 0.2, 0.2])
+FULL_SCENE_WORDS = 60
+NATURAL_RATE = 2.5  # words per second, about 150 wpm
+POSITIVE_AT = 0.6
+NEUTRAL_AT = 0.4
+
+FILLERS = frozenset({"um", "umm", "uh", "uhh", "er", "erm", "hmm", "mm"})
+STOPWORDS = frozenset(
+    ["a", "an", "the", "and", "or", "but", "if", "of", "to", "in", "on", "at", "by", "for", "with", "from", "as", "is", "are", "was", "were", "be", "been", "being", "it", "its", "this", "that", "these", "those", "you", "your", "yours", "he", "she", "they", "them", "his", "her", "their", "we", "our", "us", "i", "me", "my", "who", "what", "when", "where", "why", "how", "not", "no", "so", "do", "does", "did", "has", "have", "had", "will", "would", "can", "could", "should", "just", "than", "then", "there", "here", "into", "out", "up", "about", "over", "after", "before", "all", "any", "some", "one"]
+)
+
+WORD = re.compile(r"[a-z']+")
+
+
+def _slots(words: list[str]) -> np.ndarray:
+    # crc32 rather than hash(): the same word lands in the same slot in every process
+    return np.fromiter((zlib.crc32(w.encode()) % HASH_SIZE for w in words), dtype=np.intp, count=len(words))
+
+
+def _distinct(bitmap: np.ndarray) -> float:
+    """
+    Linear-counting estimate of how many distinct words set `bitmap`.
+    """
+    empty = HASH_SIZE - int(np.count_nonzero(bitmap))
+    if empty == 0:
+        return float(HASH_SIZE)
+    return -HASH_SIZE * math.log(empty / HASH_SIZE)
+
+
+# ---------------------------------------------------------
+#  Result
+# ---------------------------------------------------------
+class Performance:
+    """
+    Features of one finished scene, each scaled to 0..1 where it feeds the score.
+    """
+
+    __slots__ = ("coverage", "diversity", "filler_share", "long_pause_share", "mean_pause", "pauses", "rate", "words")
+
+    def __init__(
+        self,
+        words: int = 0,
+        rate: Optional[float] = None,
+        mean_pause: Optional[float] = None,
+        long_pause_share: float = 0.0,
+        diversity: float = 0.0,
+        coverage: Optional[float] = None,
+        filler_share: float = 0.0,
+        pauses: Optional[list[int]] = None,
+    ):
+        self.words = words
+        self.rate = rate
+        self.mean_pause = mean_pause
+        self.long_pause_share = long_pause_share
+        self.diversity = diversity
+        self.coverage = coverage
+        self.filler_share = filler_share
+        self.pauses = pauses or []
+
+    def components(self) -> np.ndarray:
+        """
+        length, pace, fluency, diversity and relevance, each 0..1 (0.5 when unknown).
+        """
+        pace = 0.5 if self.rate is None else 1.0 - min(abs(self.rate - NATURAL_RATE) / 1.5, 1.0)
+        relevance = 0.5 if self.coverage is None else min(self.coverage / 0.25, 1.0)
+        # a handful of words is always "diverse": trust the ratio only as the scene gets longer
+        diversity = 0.5 + (min(max((self.diversity - 0.3) / 0.4, 0.0), 1.0) - 0.5) * min(self.words / 20, 1.0)
+        return np.clip(
+            np.array([
+                self.words / FULL_SCENE_WORDS,
+                pace,
+                1.0 - self.long_pause_share - 2 * self.filler_share,
+                diversity,
+                relevance,
+            ]),
+            0.0,
+            1.0,
+        )
+
+    @property
+    def score(self) -> float:
+        return float(WEIGHTS @ self.components())
+
+    def tone(self) -> str:
+        if not self.words:
+            # nothing was transcribed: don't judge what we didn't hear
+            return "neutral"
+        if self.score >= POSITIVE_AT:
+            return "positive"
+        return "neutral" if self.score >= NEUTRAL_AT else "gentle_critique"
+
+    def cues(self) -> dict[str, float]:
+        """
+        How strongly each thing a reaction template may remark on stood out, 0..1.
+        """
+        _, _, _, diversity, relevance = self.components()
+        rate = NATURAL_RATE if self.rate is None else self.rate
+        return {
+            "fast_pace": min(max(rate - 3.0, 0.0), 1.0),
+            "slow_pace": min(max(2.0 - rate, 0.0), 1.0),
+            "long_pauses": self.long_pause_share,
+            "few_pauses": 1.0 - self.long_pause_share if self.mean_pause is not None else 0.5,
+            "rich_language": float(diversity),
+            "plain_language": 1.0 - float(diversity),
+            "on_topic": float(relevance),
+            "off_topic": 1.0 - float(relevance),
+        }
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "words": self.words,
+            "rate": None if self.rate is None else round(self.rate, 2),
+            "mean_pause": None if self.mean_pause is None else round(self.mean_pause, 2),
+            "long_pause_share": round(self.long_pause_share, 2),
+            "diversity": round(self.diversity, 2),
+            "coverage": None if self.coverage is None else round(self.coverage, 2),
+            "filler_share": round(self.filler_share, 2),
+            "pauses": self.pauses,
+            "score": round(self.score, 2),
+        }
+
+
+# ---------------------------------------------------------
+#  Running analysis
+# ---------------------------------------------------------
+class PerformanceAnalyzer:
+    """
+    Running statistics of the scene being performed. `start()` each scene,
+    `observe()` every transcript event, `finish()` when it ends.
+    """
+
+    __slots__ = (
+        "_keywords",
+        "_last_final",
+        "_seen",
+        "_utterance_start",
+        "clock",
+        "fillers",
+        "keyword_count",
+        "pause_total",
+        "pauses",
+        "speaking_time",
+        "timed_words",
+        "utterances",
+        "words",
+    )
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._seen = np.zeros(HASH_SIZE, dtype=bool)
+        self._keywords = np.zeros(HASH_SIZE, dtype=bool)
+        self.pauses = np.zeros(len(PAUSE_BINS) + 1, dtype=np.int64)
+        self.start()
+
+    def start(self, scenario: Optional[dict[str, Any]] = None) -> None:
+        self.words = 0
+        self.fillers = 0
+        self.timed_words = 0
+        self.speaking_time = 0.0
+        self.utterances = 0
+        self.pause_total = 0.0
+        self.pauses[:] = 0
+        self._seen[:] = False
+        self._keywords[:] = False
+        self._utterance_start = None
+        self._last_final = None
+        text = " ".join(str(scenario.get(k) or "") for k in ("title", "scenario")) if scenario else ""
+        keywords = [w for w in WORD.findall(text.lower()) if len(w) > 2 and w not in STOPWORDS]
+        if keywords:
+            self._keywords[_slots(keywords)] = True
+        self.keyword_count = int(np.count_nonzero(self._keywords))
+
+    def observe(self, text: str, is_final: bool, at: Optional[float] = None) -> None:
+        now = self.clock() if at is None else at
+        if self._utterance_start is None:
+            # first sign of a new utterance: the silence before it has ended
+            self._utterance_start = now
+            if self._last_final is not None:
+                pause = now - self._last_final
+                self.pause_total += pause
+                self.pauses[np.searchsorted(PAUSE_BINS, pause)] += 1
+        if not is_final:
+            return
+
+        words = WORD.findall(text.lower())
+        duration = now - self._utterance_start
+        self._utterance_start = None
+        self._last_final = now
+        if not words:
+            return
+        self.utterances += 1
+        self.words += len(words)
+        self.fillers += sum(w in FILLERS for w in words)
+        self._seen[_slots(words)] = True
+        # only utterances that had interims before their final can be timed
+        if duration > 0:
+            self.timed_words += len(words)
+            self.speaking_time += duration
+
+    def finish(self) -> Performance:
+        gaps = int(self.pauses.sum())
+        return Performance(
+            words=self.words,
+            rate=self.timed_words / self.speaking_time if self.speaking_time > 0 else None,
+            mean_pause=self.pause_total / gaps if gaps else None,
+            long_pause_share=float(self.pauses[LONG_BUCKET:].sum()) / gaps if gaps else 0.0,
+            diversity=min(_distinct(self._seen) / self.words, 1.0) if self.words else 0.0,
+            coverage=(
+                float(np.count_nonzero(self._seen & self._keywords)) / self.keyword_count
+                if self.keyword_count and self.words else None
+            ),
+            filler_share=self.fillers / self.words if self.words else 0.0,
+            pauses=self.pauses.tolist(),
+        )
+
+
+def choose_reaction(
+    performance: Performance,
+    templates: dict[str, list[str]],
+    cues: dict[str, list[str]],
+    used: Iterable[str] = (),
+) -> tuple[str, str]:
+    """
+    (tone, reaction): the template of the performance's tone whose cue stood
+    out most, preferring ones not yet said this show.
+    """
+    tone = performance.tone()
+    strengths = performance.cues()
+    said = set(used)
+    if len(templates[tone]) != len(cues[tone]):
+        raise ValueError(f"{tone!r} has {len(templates[tone])} templates but {len(cues[tone])} cues")
+    options = list(zip(templates[tone], cues[tone]))
+    text, _ = max(options, key=lambda option: (option[0] not in said, strengths.get(option[1], 0.0)))
+    return tone, text
@@ -0,0 +1,123 @@
+"""
+Event-driven player name resolution.
+
+The frontend puts `{"playerName": ...}` into the participant's token metadata,
+but the participant (or a metadata update) can arrive after the host starts
+talking. PlayerNameResolver watches the room instead of polling it once, so
+the greeting never has to wait for the name.
+"""
+
+import asyncio
+import contextlib
+import functools
+import json
+import logging
+from typing import Any, Callable, Optional
+
+from livekit import rtc
+
+logger = logging.getLogger("improv_spotlight")
+
+# where a name came from; a better source replaces a worse one
+FROM_IDENTITY = 1
+FROM_ROOM_METADATA = 2
+FROM_PARTICIPANT_METADATA = 3
+
+
+@functools.lru_cache(maxsize=256)
+def player_name_from_metadata(metadata: Optional[str]) -> Optional[str]:
+    """
+    `playerName` from a metadata JSON string, or None. Results are cached since
+    the same metadata string is seen on every event for that participant.
+    """
+    if not metadata:
+        return None
+    try:
+        data = json.loads(metadata)
+    except ValueError:
+        logger.debug("Ignoring non-JSON metadata: %r", metadata)
+        return None
+    if not isinstance(data, dict):
+        return None
+    name = data.get("playerName")
+    if isinstance(name, str) and name.strip():
+        return name.strip()
+    return None
+
+
+class PlayerNameResolver:
+    """
+    Tracks the best-known player name for one room.
+
+    Listeners registered with `subscribe()` are called with the name as soon as
+    it is known and again whenever a better source replaces it.
+    """
+
+    def __init__(self, room: Any):
+        self.room = room
+        self.name: Optional[str] = None
+        self.source = 0
+        self._listeners: list[Callable[[str], None]] = []
+        self._known: Optional[asyncio.Event] = None
+        self._handlers: list[tuple[str, Callable[..., None]]] = []
+
+    def start(self) -> None:
+        """
+        Subscribe to room events and read whatever is already there.
+        """
+        self._known = asyncio.Event()
+        if self.name is not None:
+            self._known.set()
+        self._listen("participant_connected", self._on_participant)
+        self._listen("participant_metadata_changed", lambda p, _old, _new: self._on_participant(p))
+        self._listen("room_metadata_changed", lambda _old, new: self._on_room_metadata(new))
+        self._on_room_metadata(self.room.metadata)
+        for participant in list(self.room.remote_participants.values()):
+            self._on_participant(participant)
+
+    def stop(self) -> None:
+        for event, handler in self._handlers:
+            self.room.off(event, handler)
+        self._handlers.clear()
+
+    def subscribe(self, listener: Callable[[str], None]) -> None:
+        self._listeners.append(listener)
+        if self.name is not None:
+            listener(self.name)
+
+    async def wait(self, timeout: float) -> Optional[str]:
+        """
+        The name, waiting at most `timeout` seconds for one to show up.
+        """
+        if self.name is None and self._known is not None:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._known.wait(), timeout)
+        return self.name
+
+    def _listen(self, event: str, handler: Callable[..., None]) -> None:
+        self.room.on(event, handler)
+        self._handlers.append((event, handler))
+
+    def _on_participant(self, participant: Any) -> None:
+        if getattr(participant, "kind", None) == rtc.ParticipantKind.PARTICIPANT_KIND_AGENT:
+            return
+        name = player_name_from_metadata(participant.metadata)
+        if name is not None:
+            self._offer(name, FROM_PARTICIPANT_METADATA)
+        elif participant.identity and participant.identity != "agent":
+            self._offer(participant.identity, FROM_IDENTITY)
+
+    def _on_room_metadata(self, metadata: Optional[str]) -> None:
+        name = player_name_from_metadata(metadata)
+        if name is not None:
+            self._offer(name, FROM_ROOM_METADATA)
+
+    def _offer(self, name: str, source: int) -> None:
+        if source < self.source or name == self.name:
+            return
+        self.name, self.source = name, source
+        logger.info("Player name resolved: %s (source %d)", name, source)
+        if self._known is not None:
+            self._known.set()
+        for listener in self._listeners:
+            listener(name)
@@ -0,0 +1,155 @@
+"""
+Lazy construction of the LiveKit model plugins.
+
+Plugin packages are only imported when a provider is first built (normally in
+prewarm), so the worker's main process, `download-files` and unused providers
+don't pay their import cost. STT/LLM/TTS providers are picked by name from the
+environment (SPOTLIGHT_STT, SPOTLIGHT_LLM, SPOTLIGHT_TTS).
+"""
+
+import importlib
+import logging
+import os
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("improv_spotlight")
+
+PLUGIN_MODULES: dict[str, str] = {
+    "assemblyai": "livekit.plugins.assemblyai",
+    "deepgram": "livekit.plugins.deepgram",
+    "google": "livekit.plugins.google",
+    "murf": "livekit.plugins.murf",
+    "noise_cancellation": "livekit.plugins.noise_cancellation",
+    "silero": "livekit.plugins.silero",
+    "turn_detector": "livekit.plugins.turn_detector.multilingual",
+}
+
+
+def plugin(name: str) -> Any:
+    """
+    Import a plugin module by short name. LiveKit requires plugins to register
+    on the main thread, which holds for prewarm/entrypoint in job processes.
+    """
+    return importlib.import_module(PLUGIN_MODULES[name])
+
+
+def import_plugins(names: list[str]) -> None:
+    for name in names:
+        plugin(name)
+
+
+# ---------------------------------------------------------
+#  Provider registries
+# ---------------------------------------------------------
+class ProviderRegistry:
+    """
+    Name -> factory for one kind of model. Each factory imports its plugin.
+    """
+
+    def __init__(self, kind: str, env_var: str, default: str):
+        self.kind = kind
+        self.env_var = env_var
+        self.default = default
+        self._factories: dict[str, tuple[str, Callable[..., Any]]] = {}
+
+    def register(self, name: str, plugin_name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def deco(factory: Callable[..., Any]) -> Callable[..., Any]:
+            self._factories[name] = (plugin_name, factory)
+            return factory
+
+        return deco
+
+    def names(self) -> list[str]:
+        return sorted(self._factories)
+
+    def selected(self) -> str:
+        return os.getenv(self.env_var, self.default)
+
+    def plugin_for(self, name: Optional[str] = None) -> str:
+        return self._entry(name or self.selected())[0]
+
+    def create(self, name: Optional[str] = None, **kwargs: Any) -> Any:
+        name = name or self.selected()
+        plugin_name, factory = self._entry(name)
+        logger.info("Building %s provider %s", self.kind, name)
+        return factory(plugin(plugin_name), **kwargs)
+
+    def _entry(self, name: str) -> tuple[str, Callable[..., Any]]:
+        try:
+            return self._factories[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown {self.kind} provider {name!r} (set {self.env_var} to one of {self.names()})"
+            ) from None
+
+
+stt_providers = ProviderRegistry("stt", "SPOTLIGHT_STT", "deepgram")
+llm_providers = ProviderRegistry("llm", "SPOTLIGHT_LLM", "google")
+tts_providers = ProviderRegistry("tts", "SPOTLIGHT_TTS", "murf")
+
+
+@stt_providers.register("deepgram", "deepgram")
+def _deepgram_stt(mod: Any) -> Any:
+    return mod.STT(model="nova-3")
+
+
+@stt_providers.register("assemblyai", "assemblyai")
+def _assemblyai_stt(mod: Any) -> Any:
+    return mod.STT()
+
+
+@llm_providers.register("google", "google")
+def _google_llm(mod: Any) -> Any:
+    return mod.LLM(model="gemini-2.5-flash")
+
+
+@tts_providers.register("murf", "murf")
+def _murf_tts(mod: Any, voice: str, style: str) -> Any:
+    return mod.TTS(voice=voice, style=style)
+
+
+# ---------------------------------------------------------
+#  Local models and audio options
+# ---------------------------------------------------------
+def load_silero_vad() -> Any:
+    return plugin("silero").VAD.load()
+
+
+def sidecar_silero_vad(socket_path: str) -> Any:
+    plugin("silero")
+    from inference_sidecar import (
+        SidecarVAD,  # subclasses silero.VAD, so only after the plugin import
+    )
+
+    return SidecarVAD(socket_path)
+
+
+def multilingual_turn_detector() -> Any:
+    return plugin("turn_detector").MultilingualModel()
+
+
+def noise_cancellation_bvc() -> Any:
+    return plugin("noise_cancellation").BVC()
+
+
+def plugins_for_worker() -> list[str]:
+    """
+    Plugins the main worker process must import up front: the turn detector
+    registers its inference runner at import time, and `download-files` only
+    fetches models for plugins that are already registered.
+    """
+    return ["silero", "turn_detector"]
+
+
+def plugins_for_session() -> list[str]:
+    """
+    Every plugin one session will use with the current configuration.
+    """
+    return [
+        stt_providers.plugin_for(),
+        llm_providers.plugin_for(),
+        tts_providers.plugin_for(),
+        "silero",
+        "turn_detector",
+        "noise_cancellation",
+    ]
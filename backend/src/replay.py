@@ -0,0 +1,451 @@
+"""
+Record one show and replay it offline against the current build.
+
+SessionRecorder captures a session's event stream, timed from the start of
+the show: STT transcripts (interim and final), committed user turns, every
+LLM request's text deltas and tool calls as they streamed (through
+RecordingLLM), TTS request timings, and the stage timings the TurnTracer
+measures. `save()` writes them as one compact JSONL trace, gzipped when the
+path ends in `.gz`. The worker records every show when SPOTLIGHT_RECORD_DIR
+is set.
+
+`replay_show()` runs a trace through a fresh AgentSession and host:
+transcripts and user turns are fed back at their recorded times, ReplayLLM
+streams the recorded responses with their original timing, and ReplayTTS
+answers each synthesis after its recorded first-byte delay. The host's own
+code (tools, prompts, reactions, stop phrases) runs for real, and the replay
+is recorded in turn, so `compare_traces()` can put the per-stage latencies
+of the two runs side by side.
+
+    uv run python benchmarks/replay_show.py show.trace.jsonl.gz
+
+Audio is not replayed: STT and endpointing timings are reproduced through
+the gaps between recorded transcripts and user turns.
+"""
+
+import asyncio
+import dataclasses
+import gzip
+import json
+import logging
+import statistics
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from livekit.agents import (
+    AgentSession,
+    APIConnectOptions,
+    UserInputTranscribedEvent,
+    llm,
+    metrics,
+    utils,
+)
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, NOT_GIVEN, NotGivenOr
+
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS
+from tracing import TurnTracer
+
+logger = logging.getLogger("improv_spotlight")
+
+TRACE_VERSION = 1
+
+# stages compared between a recording and its replay; "response" is user turn -> host speaking
+STAGES = ("response", "llm_first_token", "tts_first_byte", "tool", "stt_final", "end_of_turn")
+
+
+# ---------------------------------------------------------
+#  Trace file
+# ---------------------------------------------------------
+class Trace:
+    """
+    One show's events in time order. Every event has `t` (ms since the show
+    started) and `k`, its kind: stt, user, llm, tts or stage.
+    """
+
+    __slots__ = ("events", "session", "started")
+
+    def __init__(self, session: str = "", started: float = 0.0, events: Optional[list[dict[str, Any]]] = None):
+        self.session = session
+        self.started = started
+        self.events = events or []
+
+    def of_kind(self, kind: str) -> list[dict[str, Any]]:
+        return [e for e in self.events if e["k"] == kind]
+
+    def stage_latencies(self) -> dict[str, list[float]]:
+        """
+        stage (or `tool:<name>`) -> milliseconds of every occurrence.
+        """
+        stages: dict[str, list[float]] = {}
+        for e in self.of_kind("stage"):
+            stages.setdefault(e["stage"], []).append(e["ms"])
+            if "tool" in e:
+                stages.setdefault(f"tool:{e['tool']}", []).append(e["ms"])
+        return stages
+
+    def save(self, path: str) -> None:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8") as f:  # type: ignore[operator]
+            header = {"v": TRACE_VERSION, "session": self.session, "started": self.started}
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            for event in sorted(self.events, key=lambda e: e["t"]):
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> "Trace":
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:  # type: ignore[operator]
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get("v") != TRACE_VERSION:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} show trace")
+        header = lines[0]
+        return cls(header.get("session", ""), header.get("started", 0.0), lines[1:])
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+# ---------------------------------------------------------
+#  Recording
+# ---------------------------------------------------------
+class SessionRecorder:
+    """
+    Collects one session's events into a Trace. Attach it before the session
+    starts and pass the session's LLM through `wrap_llm()`.
+    """
+
+    def __init__(self, session_key: str = ""):
+        self.trace = Trace(session_key, time.time())
+        self._started = time.perf_counter()
+        self._tracer: Optional[TurnTracer] = None
+        self._turn_at: Optional[float] = None
+
+    def now(self) -> float:
+        return _ms(time.perf_counter() - self._started)
+
+    def add(self, kind: str, at: Optional[float] = None, **fields: Any) -> None:
+        self.trace.events.append({"t": self.now() if at is None else at, "k": kind, **fields})
+
+    def attach(self, session: AgentSession, tracer: Optional[TurnTracer] = None) -> None:
+        session.on("user_input_transcribed", self._on_transcript)
+        session.on("conversation_item_added", self._on_item)
+        session.on("agent_state_changed", self._on_agent_state)
+        session.on("metrics_collected", self._on_metrics)
+        if tracer is not None:
+            self._tracer = tracer
+            tracer.observers.append(self._record_stage)
+
+    def wrap_llm(self, inner: llm.LLM) -> "RecordingLLM":
+        return RecordingLLM(inner, self)
+
+    async def save(self, path: str) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.trace.save, path)
+        logger.info("Recorded %d events of show %s to %s", len(self.trace.events), self.trace.session, path)
+
+    def _on_transcript(self, ev: UserInputTranscribedEvent) -> None:
+        self.add("stt", text=ev.transcript, final=ev.is_final)
+
+    def _on_item(self, ev: Any) -> None:
+        item = ev.item
+        if getattr(item, "role", None) == "user":
+            self.add("user", text=item.text_content or "")
+            self._turn_at = time.perf_counter()
+
+    def _on_agent_state(self, ev: Any) -> None:
+        if ev.new_state == "speaking" and self._turn_at is not None:
+            self._record_stage("response", time.perf_counter() - self._turn_at)
+            self._turn_at = None
+
+    def _on_metrics(self, ev: Any) -> None:
+        m = ev.metrics
+        if isinstance(m, metrics.TTSMetrics) and not m.cancelled:
+            self.add(
+                "tts",
+                ttfb=_ms(m.ttfb),
+                dur=_ms(m.duration),
+                audio=_ms(m.audio_duration),
+                chars=m.characters_count,
+            )
+
+    def _record_stage(self, stage: str, seconds: float, tool: Optional[str] = None) -> None:
+        fields: dict[str, Any] = {"stage": stage, "ms": _ms(seconds)}
+        if self._tracer is not None:
+            fields["round"] = self._tracer.current_round()
+        if tool is not None:
+            fields["tool"] = tool
+        self.add("stage", **fields)
+
+
+class RecordingLLM(llm.LLM):
+    """
+    Passes requests to `inner` and records each streamed response: text
+    deltas and tool calls with their offsets from the start of the request.
+    """
+
+    def __init__(self, inner: llm.LLM, recorder: SessionRecorder):
+        super().__init__()
+        self.inner = inner
+        self.recorder = recorder
+
+    @property
+    def model(self) -> str:
+        return self.inner.model
+
+    @property
+    def provider(self) -> str:
+        return self.inner.provider
+
+    def chat(
+        self,
+        *,
+        chat_ctx: llm.ChatContext,
+        tools: Optional[list[Any]] = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        parallel_tool_calls: NotGivenOr[bool] = NOT_GIVEN,
+        tool_choice: NotGivenOr[Any] = NOT_GIVEN,
+        extra_kwargs: NotGivenOr[dict[str, Any]] = NOT_GIVEN,
+    ) -> llm.LLMStream:
+        inner = self.inner.chat(
+            chat_ctx=chat_ctx,
+            tools=tools,
+            conn_options=conn_options,
+            parallel_tool_calls=parallel_tool_calls,
+            tool_choice=tool_choice,
+            extra_kwargs=extra_kwargs,
+        )
+        # the inner stream does its own retries
+        return _RecordingStream(
+            self,
+            inner,
+            chat_ctx=chat_ctx,
+            tools=tools or [],
+            conn_options=dataclasses.replace(conn_options, max_retry=0),
+        )
+
+
+class _RecordingStream(llm.LLMStream):
+    def __init__(self, recording: RecordingLLM, inner: llm.LLMStream, **kwargs: Any):
+        super().__init__(recording, **kwargs)
+        self._inner = inner
+
+    async def _run(self) -> None:
+        recorder: SessionRecorder = self._llm.recorder  # type: ignore[attr-defined]
+        at = recorder.now()
+        started = time.perf_counter()
+        deltas: list[list[Any]] = []
+        calls: list[list[Any]] = []
+        usage: Optional[list[int]] = None
+        try:
+            async with self._inner as stream:
+                async for chunk in stream:
+                    offset = _ms(time.perf_counter() - started)
+                    if chunk.delta is not None:
+                        if chunk.delta.content:
+                            deltas.append([offset, chunk.delta.content])
+                        for call in chunk.delta.tool_calls or []:
+                            calls.append([offset, call.name, call.arguments])
+                    if chunk.usage is not None:
+                        usage = [
+                            offset,
+                            chunk.usage.prompt_tokens,
+                            chunk.usage.completion_tokens,
+                            chunk.usage.prompt_cached_tokens,
+                        ]
+                    self._event_ch.send_nowait(chunk)
+        finally:
+            # partial responses (interrupted or failed) are recorded too: the replay must ask for them
+            event: dict[str, Any] = {"d": deltas, "calls": calls, "end": _ms(time.perf_counter() - started)}
+            if usage is not None:
+                event["usage"] = usage
+            recorder.add("llm", at=at, **event)
+
+
+# ---------------------------------------------------------
+#  Replay stand-ins
+# ---------------------------------------------------------
+class ReplayLLM(llm.LLM):
+    """
+    Answers the n-th request with the n-th recorded response, streamed with
+    its recorded timing. Requests beyond the recording get an empty reply and
+    are counted in `missing`.
+    """
+
+    def __init__(self, responses: list[dict[str, Any]]):
+        super().__init__()
+        self.responses = responses
+        self.requests = 0
+        self.missing = 0
+
+    def chat(
+        self,
+        *,
+        chat_ctx: llm.ChatContext,
+        tools: Optional[list[Any]] = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        parallel_tool_calls: NotGivenOr[bool] = NOT_GIVEN,
+        tool_choice: NotGivenOr[Any] = NOT_GIVEN,
+        extra_kwargs: NotGivenOr[dict[str, Any]] = NOT_GIVEN,
+    ) -> llm.LLMStream:
+        response = self.responses[self.requests] if self.requests < len(self.responses) else None
+        self.requests += 1
+        if response is None:
+            self.missing += 1
+            logger.warning("Replay: LLM request %d was not in the recording", self.requests)
+        return _ReplayStream(self, response, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class _ReplayStream(llm.LLMStream):
+    def __init__(self, replay: ReplayLLM, response: Optional[dict[str, Any]], **kwargs: Any):
+        self.response = response
+        super().__init__(replay, **kwargs)
+
+    async def _run(self) -> None:
+        if self.response is None:
+            return
+        request_id = utils.shortuuid()
+        started = time.perf_counter()
+        steps = [(d[0], d[1], None) for d in self.response["d"]]
+        steps += [(c[0], None, c[1:]) for c in self.response["calls"]]
+
+        async def until(offset: float) -> None:
+            await asyncio.sleep(max(offset / 1000 - (time.perf_counter() - started), 0.0))
+
+        for offset, text, call in sorted(steps, key=lambda s: s[0]):
+            await until(offset)
+            if call is not None:
+                delta = llm.ChoiceDelta(
+                    role="assistant",
+                    tool_calls=[
+                        llm.FunctionToolCall(name=call[0], arguments=call[1], call_id=utils.shortuuid("call_"))
+                    ],
+                )
+            else:
+                delta = llm.ChoiceDelta(role="assistant", content=text)
+            self._event_ch.send_nowait(llm.ChatChunk(id=request_id, delta=delta))
+        if "usage" in self.response:
+            offset, prompt, completion, cached = self.response["usage"]
+            await until(offset)
+            self._event_ch.send_nowait(
+                llm.ChatChunk(
+                    id=request_id,
+                    usage=llm.CompletionUsage(
+                        completion_tokens=completion,
+                        prompt_tokens=prompt,
+                        prompt_cached_tokens=cached,
+                        total_tokens=prompt + completion,
+                    ),
+                )
+            )
+        await until(self.response["end"])
+
+
+class ReplayTTS(FakeTTS):
+    """
+    FakeTTS whose n-th synthesis starts after the n-th recorded first-byte
+    delay (the recorded median once those run out), speaking at the
+    recorded audio-per-character rate.
+    """
+
+    def __init__(self, timings: list[dict[str, Any]]):
+        first_bytes = [t["ttfb"] / 1000 for t in timings]
+        chars = sum(t["chars"] for t in timings)
+        audio = sum(t["audio"] for t in timings)
+        super().__init__(
+            latency=statistics.median(first_bytes) if first_bytes else 0.05,
+            ms_per_char=max(round(audio / chars), 1) if chars else 10,
+        )
+        self._first_bytes = deque(first_bytes)
+
+    def first_byte_delay(self) -> float:
+        return self._first_bytes.popleft() if self._first_bytes else self.latency
+
+
+# ---------------------------------------------------------
+#  Replay and comparison
+# ---------------------------------------------------------
+HostFactory = Callable[[SessionState, TurnTracer], Any]
+
+
+async def replay_show(recorded: Trace, host_factory: HostFactory) -> Trace:
+    """
+    Run `recorded` against the host built by `host_factory(state, tracer)`;
+    returns the replay's own trace.
+    """
+    state = SessionState(f"replay-{recorded.session}")
+    tracer = TurnTracer(state)
+    recorder = SessionRecorder(state.session_key)
+    replay_llm = ReplayLLM(recorded.of_kind("llm"))
+    session = AgentSession(llm=recorder.wrap_llm(replay_llm), tts=ReplayTTS(recorded.of_kind("tts")))
+    session.output.audio = CaptureAudioOutput()
+    tracer.attach(session)
+    recorder.attach(session, tracer)
+
+    turn: Optional[Any] = None
+    try:
+        await session.start(host_factory(state, tracer))
+        for event in recorded.events:
+            if event["k"] not in ("stt", "user"):
+                continue
+            # inputs keep their recorded time; a slower build just sees them sooner after its replies
+            await asyncio.sleep(max(event["t"] - recorder.now(), 0.0) / 1000)
+            if event["k"] == "stt":
+                session.emit(
+                    "user_input_transcribed",
+                    UserInputTranscribedEvent(transcript=event["text"], is_final=event["final"]),
+                )
+                continue
+            if turn is not None:
+                await turn
+            turn = session.run(user_input=event["text"])
+        if turn is not None:
+            await turn
+        while session.current_speech is not None:
+            await session.current_speech.wait_for_playout()
+            await asyncio.sleep(0)
+    finally:
+        await session.aclose()
+
+    if replay_llm.missing or replay_llm.requests < len(replay_llm.responses):
+        logger.warning(
+            "Replay made %d LLM requests, the recording %d: the conversation diverged",
+            replay_llm.requests, len(replay_llm.responses),
+        )
+    return recorder.trace
+
+
+def _percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))]
+
+
+def compare_traces(recorded: Trace, replayed: Trace) -> dict[str, dict[str, Optional[float]]]:
+    """
+    stage -> count, p50 and p95 (ms) of both runs; None where a run has no samples.
+    """
+    before, after = recorded.stage_latencies(), replayed.stage_latencies()
+    rows: dict[str, dict[str, Optional[float]]] = {}
+    for stage in sorted(set(before) | set(after), key=lambda s: (s.split(":")[0] not in STAGES, s)):
+        row: dict[str, Optional[float]] = {}
+        for label, values in (("recorded", before.get(stage, [])), ("replayed", after.get(stage, []))):
+            row[f"{label}_n"] = len(values)
+            row[f"{label}_p50"] = _percentile(values, 50) if values else None
+            row[f"{label}_p95"] = _percentile(values, 95) if values else None
+        rows[stage] = row
+    return rows
+
+
+def regressions(rows: dict[str, dict[str, Optional[float]]], tolerance: float = 0.2, min_ms: float = 20.0) -> list[str]:
+    """
+    Stages whose replayed p50 is more than `tolerance` and `min_ms` slower than recorded.
+    """
+    slower = []
+    for stage, row in rows.items():
+        before, after = row["recorded_p50"], row["replayed_p50"]
+        if before is None or after is None:
+            continue
+        if after - before > max(before * tolerance, min_ms):
+            slower.append(stage)
+    return slower
@@ -0,0 +1,182 @@
+import asyncio
+import contextlib
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+logger = logging.getLogger("improv_spotlight")
+
+COLUMNS = (
+    "session_key",
+    "player_name",
+    "round_index",
+    "scenario_id",
+    "scenario_title",
+    "player_text",
+    "host_reaction",
+    "reaction_tone",
+    "timestamp",
+)
+
+
+# ---------------------------------------------------------
+#  SQLite store (blocking; used from a single writer thread)
+# ---------------------------------------------------------
+class RoundLogStore:
+    """
+    Append-only table of completed rounds in a WAL-mode SQLite file.
+
+    Several job processes may append to the same file; WAL lets readers run
+    alongside the writer and busy_timeout serializes concurrent commits.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rounds ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " session_key TEXT, player_name TEXT, round_index INTEGER,"
+                " scenario_id TEXT, scenario_title TEXT, player_text TEXT,"
+                " host_reaction TEXT, reaction_tone TEXT, timestamp TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS rounds_player ON rounds (player_name, id)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def append_many(self, records: list[dict[str, Any]]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                f"INSERT INTO rounds ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                [tuple(r.get(c) for c in COLUMNS) for r in records],
+            )
+
+    def rounds_for_player(
+        self, player_name: str, limit: int = 20, before_id: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Newest-first page of a player's rounds. Pass the smallest `id` of the
+        previous page as `before_id` to get the next one.
+        """
+        conn = self._connect()
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM rounds WHERE player_name = ?"
+        params: list[Any] = [player_name]
+        if before_id is not None:
+            sql += " AND id < ?"
+            params.append(before_id)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        cur = conn.execute(sql, params)
+        names = [d[0] for d in cur.description]
+        return [dict(zip(names, row)) for row in cur.fetchall()]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ---------------------------------------------------------
+#  Async batching writer
+# ---------------------------------------------------------
+class RoundLogWriter:
+    """
+    Queues round records from the tool-call path and appends them in batches
+    from a background task, so `complete_improv` never waits on disk.
+
+    The queue is bounded: when it is full `put()` waits for the writer to catch
+    up instead of growing memory without limit.
+    """
+
+    def __init__(
+        self,
+        store: RoundLogStore,
+        max_pending: int = 1000,
+        batch_size: int = 64,
+        flush_interval: float = 0.5,
+    ):
+        self.store = store
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # sqlite connections are thread-bound; keep every store call on one thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="round_log")
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+
+    def start(self) -> None:
+        """
+        Start the drain task on the running loop (idempotent).
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._drain(), name="round_log_writer")
+
+    async def put(self, record: dict[str, Any]) -> None:
+        if self._queue is None:
+            self.start()
+        await self._queue.put(record)  # type: ignore[union-attr]
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def flush(self) -> None:
+        """
+        Wait until everything queued so far is on disk.
+        """
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def aclose(self) -> None:
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self._run(self.store.close)
+
+    async def rounds_for_player(
+        self, player_name: str, limit: int = 20, before_id: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        return await self._run(self.store.rounds_for_player, player_name, limit, before_id)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._run(self.store.append_many, batch)
+                self.written += len(batch)
+            except Exception as e:
+                logger.error("Dropping %d round records after write failure: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
@@ -0,0 +1,300 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Optional, Union
+
+from scenario_store import CompiledCatalog, compile_catalog
+
+logger = logging.getLogger("improv_spotlight")
+
+
+# ---------------------------------------------------------
+#  Immutable catalog snapshot
+# ---------------------------------------------------------
+class ScenarioCatalog:
+    """
+    Read-only view of the scenarios file, indexed by id, category and difficulty.
+
+    A snapshot is never mutated after construction; a reload builds a new one
+    and swaps it in, so sessions can hold on to it without locking.
+    Scenario dicts are shared between sessions and must be treated as read-only.
+    """
+
+    __slots__ = ("by_category", "by_difficulty", "by_id", "ids", "mtime", "version")
+
+    def __init__(self, scenarios: list[dict[str, Any]], mtime: float = 0.0, version: int = 0):
+        by_id: dict[str, dict[str, Any]] = {}
+        by_category: dict[str, list[str]] = {}
+        by_difficulty: dict[str, list[str]] = {}
+        for s in scenarios:
+            sid = s.get("id")
+            if not sid or sid in by_id:
+                logger.warning("Skipping scenario with missing or duplicate id: %r", sid)
+                continue
+            by_id[sid] = dict(s)
+            by_category.setdefault(s.get("category") or "", []).append(sid)
+            by_difficulty.setdefault(s.get("difficulty") or "", []).append(sid)
+
+        self.ids: tuple[str, ...] = tuple(by_id)
+        self.by_id: Mapping[str, dict[str, Any]] = MappingProxyType(by_id)
+        self.by_category: Mapping[str, tuple[str, ...]] = MappingProxyType(
+            {k: tuple(v) for k, v in by_category.items()}
+        )
+        self.by_difficulty: Mapping[str, tuple[str, ...]] = MappingProxyType(
+            {k: tuple(v) for k, v in by_difficulty.items()}
+        )
+        self.mtime = mtime
+        self.version = version
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def at(self, index: int) -> dict[str, Any]:
+        return self.by_id[self.ids[index]]
+
+    def get(self, scenario_id: str) -> Optional[dict[str, Any]]:
+        return self.by_id.get(scenario_id)
+
+    def ids_for(self, category: Optional[str] = None, difficulty: Optional[str] = None) -> tuple[str, ...]:
+        """
+        Ids matching the given category and/or difficulty.
+        """
+        if category is None and difficulty is None:
+            return self.ids
+        if difficulty is None:
+            return self.by_category.get(category, ())
+        if category is None:
+            return self.by_difficulty.get(difficulty, ())
+        wanted = set(self.by_difficulty.get(difficulty, ()))
+        return tuple(i for i in self.by_category.get(category, ()) if i in wanted)
+
+    def close(self) -> None:
+        pass
+
+
+# either kind of catalog answers len(), at(), get(), ids_for(), close() and version
+Catalog = Union[ScenarioCatalog, CompiledCatalog]
+
+
+def load_catalog(path: str, version: int = 0) -> Catalog:
+    """
+    Blocking read of the scenarios JSON file, or open of a compiled `.db`
+    catalog (see scenario_store). Returns an empty catalog on error.
+    """
+    try:
+        mtime = os.stat(path).st_mtime
+        if path.endswith(".db"):
+            return CompiledCatalog(path, mtime=mtime, version=version)
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        return ScenarioCatalog(payload.get("scenarios", []), mtime=mtime, version=version)
+    except FileNotFoundError:
+        logger.error(f"Scenarios file not found at {path}")
+    except Exception as e:
+        logger.exception("Failed to load scenarios: %s", e)
+    return ScenarioCatalog([], version=version)
+
+
+# ---------------------------------------------------------
+#  Process-wide holder with mtime-based hot reload
+# ---------------------------------------------------------
+class CatalogStore:
+    """
+    Holds the current catalog (JSON or compiled) for the process.
+
+    `load()` is meant for prewarm; `start_watching()` polls the file's mtime
+    from the event loop and reloads it off-loop only when it changed. With a
+    `source` JSON file, `path` is its compiled form and is rebuilt whenever
+    the JSON file is newer. The new catalog is swapped in on the caller's
+    thread and the old one closed, so draws never see a closed catalog.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 5.0, source: Optional[str] = None):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.source = source
+        self._catalog: Optional[Catalog] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def current(self) -> Catalog:
+        if self._catalog is None:
+            # no prewarm (tests, console mode): pay the load once here
+            self.load()
+        return self._catalog  # type: ignore[return-value]
+
+    def load(self) -> Catalog:
+        """
+        (Re)read the file. A reload that fails or comes back empty (e.g. the
+        file was read halfway through a save) keeps the previous catalog, and
+        the watcher tries again on its next poll.
+        """
+        return self._swap(self._read())
+
+    def _read(self) -> Optional[Catalog]:
+        """
+        Blocking: recompile if the source changed, then open the catalog.
+        None when a recompile failed and there is a catalog to keep.
+        """
+        version = self._catalog.version + 1 if self._catalog is not None else 0
+        if self._source_changed():
+            try:
+                source_mtime = os.stat(self.source).st_mtime  # type: ignore[arg-type]
+                compile_catalog(self.source, self.path)  # type: ignore[arg-type]
+                # stamped with the source's mtime: it is that version of the file
+                os.utime(self.path, (time.time(), source_mtime))
+            except Exception as e:
+                logger.warning("Could not recompile %s from %s: %s", self.path, self.source, e)
+                if self._catalog is not None:
+                    return None
+        return load_catalog(self.path, version=version)
+
+    def _swap(self, catalog: Optional[Catalog]) -> Catalog:
+        previous = self._catalog
+        if previous is not None and (catalog is None or (len(previous) and not len(catalog))):
+            logger.warning("Reload of %s gave no scenarios; keeping catalog v%d", self.path, previous.version)
+            if catalog is not None:
+                catalog.close()
+            return previous
+        assert catalog is not None
+        self._catalog = catalog
+        logger.info("Loaded %d scenarios (catalog v%d)", len(catalog), catalog.version)
+        if previous is not None:
+            # drops the old compiled file's connection and mmap
+            previous.close()
+        return catalog
+
+    def _source_changed(self) -> bool:
+        if self.source is None:
+            return False
+        try:
+            source_mtime = os.stat(self.source).st_mtime
+        except OSError:
+            return False
+        try:
+            return source_mtime > os.stat(self.path).st_mtime
+        except OSError:
+            return True
+
+    async def refresh(self) -> bool:
+        """
+        Reload the catalog if the file's mtime changed (or its source is
+        newer). Returns True on reload.
+        """
+        try:
+            mtime = (await asyncio.to_thread(os.stat, self.path)).st_mtime
+        except OSError:
+            mtime = None
+        previous = self._catalog
+        changed = await asyncio.to_thread(self._source_changed)
+        if not changed and (mtime is None or (previous is not None and mtime == previous.mtime)):
+            return False
+        return self._swap(await asyncio.to_thread(self._read)) is not previous
+
+    def start_watching(self) -> None:
+        """
+        Start the background mtime poller on the running loop (idempotent).
+        """
+        if self._watch_task is not None and not self._watch_task.done():
+            return
+        self._watch_task = asyncio.create_task(self._watch(), name="scenario_catalog_watch")
+
+    async def stop_watching(self) -> None:
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._watch_task
+        self._watch_task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Scenario catalog reload failed: %s", e)
+
+
+# ---------------------------------------------------------
+#  Per-session no-repeat deck
+# ---------------------------------------------------------
+class ScenarioDeck:
+    """
+    Lazily shuffled draw order over the catalog for one session.
+
+    `draw()` is one step of a Fisher-Yates shuffle over catalog positions,
+    with only the swapped positions stored, so a no-repeat draw is O(1) in
+    time and memory however large the catalog is. The order restarts when the
+    deck runs out (everything is allowed again, as before) or when the catalog
+    was reloaded; ids already drawn are still skipped after a reload.
+    """
+
+    __slots__ = ("_drawn_set", "_left", "_rng", "_store", "_swaps", "_version", "drawn")
+
+    def __init__(self, store: CatalogStore, rng: Optional[random.Random] = None):
+        self._store = store
+        self._rng = rng or random.Random()
+        self._swaps: dict[int, int] = {}
+        self._left = 0
+        self._version: Optional[int] = None
+        self.drawn: list[str] = []
+        self._drawn_set: set[str] = set()
+
+    def _rebuild(self, catalog: Catalog) -> None:
+        self._swaps.clear()
+        self._left = len(catalog)
+        self._version = catalog.version
+
+    def _next_position(self) -> int:
+        j = self._rng.randrange(self._left)
+        last = self._left - 1
+        position = self._swaps.get(j, j)
+        # the position at the end of the range takes the drawn one's place
+        tail = self._swaps.pop(last, last)
+        if j != last:
+            self._swaps[j] = tail
+        self._left = last
+        return position
+
+    def draw(self) -> Optional[dict[str, Any]]:
+        catalog = self._store.current
+        if self._version != catalog.version:
+            self._rebuild(catalog)
+        while True:
+            if not self._left:
+                # reset used list if we've exhausted scenarios
+                self.drawn.clear()
+                self._drawn_set.clear()
+                self._rebuild(catalog)
+            if not self._left:
+                return None
+            scenario = catalog.at(self._next_position())
+            sid = scenario["id"]
+            if sid not in self._drawn_set:
+                break
+        self.drawn.append(sid)
+        self._drawn_set.add(sid)
+        return scenario
+
+    def mark_drawn(self, ids: list[str]) -> None:
+        """
+        Treat `ids` as already drawn this session, e.g. after a resume.
+        """
+        for sid in ids:
+            if sid not in self._drawn_set:
+                self.drawn.append(sid)
+                self._drawn_set.add(sid)
+
+    def remaining(self) -> int:
+        """
+        Scenarios left before the deck restarts (after a reload, an upper
+        bound: already drawn ids are skipped as they come up).
+        """
+        return self._left
@@ -0,0 +1,161 @@
+"""
+Compiled scenario catalog for very large scenario sets.
+
+`compile_catalog()` turns the scenarios JSON into a read-only SQLite file: one
+row per scenario with its id, category and difficulty indexed and the rest
+kept as compact JSON. CompiledCatalog memory-maps that file, so every job
+process on the host shares the same page-cache pages, and a scenario is only
+decoded when a deck draws it.
+
+Build it with `python src/agent.py compile-scenarios`; the worker prefers the
+compiled file whenever it exists and rebuilds it when the JSON file changes.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger("improv_spotlight")
+
+SCHEMA = (
+    "CREATE TABLE scenarios ("
+    " row INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE,"
+    " category TEXT NOT NULL, difficulty TEXT NOT NULL, body TEXT NOT NULL)",
+    "CREATE INDEX scenarios_category ON scenarios (category, difficulty)",
+    "CREATE INDEX scenarios_difficulty ON scenarios (difficulty)",
+    "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+def compile_catalog(json_path: str, db_path: str) -> int:
+    """
+    Write the scenarios in `json_path` to a fresh compiled file at `db_path`.
+    Returns the number of scenarios written.
+    """
+    with open(json_path, encoding="utf-8") as f:
+        payload = json.load(f)
+
+    # every job process may recompile at once; each writes its own file
+    tmp = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(tmp)
+    seen = set()
+    rows = []
+    for s in payload.get("scenarios", []):
+        sid = s.get("id")
+        if not sid or sid in seen:
+            logger.warning("Skipping scenario with missing or duplicate id: %r", sid)
+            continue
+        seen.add(sid)
+        body = json.dumps(s, ensure_ascii=False, separators=(",", ":"))
+        rows.append((len(rows) + 1, sid, s.get("category") or "", s.get("difficulty") or "", body))
+    try:
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.executemany("INSERT INTO scenarios VALUES (?, ?, ?, ?, ?)", rows)
+            conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [("source", os.path.abspath(json_path)), ("compiled_at", str(time.time()))],
+            )
+        conn.execute("VACUUM")
+    except BaseException:
+        conn.close()
+        # don't leave this process's half-written file behind
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+    conn.close()
+    # a running worker keeps reading the old file until it reloads
+    os.replace(tmp, db_path)
+    logger.info("Compiled %d scenarios into %s", len(rows), db_path)
+    return len(rows)
+
+
+# ---------------------------------------------------------
+#  Memory-mapped reader
+# ---------------------------------------------------------
+class CompiledCatalog:
+    """
+    Same read interface as ScenarioCatalog, backed by a compiled file.
+
+    Only the scenario count is read up front. `at()` and `get()` decode one
+    row on demand and keep the last `cache_size` scenarios; like
+    ScenarioCatalog, returned dicts are shared and must be treated as read-only.
+    """
+
+    def __init__(self, path: str, mtime: float = 0.0, version: int = 0, cache_size: int = 256):
+        size = os.path.getsize(path)
+        # immutable: compiled files are replaced, never written in place, so no locking
+        self._conn = sqlite3.connect(
+            f"file:{os.path.abspath(path)}?mode=ro&immutable=1", uri=True, check_same_thread=False
+        )
+        self._conn.execute(f"PRAGMA mmap_size={size}")
+        self._count: int = self._conn.execute("SELECT count(*) FROM scenarios").fetchone()[0]
+        self._cache: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        self._cache_size = cache_size
+        self._ids: Optional[tuple[str, ...]] = None
+        self.mtime = mtime
+        self.version = version
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def ids(self) -> tuple[str, ...]:
+        """
+        Every id in file order. Built on first use; decks don't need it.
+        """
+        if self._ids is None:
+            self._ids = tuple(r[0] for r in self._conn.execute("SELECT id FROM scenarios ORDER BY row"))
+        return self._ids
+
+    def at(self, index: int) -> dict[str, Any]:
+        scenario = self._load(index + 1)
+        if scenario is None:
+            raise IndexError(index)
+        return scenario
+
+    def get(self, scenario_id: str) -> Optional[dict[str, Any]]:
+        found = self._conn.execute("SELECT row FROM scenarios WHERE id = ?", (scenario_id,)).fetchone()
+        return self._load(found[0]) if found is not None else None
+
+    def ids_for(self, category: Optional[str] = None, difficulty: Optional[str] = None) -> tuple[str, ...]:
+        """
+        Ids matching the given category and/or difficulty.
+        """
+        if category is None and difficulty is None:
+            return self.ids
+        where, params = [], []
+        if category is not None:
+            where.append("category = ?")
+            params.append(category)
+        if difficulty is not None:
+            where.append("difficulty = ?")
+            params.append(difficulty)
+        sql = f"SELECT id FROM scenarios WHERE {' AND '.join(where)} ORDER BY row"
+        return tuple(r[0] for r in self._conn.execute(sql, params))
+
+    def _load(self, row: int) -> Optional[dict[str, Any]]:
+        scenario = self._cache.get(row)
+        if scenario is not None:
+            self._cache.move_to_end(row)
+            return scenario
+        found = self._conn.execute("SELECT body FROM scenarios WHERE row = ?", (row,)).fetchone()
+        if found is None:
+            return None
+        scenario = json.loads(found[0])
+        self._cache[row] = scenario
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return scenario
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,129 @@
+"""
+Next-round preparation that runs while the player is still performing.
+
+When a round starts the host picks the following scenario, writes its intro
+from a template and renders the intro audio sentence by sentence in the
+background. When that round begins the intro plays from the rendered frames,
+so scene selection, intro writing and intro TTS are off the critical path.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Callable, Optional
+
+from livekit import rtc
+from livekit.agents import tokenize, tts
+
+logger = logging.getLogger("improv_spotlight")
+
+
+class PreparedScene:
+    """
+    One upcoming round: its scenario, intro text and (once rendered) intro audio.
+    """
+
+    def __init__(self, round_number: int, scene: dict[str, Any], intro: str):
+        self.round_number = round_number
+        self.scene = scene
+        self.intro = intro
+        self.failed = False
+        self.first_audio_at: Optional[float] = None
+        self._frames: asyncio.Queue[Optional[rtc.AudioFrame]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def has_audio(self) -> bool:
+        """
+        Whether the intro can be played from prepared frames (rendered or still rendering).
+        """
+        return self._task is not None and not self.failed
+
+    def render(self, synth: tts.TTS, sentences: list[str]) -> None:
+        self._task = asyncio.create_task(self._render(synth, sentences), name="scene_prep_render")
+
+    async def _render(self, synth: tts.TTS, sentences: list[str]) -> None:
+        try:
+            for sentence in sentences:
+                async with synth.synthesize(sentence) as stream:
+                    async for ev in stream:
+                        if self.first_audio_at is None:
+                            self.first_audio_at = time.perf_counter()
+                        self._frames.put_nowait(ev.frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed = True
+            logger.warning("Could not pre-render the intro for round %d: %s", self.round_number, e)
+        finally:
+            self._frames.put_nowait(None)
+
+    async def audio(self) -> AsyncIterator[rtc.AudioFrame]:
+        """
+        The intro frames, waiting for any that are still being rendered.
+        Single use: frames are consumed as they are played.
+        """
+        while True:
+            frame = await self._frames.get()
+            if frame is None:
+                return
+            yield frame
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+class ScenePrep:
+    """
+    Holds at most one prepared round for a show.
+
+    `pick()` draws the next scenario and `intro_for(round_number, scene)`
+    writes the line that announces it.
+    """
+
+    def __init__(
+        self,
+        pick: Callable[[], Optional[dict[str, Any]]],
+        intro_for: Callable[[int, dict[str, Any]], str],
+        tokenizer: Optional[tokenize.SentenceTokenizer] = None,
+    ):
+        self.pick = pick
+        self.intro_for = intro_for
+        self.tokenizer = tokenizer or tokenize.basic.SentenceTokenizer(min_sentence_len=2)
+        self.pending: Optional[PreparedScene] = None
+
+    def prepare(self, round_number: int, synth: Optional[tts.TTS]) -> Optional[PreparedScene]:
+        """
+        Draw the scenario for `round_number` now and start rendering its intro.
+        """
+        self.cancel()
+        scene = self.pick()
+        if scene is None:
+            return None
+        prepared = PreparedScene(round_number, scene, self.intro_for(round_number, scene))
+        if synth is not None:
+            prepared.render(synth, self.tokenizer.tokenize(prepared.intro))
+        self.pending = prepared
+        logger.info("Prepared round %d: %s", round_number, scene.get("title"))
+        return prepared
+
+    def take(self, round_number: int) -> Optional[PreparedScene]:
+        """
+        The prepared scene for `round_number`. A scene prepared for a different
+        round is still used, but its intro is rewritten and spoken live.
+        """
+        prepared, self.pending = self.pending, None
+        if prepared is None or prepared.round_number == round_number:
+            return prepared
+        prepared.cancel()
+        return PreparedScene(round_number, prepared.scene, self.intro_for(round_number, prepared.scene))
+
+    def cancel(self) -> None:
+        """
+        Drop the speculative round, e.g. when the show ends early.
+        """
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
@@ -0,0 +1,101 @@
+import logging
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Optional
+
+from aggregates import ShowAggregates
+from performance import PerformanceAnalyzer
+from transcript_buffer import TranscriptBuffer
+
+if TYPE_CHECKING:
+    from scenario_catalog import ScenarioDeck
+
+logger = logging.getLogger("improv_spotlight")
+
+
+# ---------------------------------------------------------
+#  Session state container
+# ---------------------------------------------------------
+class SessionState:
+    """
+    Holds state for a single improv session.
+    """
+
+    __slots__ = (
+        "aggregates",
+        "current_round",
+        "current_scenario",
+        "deck",
+        "improv_turns",
+        "max_rounds",
+        "performance",
+        "phase",
+        "player_name",
+        "rounds",
+        "session_key",
+        "transcript",
+    )
+
+    def __init__(self, session_key: Optional[str] = None):
+        self.session_key: Optional[str] = session_key
+        self.player_name: Optional[str] = None
+        self.current_round: int = 0
+        self.max_rounds: int = 4
+        self.rounds: list[dict[str, Any]] = []  # each: {scenario_id, title, prompt, player_text, host_reaction}
+        self.phase: str = "intro"  # intro | waiting_for_improv | reacting | finished
+        self.current_scenario: Optional[dict[str, Any]] = None
+        self.deck: Optional[ScenarioDeck] = None  # set by SpotlightHost
+        self.improv_turns: int = 0
+        self.transcript = TranscriptBuffer()  # current round's performance, from STT
+        self.aggregates = ShowAggregates()  # tone counts and highlights, kept up to date per round
+        self.performance = PerformanceAnalyzer()  # running features of the current round, from STT
+
+
+# ---------------------------------------------------------
+#  Session registry (one entry per running show)
+# ---------------------------------------------------------
+class SessionRegistry:
+    """
+    Process-wide map of session key (job id or room name) -> SessionState.
+
+    A single worker process can host many AgentSessions at once; each one
+    acquires its own state here and releases it when the session closes.
+    Everything runs on the job's event loop, so no locking is needed.
+    """
+
+    def __init__(self):
+        self._states: dict[str, SessionState] = {}
+
+    def acquire(self, key: str) -> SessionState:
+        """
+        Return the state for `key`, creating it on first use.
+        """
+        st = self._states.get(key)
+        if st is None:
+            st = SessionState(session_key=key)
+            self._states[key] = st
+            logger.info("Session state created for %s (%d active)", key, len(self._states))
+        return st
+
+    def get(self, key: str) -> Optional[SessionState]:
+        return self._states.get(key)
+
+    def release(self, key: str) -> Optional[SessionState]:
+        """
+        Drop the state for `key`. Safe to call more than once.
+        """
+        st = self._states.pop(key, None)
+        if st is not None:
+            logger.info("Session state released for %s (%d active)", key, len(self._states))
+        return st
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._states))
+
+
+registry = SessionRegistry()
@@ -0,0 +1,306 @@
+"""
+Local stand-ins for the cloud plugins, for offline benchmarks and tests.
+
+None of these talk to the network; latencies are simulated with asyncio.sleep
+so timing-sensitive code paths can be exercised deterministically.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Optional, Union
+
+from livekit import rtc
+from livekit.agents import (
+    AgentSession,
+    APIConnectOptions,
+    UserInputTranscribedEvent,
+    llm,
+    stt,
+    tts,
+    utils,
+)
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, NOT_GIVEN, NotGivenOr
+from livekit.agents.utils import AudioBuffer
+from livekit.agents.voice import io
+
+from context_window import estimate_tokens
+
+SAMPLE_RATE = 24000
+
+
+# ---------------------------------------------------------
+#  STT
+# ---------------------------------------------------------
+class FakeSTT(stt.STT):
+    """
+    Non-streaming STT that returns queued transcripts in order after `latency` seconds.
+    """
+
+    def __init__(self, transcripts: Optional[list[str]] = None, latency: float = 0.05):
+        super().__init__(capabilities=stt.STTCapabilities(streaming=False, interim_results=False))
+        self.transcripts = list(transcripts or [])
+        self.latency = latency
+
+    async def _recognize_impl(
+        self,
+        buffer: AudioBuffer,
+        *,
+        language: NotGivenOr[str] = NOT_GIVEN,
+        conn_options: APIConnectOptions,
+    ) -> stt.SpeechEvent:
+        await asyncio.sleep(self.latency)
+        text = self.transcripts.pop(0) if self.transcripts else ""
+        return stt.SpeechEvent(
+            type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+            alternatives=[stt.SpeechData(language="en", text=text)],
+        )
+
+
+# ---------------------------------------------------------
+#  TTS
+# ---------------------------------------------------------
+class FakeTTS(tts.TTS):
+    """
+    Non-streaming TTS: waits `latency` seconds, then returns `ms_per_char` of silence
+    per input character.
+    """
+
+    def __init__(self, latency: float = 0.05, ms_per_char: int = 10):
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=False),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+        )
+        self.latency = latency
+        self.ms_per_char = ms_per_char
+        self.calls: list[str] = []
+
+    def synthesize(
+        self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> tts.ChunkedStream:
+        self.calls.append(text)
+        return _FakeChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+    def first_byte_delay(self) -> float:
+        """
+        Delay before the audio of the next synthesis starts.
+        """
+        return self.latency
+
+
+class _FakeChunkedStream(tts.ChunkedStream):
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        await asyncio.sleep(self._tts.first_byte_delay())
+        output_emitter.initialize(
+            request_id=utils.shortuuid(),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+            mime_type="audio/pcm",
+        )
+        samples = SAMPLE_RATE * self._tts.ms_per_char // 1000 * max(len(self._input_text), 1)
+        output_emitter.push(b"\x00\x00" * samples)
+        output_emitter.flush()
+
+
+# ---------------------------------------------------------
+#  LLM
+# ---------------------------------------------------------
+class ToolCall:
+    """
+    A scripted tool call reply.
+    """
+
+    def __init__(self, name: str, arguments: Optional[dict[str, Any]] = None):
+        self.name = name
+        self.arguments = arguments or {}
+
+
+Reply = Union[str, ToolCall, None]
+
+
+class ScriptedLLM(llm.LLM):
+    """
+    LLM whose reply is chosen by `script(chat_ctx)`: a string is streamed as text,
+    a ToolCall is emitted as a function call, None ends the turn silently.
+
+    `ttft` is the delay before the first chunk, `token_delay` the delay between
+    whitespace-separated text tokens. Usage reports an estimated prompt size.
+    """
+
+    def __init__(
+        self,
+        script: Callable[[llm.ChatContext], Reply],
+        *,
+        ttft: float = 0.3,
+        token_delay: float = 0.01,
+    ):
+        super().__init__()
+        self.script = script
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.requests = 0
+
+    def chat(
+        self,
+        *,
+        chat_ctx: llm.ChatContext,
+        tools: Optional[list[Any]] = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        parallel_tool_calls: NotGivenOr[bool] = NOT_GIVEN,
+        tool_choice: NotGivenOr[Any] = NOT_GIVEN,
+        extra_kwargs: NotGivenOr[dict[str, Any]] = NOT_GIVEN,
+    ) -> llm.LLMStream:
+        self.requests += 1
+        return _ScriptedStream(self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class _ScriptedStream(llm.LLMStream):
+    async def _run(self) -> None:
+        scripted: ScriptedLLM = self._llm  # type: ignore[assignment]
+        reply = scripted.script(self._chat_ctx)
+        await asyncio.sleep(scripted.ttft)
+        request_id = utils.shortuuid()
+        await self._emit(scripted, reply, request_id)
+        prompt_tokens = estimate_tokens(self._chat_ctx)
+        self._event_ch.send_nowait(
+            llm.ChatChunk(
+                id=request_id,
+                usage=llm.CompletionUsage(
+                    completion_tokens=0, prompt_tokens=prompt_tokens, total_tokens=prompt_tokens
+                ),
+            )
+        )
+
+    async def _emit(self, scripted: ScriptedLLM, reply: Reply, request_id: str) -> None:
+        if isinstance(reply, ToolCall):
+            self._event_ch.send_nowait(
+                llm.ChatChunk(
+                    id=request_id,
+                    delta=llm.ChoiceDelta(
+                        role="assistant",
+                        tool_calls=[
+                            llm.FunctionToolCall(
+                                name=reply.name,
+                                arguments=json.dumps(reply.arguments),
+                                call_id=utils.shortuuid("call_"),
+                            )
+                        ],
+                    ),
+                )
+            )
+            return
+
+        if not reply:
+            return
+
+        for i, token in enumerate(reply.split(" ")):
+            if i:
+                await asyncio.sleep(scripted.token_delay)
+            self._event_ch.send_nowait(
+                llm.ChatChunk(
+                    id=request_id,
+                    delta=llm.ChoiceDelta(role="assistant", content=token if i == 0 else f" {token}"),
+                )
+            )
+
+
+def last_item(chat_ctx: llm.ChatContext) -> Optional[llm.ChatItem]:
+    return chat_ctx.items[-1] if chat_ctx.items else None
+
+
+def transcribe(session: AgentSession, text: str) -> None:
+    """
+    Emit `text` as a final STT transcript, as if the player had said it.
+    Text input via `session.run` doesn't produce these events.
+    """
+    session.emit("user_input_transcribed", UserInputTranscribedEvent(transcript=text, is_final=True))
+
+
+# ---------------------------------------------------------
+#  Audio output
+# ---------------------------------------------------------
+class CaptureAudioOutput(io.AudioOutput):
+    """
+    Audio sink that records when frames arrive and "plays" them instantly.
+    """
+
+    def __init__(self):
+        super().__init__(
+            label="CaptureAudioOutput",
+            capabilities=io.AudioOutputCapabilities(pause=False),
+            sample_rate=SAMPLE_RATE,
+        )
+        self.first_frame_at: Optional[float] = None
+        # perf_counter time of the first frame of each played segment
+        self.segment_starts: list[float] = []
+        self.frames = 0
+        self._segment_duration = 0.0
+        self._frame_event = asyncio.Event()
+
+    def reset(self) -> None:
+        self.first_frame_at = None
+        self.segment_starts.clear()
+        self._frame_event.clear()
+
+    async def wait_for_first_frame(self) -> float:
+        await self._frame_event.wait()
+        return self.first_frame_at  # type: ignore[return-value]
+
+    async def capture_frame(self, frame: rtc.AudioFrame) -> None:
+        await super().capture_frame(frame)
+        now = time.perf_counter()
+        if self.first_frame_at is None:
+            self.first_frame_at = now
+            self._frame_event.set()
+        if not self._segment_duration:
+            self.segment_starts.append(now)
+        self.frames += 1
+        self._segment_duration += frame.duration
+
+    def flush(self) -> None:
+        super().flush()
+        if not self._segment_duration:
+            return
+        duration, self._segment_duration = self._segment_duration, 0.0
+        self.on_playback_finished(playback_position=duration, interrupted=False)
+
+    def clear_buffer(self) -> None:
+        if self._segment_duration:
+            self.flush()
+
+
+# ---------------------------------------------------------
+#  Room
+# ---------------------------------------------------------
+class FakeParticipant:
+    def __init__(self, identity: str, metadata: str = "", kind: int = rtc.ParticipantKind.PARTICIPANT_KIND_STANDARD):
+        self.identity = identity
+        self.metadata = metadata
+        self.kind = kind
+
+
+class FakeRoom(rtc.EventEmitter):
+    """
+    Just enough of rtc.Room to emit participant and metadata events by hand.
+    """
+
+    def __init__(self, metadata: str = ""):
+        super().__init__()
+        self.metadata = metadata
+        self.remote_participants: dict[str, FakeParticipant] = {}
+
+    def join(self, identity: str, metadata: str = "") -> FakeParticipant:
+        participant = FakeParticipant(identity, metadata)
+        self.remote_participants[identity] = participant
+        self.emit("participant_connected", participant)
+        return participant
+
+    def set_participant_metadata(self, identity: str, metadata: str) -> None:
+        participant = self.remote_participants[identity]
+        old, participant.metadata = participant.metadata, metadata
+        self.emit("participant_metadata_changed", participant, old, metadata)
+
+    def set_metadata(self, metadata: str) -> None:
+        old, self.metadata = self.metadata, metadata
+        self.emit("room_metadata_changed", old, metadata)
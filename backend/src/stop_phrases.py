@@ -0,0 +1,143 @@
+"""
+Stop-phrase spotting on streaming transcripts.
+
+Interim STT results arrive while the player is still talking, well before the
+final transcript, the turn detector and the LLM. StopPhraseSpotter checks
+whether a transcript ends with a phrase like "end scene" and reports it once
+the match can be trusted: on a final, or on an interim whose tail still ends
+with the same phrase in the next interim. A single interim is not enough, as
+one that ends on "end scene" may be the middle of "the end scene of the
+movie".
+"""
+
+import re
+import time
+from typing import Callable, Optional
+
+_WORD = re.compile(r"[a-z']+")
+
+
+def words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between `a` and `b`, giving up (returning limit + 1)
+    once it must exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def close_words(candidate: list[str], phrase: list[str], limit: int) -> bool:
+    """
+    Whether `candidate` is `phrase` with at most `limit` character edits in
+    total. Words are compared one to one and must start with the same letter,
+    so a mis-heard ending ("end scenes") counts but a different word ("and
+    scene") doesn't.
+    """
+    budget = limit
+    for got, want in zip(candidate, phrase):
+        if got[0] != want[0]:
+            return False
+        budget -= edit_distance(got, want, budget)
+        if budget < 0:
+            return False
+    return True
+
+
+class StopPhraseSpotter:
+    """
+    Matches configured phrases against the last words of a transcript.
+
+    `phrases` maps phrase -> action name. A phrase matches when the transcript
+    ends with it, allowing `max_typos` character edits (see close_words).
+    After a match is acted on, the same action is ignored for `debounce`
+    seconds, so the interims and final of one utterance act once.
+    """
+
+    def __init__(
+        self,
+        phrases: dict[str, str],
+        max_typos: int = 1,
+        debounce: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.phrases: list[tuple[list[str], str]] = [(words(p), action) for p, action in phrases.items()]
+        self.max_typos = max_typos
+        self.debounce = debounce
+        self.clock = clock
+        self._last_fired: dict[str, float] = {}
+        # (action, words before the phrase) matched by the last interim
+        self._pending: Optional[tuple[str, int]] = None
+
+    def feed(self, transcript: str, is_final: bool = True) -> Optional[str]:
+        """
+        The action whose phrase ends `transcript`, once the match is stable:
+        on a final, or on an interim when the previous interim matched the
+        same phrase at the same word. None otherwise; debouncing is up to
+        `fire()`.
+        """
+        found = self._find(transcript)
+        key = (found[0], found[2]) if found is not None else None
+        if is_final:
+            self._pending = None
+            return key[0] if key is not None else None
+        stable = key is not None and key == self._pending
+        self._pending = key
+        return key[0] if stable else None
+
+    def fire(self, action: str) -> bool:
+        """
+        Record that `action` is being acted on; False if it already was within the debounce window.
+        """
+        if self.recently_fired(action):
+            return False
+        self._last_fired[action] = self.clock()
+        return True
+
+    def match(self, transcript: str) -> Optional[str]:
+        found = self._find(transcript)
+        return found[0] if found is not None else None
+
+    def _find(self, transcript: str) -> Optional[tuple[str, int, int]]:
+        """
+        (action, offset in `transcript` where the phrase starts, words before
+        it) for the closest phrase found at the end of `transcript`.
+        """
+        tail = [(m.start(), m.group()) for m in _WORD.finditer(transcript.lower())]
+        best: Optional[tuple[str, int, int]] = None
+        for phrase, action in self.phrases:
+            start = len(tail) - len(phrase)
+            if start < 0:
+                continue
+            candidate = [w for _, w in tail[start:]]
+            if candidate == phrase:
+                return action, tail[start][0], start
+            if best is None and close_words(candidate, phrase, self.max_typos):
+                best = (action, tail[start][0], start)
+        return best
+
+    def recently_fired(self, action: str, within: Optional[float] = None) -> bool:
+        last = self._last_fired.get(action)
+        window = self.debounce if within is None else within
+        return last is not None and self.clock() - last < window
+
+    def cut_before(self, transcript: str) -> str:
+        """
+        `transcript` up to the matched stop phrase, i.e. the words spoken just before it.
+        """
+        found = self._find(transcript)
+        if found is None:
+            return transcript.strip()
+        return transcript[:found[1]].rstrip(" ,")
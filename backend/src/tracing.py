@@ -0,0 +1,214 @@
+"""
+Per-turn latency tracing.
+
+A TurnTracer listens to one AgentSession's metrics events and to the host's
+tool calls, and records each stage of a round (final transcript, end-of-turn
+decision, LLM first token, tool call, TTS first byte) into process-wide
+Prometheus histograms and, optionally, a JSONL trace file.
+
+The histograms live in prometheus_client's default registry, which the
+LiveKit worker serves on /metrics when `prometheus_port` is set; with
+`prometheus_multiproc_dir` the job processes' samples are merged there too.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import prometheus_client
+from livekit.agents import AgentSession, metrics
+from livekit.agents.llm.tool_context import is_function_tool
+
+from session_state import SessionState
+
+logger = logging.getLogger("improv_spotlight")
+
+STAGE_SECONDS = prometheus_client.Histogram(
+    "spotlight_stage_seconds",
+    "Latency of one stage of a host turn",
+    ["stage"],
+    buckets=[0.01, 0.025, 0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1, 1.5, 2.5, 5],
+)
+
+TOOL_SECONDS = prometheus_client.Histogram(
+    "spotlight_tool_seconds",
+    "Wall time of one host tool call",
+    ["tool"],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1],
+)
+
+PROMPT_TOKENS = prometheus_client.Histogram(
+    "spotlight_prompt_tokens",
+    "Prompt tokens sent to the LLM per request",
+    buckets=[250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000],
+)
+
+
+# ---------------------------------------------------------
+#  Tool timing
+# ---------------------------------------------------------
+ToolRecorder = Callable[[Any, str, float], None]
+
+
+def timed_tools(base: type, record: ToolRecorder) -> type:
+    """
+    Subclass of `base` whose @function_tool methods call `record(agent, name, seconds)`
+    after every call. functools.wraps keeps the tool metadata, signature and docstring.
+    """
+
+    def wrap(name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        async def timed(self: Any, *args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await fn(self, *args, **kwargs)
+            finally:
+                record(self, name, time.perf_counter() - start)
+
+        return timed
+
+    attrs = {
+        name: wrap(name, fn)
+        for name, fn in inspect.getmembers(base, inspect.isfunction)
+        if is_function_tool(fn)
+    }
+    return type(f"Timed{base.__name__}", (base,), attrs)
+
+
+# ---------------------------------------------------------
+#  JSONL trace file
+# ---------------------------------------------------------
+class TraceFile:
+    """
+    Append-only JSONL file shared by every session in the process.
+
+    Lines go through the file's own buffer; `flush()` is called when a session
+    closes, so a crash loses at most the last few unflushed records.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # held open for the life of the process; close() releases it
+        self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+# ---------------------------------------------------------
+#  Per-session tracer
+# ---------------------------------------------------------
+class TurnTracer:
+    """
+    Records stage timings for one show, keyed by the round they happened in.
+    """
+
+    def __init__(self, state: SessionState, trace_file: Optional[TraceFile] = None):
+        self.state = state
+        self.trace_file = trace_file
+        # round -> stage -> durations in seconds
+        self.rounds: dict[int, dict[str, list[float]]] = {}
+        # round -> prompt tokens of each LLM request
+        self.prompt_tokens: dict[int, list[int]] = {}
+        # called with (stage, seconds, tool) for every observed timing
+        self.observers: list[Callable[[str, float, Optional[str]], None]] = []
+
+    def attach(self, session: AgentSession) -> None:
+        session.on("metrics_collected", self._on_metrics)
+        session.on("close", lambda _ev: self.log_summary())
+
+    def observe(self, stage: str, seconds: float, tool: Optional[str] = None) -> None:
+        if seconds < 0:
+            return
+        STAGE_SECONDS.labels(stage).observe(seconds)
+        if tool is not None:
+            TOOL_SECONDS.labels(tool).observe(seconds)
+        round_no = self.current_round()
+        self.rounds.setdefault(round_no, {}).setdefault(stage, []).append(seconds)
+        for observer in self.observers:
+            observer(stage, seconds, tool)
+        if self.trace_file is not None:
+            record = {
+                "ts": round(time.time(), 3),
+                "session": self.state.session_key,
+                "round": round_no,
+                "stage": stage,
+                "ms": round(seconds * 1000, 2),
+            }
+            if tool is not None:
+                record["tool"] = tool
+            self.trace_file.write(record)
+
+    def observe_prompt_tokens(self, tokens: int, cached: int = 0) -> None:
+        PROMPT_TOKENS.observe(tokens)
+        round_no = self.current_round()
+        self.prompt_tokens.setdefault(round_no, []).append(tokens)
+        logger.info("LLM request in round %d: %d prompt tokens (%d cached)", round_no, tokens, cached)
+        if self.trace_file is not None:
+            self.trace_file.write({
+                "ts": round(time.time(), 3),
+                "session": self.state.session_key,
+                "round": round_no,
+                "stage": "prompt_tokens",
+                "tokens": tokens,
+                "cached": cached,
+            })
+
+    def current_round(self) -> int:
+        """
+        Round a timing belongs to: 0 for the intro, the scene being performed
+        while waiting for the improv, and the round just completed afterwards.
+        """
+        if self.state.phase == "waiting_for_improv":
+            return self.state.current_round + 1
+        return self.state.current_round
+
+    def observe_tool(self, name: str, seconds: float) -> None:
+        self.observe("tool", seconds, tool=name)
+
+    def _on_metrics(self, ev: Any) -> None:
+        m = ev.metrics
+        if isinstance(m, metrics.EOUMetrics):
+            self.observe("stt_final", m.transcription_delay)
+            self.observe("end_of_turn", m.end_of_utterance_delay)
+        elif isinstance(m, metrics.LLMMetrics) and not m.cancelled:
+            self.observe("llm_first_token", m.ttft)
+            if m.prompt_tokens:
+                self.observe_prompt_tokens(m.prompt_tokens, m.prompt_cached_tokens)
+        elif isinstance(m, metrics.TTSMetrics) and not m.cancelled:
+            self.observe("tts_first_byte", m.ttfb)
+
+    def log_summary(self) -> None:
+        for round_no, stages in sorted(self.rounds.items()):
+            timings = [f"{stage}={sum(values) * 1000:.0f}ms" for stage, values in stages.items()]
+            if self.prompt_tokens.get(round_no):
+                timings.append(f"max_prompt_tokens={max(self.prompt_tokens[round_no])}")
+            logger.info("Round %d timings: %s", round_no, ", ".join(timings))
+        if self.trace_file is not None:
+            self.trace_file.flush()
+
+
+def record_host_tool(host: Any, name: str, seconds: float) -> None:
+    """
+    ToolRecorder for agents that carry an optional `tracer` attribute.
+    """
+    tracer = getattr(host, "tracer", None)
+    if tracer is not None:
+        tracer.observe_tool(name, seconds)
@@ -0,0 +1,56 @@
+import logging
+import re
+
+logger = logging.getLogger("improv_spotlight")
+
+# "End scene" (and punctuation around it) closing a performance
+_END_PHRASE = re.compile(r"[\s,]*\bend(?:\s+the)?\s+scene\b[\s,.!?]*$", re.IGNORECASE)
+
+
+# ---------------------------------------------------------
+#  Per-round transcript of the player's performance
+# ---------------------------------------------------------
+class TranscriptBuffer:
+    """
+    Append-only list of final STT segments for the round being performed.
+
+    Holds at most `max_chars` characters; once full, later segments are only
+    counted, so a very long scene can't grow memory without bound.
+    """
+
+    __slots__ = ("_chars", "_segments", "dropped", "max_chars")
+
+    def __init__(self, max_chars: int = 6000):
+        self.max_chars = max_chars
+        self._segments: list[str] = []
+        self._chars = 0
+        self.dropped = 0
+
+    def append(self, segment: str) -> None:
+        segment = segment.strip()
+        if not segment:
+            return
+        room = self.max_chars - self._chars
+        if room <= 0:
+            self.dropped += len(segment)
+            return
+        if len(segment) > room:
+            self.dropped += len(segment) - room
+            segment = segment[:room]
+        self._segments.append(segment)
+        self._chars += len(segment)
+
+    def text(self) -> str:
+        """
+        The performance so far, without a trailing "End scene".
+        """
+        text = _END_PHRASE.sub("", " ".join(self._segments)).strip()
+        return text + " ..." if self.dropped else text
+
+    def clear(self) -> None:
+        self._segments.clear()
+        self._chars = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._chars
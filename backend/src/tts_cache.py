@@ -0,0 +1,292 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import unicodedata
+import wave
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Callable, NamedTuple, Optional
+
+from livekit.agents import APIConnectOptions, tokenize, tts, utils
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
+
+logger = logging.getLogger("improv_spotlight")
+
+
+# ---------------------------------------------------------
+#  Keys
+# ---------------------------------------------------------
+def normalize_text(text: str) -> str:
+    """
+    Canonical form used for cache keys: NFC, collapsed whitespace, stripped.
+    Case and punctuation are kept since both change the rendered prosody.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(voice: str, style: str, pacing: str, text: str) -> str:
+    raw = "\x1f".join((voice, style or "", pacing or "", normalize_text(text)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CachedAudio(NamedTuple):
+    pcm: bytes  # 16-bit little-endian PCM
+    sample_rate: int
+    num_channels: int
+
+
+# ---------------------------------------------------------
+#  Storage: bounded in-memory LRU over a content-addressed directory
+# ---------------------------------------------------------
+class AudioLRU:
+    """
+    In-memory LRU bounded by total PCM bytes.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict[str, CachedAudio] = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedAudio]:
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+        return item
+
+    def put(self, key: str, item: CachedAudio) -> None:
+        if len(item.pcm) > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.size -= len(old.pcm)
+        self._items[key] = item
+        self.size += len(item.pcm)
+        while self.size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= len(evicted.pcm)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class DiskAudioStore:
+    """
+    One WAV file per key under `root/<key[:2]>/<key>.wav`. Methods are blocking;
+    callers run them in a thread.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.wav")
+
+    def read(self, key: str) -> Optional[CachedAudio]:
+        try:
+            with wave.open(self._path(key), "rb") as w:
+                return CachedAudio(w.readframes(w.getnframes()), w.getframerate(), w.getnchannels())
+        except FileNotFoundError:
+            return None
+        except (wave.Error, EOFError) as e:
+            logger.warning("Dropping unreadable TTS cache entry %s: %s", key, e)
+            return None
+
+    def write(self, key: str, item: CachedAudio) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with wave.open(tmp, "wb") as w:
+            w.setnchannels(item.num_channels)
+            w.setsampwidth(2)
+            w.setframerate(item.sample_rate)
+            w.writeframes(item.pcm)
+        os.replace(tmp, path)  # atomic, so concurrent job processes never see half a file
+
+
+# ---------------------------------------------------------
+#  Counters
+# ---------------------------------------------------------
+class CacheStats:
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._ttfb_sum: dict[str, float] = {"hit": 0.0, "miss": 0.0}
+        self._ttfb_count: dict[str, int] = {"hit": 0, "miss": 0}
+
+    def record_ttfb(self, kind: str, seconds: float) -> None:
+        self._ttfb_sum[kind] += seconds
+        self._ttfb_count[kind] += 1
+
+    def snapshot(self) -> dict[str, float]:
+        def avg(kind: str) -> float:
+            n = self._ttfb_count[kind]
+            return self._ttfb_sum[kind] / n if n else 0.0
+
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "avg_hit_ttfb_ms": avg("hit") * 1000,
+            "avg_miss_ttfb_ms": avg("miss") * 1000,
+        }
+
+
+# ---------------------------------------------------------
+#  TTS wrapper
+# ---------------------------------------------------------
+class CachedTTS(tts.TTS):
+    """
+    Non-streaming TTS that serves repeated sentences from cache and falls back
+    to the wrapped TTS's `synthesize()` on a miss.
+
+    Wrap it in `tts.StreamAdapter` so the LLM output is split into sentences
+    before it reaches the cache; identical sentences then hit regardless of
+    where in a reply they appear.
+    """
+
+    def __init__(
+        self,
+        inner: tts.TTS,
+        *,
+        voice: str,
+        style: str = "",
+        pacing: str = "",
+        cache_dir: Optional[str] = None,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        persist: Optional[Callable[[str], bool]] = None,
+    ):
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=False),
+            sample_rate=inner.sample_rate,
+            num_channels=inner.num_channels,
+        )
+        self._inner = inner
+        self._voice = voice
+        self._style = style
+        self._pacing = pacing
+        self.memory = AudioLRU(max_memory_bytes)
+        self.disk = DiskAudioStore(cache_dir) if cache_dir else None
+        # decides which misses are written to disk (e.g. only known fixed lines)
+        self._persist = persist or (lambda _text: True)
+        self.stats = CacheStats()
+
+    @property
+    def model(self) -> str:
+        return self._inner.model
+
+    @property
+    def provider(self) -> str:
+        return self._inner.provider
+
+    def key_for(self, text: str) -> str:
+        return cache_key(self._voice, self._style, self._pacing, text)
+
+    def synthesize(
+        self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> "CachedChunkedStream":
+        return CachedChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+    def prewarm(self) -> None:
+        self._inner.prewarm()
+
+    async def lookup(self, key: str) -> Optional[CachedAudio]:
+        item = self.memory.get(key)
+        if item is not None:
+            self.stats.memory_hits += 1
+            return item
+        if self.disk is not None:
+            item = await asyncio.to_thread(self.disk.read, key)
+            if item is not None:
+                self.stats.disk_hits += 1
+                self.memory.put(key, item)
+                return item
+        self.stats.misses += 1
+        return None
+
+    async def store(self, key: str, text: str, item: CachedAudio) -> None:
+        self.memory.put(key, item)
+        if self.disk is not None and self._persist(text):
+            try:
+                await asyncio.to_thread(self.disk.write, key, item)
+            except OSError as e:
+                logger.warning("Could not persist TTS cache entry: %s", e)
+
+    async def warm(self, lines: Iterable[str], tokenizer: tokenize.SentenceTokenizer) -> int:
+        """
+        Pre-render every sentence of `lines` the same way the StreamAdapter will
+        split them. Returns the number of sentences that had to be synthesized.
+        """
+        rendered = 0
+        seen = set()
+        for line in lines:
+            for sentence in tokenizer.tokenize(line):
+                key = self.key_for(sentence)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if await self.lookup(key) is not None:
+                    continue
+                await self.synthesize(sentence).collect()
+                rendered += 1
+        return rendered
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class CachedChunkedStream(tts.ChunkedStream):
+    def __init__(self, *, tts: CachedTTS, input_text: str, conn_options: APIConnectOptions):
+        super().__init__(tts=tts, input_text=input_text, conn_options=conn_options)
+        self._tts: CachedTTS = tts
+
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        started = time.perf_counter()
+        key = self._tts.key_for(self._input_text)
+        item = await self._tts.lookup(key)
+
+        if item is not None:
+            output_emitter.initialize(
+                request_id=utils.shortuuid(),
+                sample_rate=item.sample_rate,
+                num_channels=item.num_channels,
+                mime_type="audio/pcm",
+            )
+            output_emitter.push(item.pcm)
+            output_emitter.flush()
+            self._tts.stats.record_ttfb("hit", time.perf_counter() - started)
+            return
+
+        chunks = []
+        initialized = False
+        async with self._tts._inner.synthesize(
+            self._input_text, conn_options=self._conn_options
+        ) as stream:
+            async for ev in stream:
+                frame = ev.frame
+                if not initialized:
+                    output_emitter.initialize(
+                        request_id=ev.request_id or utils.shortuuid(),
+                        sample_rate=frame.sample_rate,
+                        num_channels=frame.num_channels,
+                        mime_type="audio/pcm",
+                    )
+                    self._tts.stats.record_ttfb("miss", time.perf_counter() - started)
+                    initialized = True
+                data = bytes(frame.data)
+                chunks.append(data)
+                output_emitter.push(data)
+
+        if not initialized:
+            return
+        output_emitter.flush()
+        await self._tts.store(
+            key,
+            self._input_text,
+            CachedAudio(b"".join(chunks), frame.sample_rate, frame.num_channels),
+        )
@@ -0,0 +1,62 @@
+import logging
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("improv_spotlight")
+
+PrewarmStep = tuple[str, Callable[[], Any]]
+
+REPORT_KEY = "prewarm_report"
+
+
+# ---------------------------------------------------------
+#  Prewarm stage: build reusable assets once per job process
+# ---------------------------------------------------------
+def run_prewarm(userdata: dict[str, Any], steps: list[PrewarmStep]) -> dict[str, dict[str, Any]]:
+    """
+    Run each (name, factory) step in order and store its result in `userdata[name]`.
+
+    A failing step is logged and skipped so the process still comes up; the
+    entrypoint builds that asset itself later. The per-step timings are stored
+    under `userdata["prewarm_report"]` and returned.
+    """
+    report: dict[str, dict[str, Any]] = {}
+    total_start = time.perf_counter()
+    for name, factory in steps:
+        start = time.perf_counter()
+        try:
+            value = factory()
+        except Exception as e:
+            elapsed = (time.perf_counter() - start) * 1000
+            logger.warning("Prewarm step %s failed after %.1f ms: %s", name, elapsed, e)
+            report[name] = {"ok": False, "ms": elapsed, "error": str(e)}
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        if value is None:
+            logger.warning("Prewarm step %s returned nothing (%.1f ms)", name, elapsed)
+            report[name] = {"ok": False, "ms": elapsed, "error": "empty"}
+            continue
+        userdata[name] = value
+        report[name] = {"ok": True, "ms": elapsed}
+
+    total = (time.perf_counter() - total_start) * 1000
+    logger.info(
+        "Prewarm finished in %.1f ms: %s",
+        total,
+        ", ".join(f"{n}={r['ms']:.1f}ms{'' if r['ok'] else ' (failed)'}" for n, r in report.items()),
+    )
+    userdata[REPORT_KEY] = report
+    return report
+
+
+def take_asset(userdata: dict[str, Any], name: str, factory: Callable[[], Any]) -> Optional[Any]:
+    """
+    Return the prewarmed asset `name`, building it on the spot if prewarm didn't.
+    """
+    value = userdata.get(name)
+    if value is None:
+        logger.warning("%s was not prewarmed; building it in the entrypoint", name)
+        value = factory()
+        if value is not None:
+            userdata[name] = value
+    return value
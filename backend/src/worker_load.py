@@ -0,0 +1,221 @@
+"""
+Load reporting and job admission for the worker.
+
+LiveKit asks the worker for its load every half second: above
+`load_threshold` the worker is marked full, and below it the warm pool of
+idle job processes is sized from the remaining headroom. The default load
+is host CPU only. WorkerLoad reports the worse of two signals:
+
+  - CPU of the worker's own process tree (every job and inference process),
+    against the CPUs this container may use;
+  - event-loop lag inside the job processes. Each one runs a LoopLagProbe and
+    drops its recent worst lag into a shared directory. A late loop is what
+    makes audio stutter, whatever the CPU figure says.
+
+`admit()` backs the worker's request_fnc: it refuses a job when the load,
+plus the jobs accepted since the last sample, plus one more job would cross
+the threshold. It covers bursts that arrive between two status updates.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import psutil
+from livekit.agents.utils.hw import get_cpu_monitor
+
+logger = logging.getLogger("improv_spotlight")
+
+
+# ---------------------------------------------------------
+#  Job side: event-loop lag
+# ---------------------------------------------------------
+class LoopLagProbe:
+    """
+    Measures how late the job's event loop wakes up from a short sleep and
+    writes the worst lag of the last one to two `window`s to `<report_dir>/<job_id>.lag`.
+    Keyed by job rather than pid: a pid is reused once its process exits, and
+    thread-executor jobs all share the worker's.
+    """
+
+    def __init__(self, report_dir: str, job_id: str, interval: float = 0.1, window: float = 2.0):
+        self.report_dir = report_dir
+        self.interval = interval
+        self.window = window
+        self.lag = 0.0
+        self.path = os.path.join(report_dir, f"{job_id}.lag")
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        os.makedirs(self.report_dir, exist_ok=True)
+        self._task = asyncio.create_task(self._run(), name="loop_lag_probe")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        with contextlib.suppress(OSError):
+            os.remove(self.path)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        previous, worst, window_start = 0.0, 0.0, loop.time()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.interval)
+            worst = max(worst, loop.time() - before - self.interval)
+            if loop.time() - window_start >= self.window:
+                # a stall is reported for at least one full window after it ends
+                self.lag = max(previous, worst)
+                previous, worst, window_start = worst, 0.0, loop.time()
+                self._write()
+
+    def _write(self) -> None:
+        # tiny file, replaced whole, so the worker never reads half a value
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                f.write(f"{self.lag:.4f}")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.debug("Could not report loop lag: %s", e)
+
+
+def read_loop_lags(report_dir: str, max_age: float = 5.0) -> dict[str, float]:
+    """
+    job id -> latest reported lag, for reports newer than `max_age` seconds.
+    """
+    lags: dict[str, float] = {}
+    now = time.time()
+    try:
+        names = os.listdir(report_dir)
+    except OSError:
+        return lags
+    for name in names:
+        if not name.endswith(".lag"):
+            continue
+        path = os.path.join(report_dir, name)
+        try:
+            if now - os.stat(path).st_mtime > max_age:
+                continue
+            with open(path) as f:
+                lags[name[:-4]] = float(f.read())
+        except (OSError, ValueError):
+            continue
+    return lags
+
+
+# ---------------------------------------------------------
+#  Worker side: load and admission
+# ---------------------------------------------------------
+class ProcessTreeCPU:
+    """
+    CPU used by this process and all of its children, as a share of the CPUs
+    the container may use.
+    """
+
+    def __init__(self):
+        self.root = psutil.Process()
+        self.capacity = get_cpu_monitor().cpu_count()
+        self.per_process: dict[int, float] = {}
+        self._procs: dict[int, psutil.Process] = {}
+
+    def __call__(self) -> float:
+        seen: dict[int, float] = {}
+        for proc in [self.root, *self.root.children(recursive=True)]:
+            # cpu_percent() measures since the previous call on the same object
+            tracked = self._procs.setdefault(proc.pid, proc)
+            try:
+                seen[proc.pid] = tracked.cpu_percent(None) / 100.0
+            except psutil.Error:
+                continue
+        for pid in set(self._procs) - set(seen):
+            del self._procs[pid]
+        self.per_process = seen
+        return min(sum(seen.values()) / self.capacity, 1.0)
+
+
+class WorkerLoad:
+    """
+    Combined load figure and admission decisions for one worker.
+
+    `lag_budget` is the loop lag (seconds) that counts as full load.
+    `job_cost` is the load one new show is assumed to add until there are
+    running jobs to measure it from.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        lag_budget: float = 0.1,
+        job_cost: float = 0.1,
+        report_dir: Optional[str] = None,
+        cpu: Optional[Callable[[], float]] = None,
+        lags: Optional[Callable[[], dict[str, float]]] = None,
+        settle: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.lag_budget = lag_budget
+        self.job_cost = job_cost
+        self.settle = settle
+        self.clock = clock
+        self._cpu = cpu or ProcessTreeCPU()
+        self._lags = lags or (lambda: read_loop_lags(report_dir) if report_dir else {})
+        self.load = 0.0
+        self.cpu_load = 0.0
+        self.worst_lag = 0.0
+        self.active_jobs = 0
+        self._admitted: list[float] = []
+        self._lock = threading.Lock()
+
+    def update(self, active_jobs: int) -> float:
+        """
+        Take a new sample. Called from LiveKit's load task (an executor thread).
+        """
+        cpu_load = self._cpu()
+        lags = self._lags()
+        worst_lag = max(lags.values(), default=0.0)
+        load = min(max(cpu_load, worst_lag / self.lag_budget), 1.0)
+        with self._lock:
+            if active_jobs > self.active_jobs:
+                # jobs admitted earlier are running now and counted in the sample
+                del self._admitted[: active_jobs - self.active_jobs]
+            self.cpu_load, self.worst_lag = cpu_load, worst_lag
+            self.load, self.active_jobs = load, active_jobs
+            if active_jobs and load > 0:
+                self.job_cost = load / active_jobs
+        return load
+
+    def projected(self) -> float:
+        """
+        Current load plus the jobs admitted since it was sampled.
+        """
+        with self._lock:
+            now = self.clock()
+            self._admitted = [t for t in self._admitted if now - t < self.settle]
+            return self.load + self.job_cost * len(self._admitted)
+
+    def admit(self) -> bool:
+        """
+        Whether one more show fits under the threshold; records it if so.
+        """
+        projected = self.projected()
+        # LiveKit counts a worker at the threshold as full
+        if projected + self.job_cost >= self.threshold:
+            logger.warning(
+                "Refusing job: load %.2f (+%d starting) + %.2f per show reaches %.2f",
+                self.load, len(self._admitted), self.job_cost, self.threshold,
+            )
+            return False
+        with self._lock:
+            self._admitted.append(self.clock())
+        return True
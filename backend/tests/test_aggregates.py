@@ -0,0 +1,135 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agent import SpotlightHost
+from aggregates import Scoreboard, ShowAggregates, _merge_snapshot
+from session_state import SessionState
+
+
+def _record(player: str, scenario: str, tone: str, i: int = 1) -> dict:
+    return {
+        "player_name": player,
+        "scenario_id": scenario,
+        "reaction_tone": tone,
+        "round_index": i,
+        "player_text": f"{player} performs {scenario}",
+    }
+
+
+def test_show_aggregates_keep_first_highlights() -> None:
+    totals = ShowAggregates()
+    for i, tone in enumerate(["positive", "gentle_critique", "gentle_critique"], 1):
+        totals.add_round({**_record("ana", "s", tone, i), "player_text": "x" * 70})
+
+    assert totals.rounds == 3
+    assert totals.count("gentle_critique") == 2
+    assert len(totals.highlights) == 2
+    assert totals.highlights[0] == f"Round 1: \"{'x' * 60}...\""
+
+
+@pytest.mark.asyncio
+async def test_closing_summary_reads_running_totals() -> None:
+    state = SessionState()
+    state.max_rounds = 3
+    board = Scoreboard()
+    host = SpotlightHost(state, scoreboard=board)
+    await host.set_player(None, "Ana")
+    for _ in range(3):
+        await host.next_scene(None)
+        state.transcript.append("I sell ice to a penguin.")
+        result = await host.complete_improv(None)
+
+    assert state.aggregates.rounds == 3
+    assert result["closing_summary"].startswith("Final thoughts for Ana:")
+    assert "Round 1: \"I sell ice to a penguin.\"" in result["closing_summary"]
+
+    board.publish()
+    assert board.row("player", "Ana")[0] == 3
+    assert sum(n for _, n in board.top("scenario")) == 3
+
+
+def test_scoreboard_top_k_and_bounded_keys() -> None:
+    board = Scoreboard(max_keys=3)
+    for _ in range(5):
+        board.add(_record("ana", "cafe", "gentle_critique"), "food")
+    board.add(_record("ben", "museum", "positive"), "spooky")
+    board.add(_record("ben", "lighthouse", "gentle_critique"), "spooky")
+    # only published counts are visible to readers
+    assert board.top("scenario") == []
+
+    board.publish()
+    assert board.top("scenario", k=1) == [("cafe", 5)]
+    assert board.top("scenario", by="positive") == [("museum", 1)]
+    assert board.top("category", by="gentle_critique") == [("food", 5), ("spooky", 1)]
+
+    board.add(_record("cy", "harbor", "neutral"), "sea")
+    board.publish()
+    # the least recently updated scenario made room for the new one
+    assert board.evicted == 1
+    assert set(board.published["scenario"]) == {"museum", "lighthouse", "harbor"}
+
+
+@pytest.mark.asyncio
+async def test_scoreboard_snapshot_round_trip(tmp_path) -> None:
+    path = str(tmp_path / "scoreboard.json")
+    board = Scoreboard(path=path)
+    board.add(_record("ana", "cafe", "positive"), "food")
+    board.add(_record("ana", "cafe", "neutral"), "food")
+    await board.save()
+
+    restored = Scoreboard(path=path)
+    restored.load()
+    assert restored.row("scenario", "cafe") == (2, 1, 1, 0)
+    restored.add(_record("ana", "cafe", "positive"), "food")
+    restored.publish()
+    assert restored.row("player", "ana") == (3, 2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_round_added_during_save_stays_dirty(tmp_path) -> None:
+    board = Scoreboard(path=str(tmp_path / "scoreboard.json"))
+    board.add(_record("ana", "cafe", "positive"), "food")
+    saving = asyncio.ensure_future(board.save())
+    await asyncio.sleep(0)  # the write is under way off the loop
+    board.add(_record("ben", "cafe", "neutral"), "food")
+    await saving
+
+    assert board._dirty
+    await board.save()
+    assert not board._dirty
+    restored = Scoreboard(path=board.path)
+    restored.load()
+    assert restored.row("scenario", "cafe") == (2, 1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_processes_sharing_a_snapshot_keep_each_others_counts(tmp_path) -> None:
+    path = str(tmp_path / "scoreboard.json")
+    first, second = Scoreboard(path=path), Scoreboard(path=path)
+    first.load()
+    second.load()
+    first.add(_record("ana", "cafe", "positive"), "food")
+    second.add(_record("ben", "cafe", "neutral"), "food")
+    second.add(_record("ben", "museum", "neutral"), "spooky")
+    await second.save()
+    await first.save()
+    # saving again adds nothing twice
+    await second.save()
+
+    assert first.row("scenario", "cafe") == (2, 1, 1, 0)
+    restored = Scoreboard(path=path)
+    restored.load()
+    assert restored.row("scenario", "cafe") == (2, 1, 1, 0)
+    assert restored.row("player", "ben") == (2, 0, 2, 0)
+
+
+def test_concurrent_merges_lose_nothing(tmp_path) -> None:
+    path = str(tmp_path / "scoreboard.json")
+    delta = {"scenario": {"cafe": (1, 1, 0, 0)}, "category": {}, "player": {}}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: _merge_snapshot(path, delta, 100), range(64)))
+    with open(path) as f:
+        assert json.load(f)["scenario"]["cafe"] == [64, 64, 0, 0]
@@ -0,0 +1,194 @@
+import asyncio
+
+import pytest
+from livekit.agents import AgentSession
+
+import agent
+from agent import SpotlightHost, catalog_store, resume_state
+from checkpoint import (
+    CHECKPOINT_VERSION,
+    Checkpointer,
+    CheckpointStore,
+    checkpoint_key,
+    encode,
+    restore,
+    snapshot,
+)
+from scenario_catalog import ScenarioDeck
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM
+
+
+def _mid_show() -> SessionState:
+    state = SessionState("job-1")
+    state.deck = ScenarioDeck(catalog_store)
+    state.player_name = "Ana"
+    state.current_round = 1
+    state.rounds = [{
+        "round_index": 1,
+        "scenario_id": "s-1",
+        "scenario_title": "Lost luggage",
+        "player_text": "Where is my suitcase?",
+        "host_reaction": "Nice.",
+        "reaction_tone": "positive",
+    }]
+    state.current_scenario = state.deck.draw()
+    state.phase = "waiting_for_improv"
+    return state
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trips_through_store(tmp_path) -> None:
+    writer = Checkpointer(CheckpointStore(str(tmp_path / "checkpoints.db")))
+    state = _mid_show()
+    writer.save("room-a", state)
+    await writer.flush()
+    await writer.aclose()
+
+    reader = Checkpointer(CheckpointStore(str(tmp_path / "checkpoints.db")))
+    data = await reader.load("room-a")
+    assert data == snapshot(state)
+
+    resumed = SessionState("job-2")
+    resumed.deck = ScenarioDeck(catalog_store)
+    restore(resumed, data)
+    assert (resumed.player_name, resumed.current_round, resumed.phase) == ("Ana", 1, "waiting_for_improv")
+    assert resumed.current_scenario == state.current_scenario
+    assert resumed.aggregates.count("positive") == 1
+    # the scene in play is not drawn again
+    assert resumed.deck.draw()["id"] != state.current_scenario["id"]
+    assert await reader.load("room-b") is None
+    await reader.aclose()
+
+
+@pytest.mark.asyncio
+async def test_queued_snapshots_collapse_to_newest(tmp_path) -> None:
+    writer = Checkpointer(CheckpointStore(str(tmp_path / "checkpoints.db")))
+    state = _mid_show()
+    for round_number in range(5):
+        state.current_round = round_number
+        writer.save("room-a", state)
+    await writer.flush()
+
+    assert writer.written <= 2
+    assert (await writer.load("room-a"))["current_round"] == 4
+
+    writer.clear("room-a")
+    assert await writer.load("room-a") is None
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stale_or_other_version_is_not_resumed(tmp_path) -> None:
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    body = encode(snapshot(_mid_show()))
+    store.save("old", body, saved_at=0.0)
+    store.save("other", body, saved_at=1e12)
+    store._connect().execute("UPDATE checkpoints SET version = ? WHERE room = 'other'", (CHECKPOINT_VERSION + 1,))
+    store._connect().commit()
+
+    checkpoints = Checkpointer(store, max_age=60)
+    assert await checkpoints.load("old") is None
+    assert await checkpoints.load("other") is None
+    await checkpoints.aclose()
+
+
+@pytest.mark.asyncio
+async def test_host_resumes_cut_off_scene_without_intro(tmp_path) -> None:
+    checkpoints = Checkpointer(CheckpointStore(str(tmp_path / "checkpoints.db")))
+    checkpoints.save("room-a", _mid_show())
+    state = SessionState("job-2")
+    state.deck = ScenarioDeck(catalog_store)
+    restore(state, await checkpoints.load("room-a"))
+    scene = state.current_scenario
+
+    scripted = ScriptedLLM(lambda _ctx: "Hello!", ttft=0)
+    fake_tts = FakeTTS(latency=0)
+    session = AgentSession(llm=scripted, tts=fake_tts)
+    session.output.audio = CaptureAudioOutput()
+    host = SpotlightHost(state, checkpoints=checkpoints, checkpoint_key="room-a")
+    await session.start(host)
+    try:
+        await asyncio.sleep(0)
+        while session.current_speech is not None:
+            await session.current_speech.wait_for_playout()
+            await asyncio.sleep(0)
+    finally:
+        await session.aclose()
+
+    spoken = " ".join(fake_tts.calls)
+    assert "Welcome back, Ana!" in spoken and f"Round 2: {scene['title']}" in spoken
+    assert scripted.requests == 0
+    assert state.phase == "waiting_for_improv" and state.current_scenario == scene
+    await checkpoints.aclose()
+
+
+def test_reconnect_rooms_share_a_key() -> None:
+    player = "0b7c6c2e-5f1d-4a8e-9d3b-2f6a1c9e8d70"
+    assert checkpoint_key(f"improv-{player}-1760000000000") == checkpoint_key(f"improv-{player}-1760000042000")
+    assert checkpoint_key(f"improv-{player}-1760000000000") != checkpoint_key("improv-other-1760000000000")
+    # rooms without a player id are their own key
+    assert checkpoint_key("improv-1760000000000") == "improv-1760000000000"
+
+
+@pytest.mark.asyncio
+async def test_reconnect_in_new_room_resumes_show(tmp_path, monkeypatch) -> None:
+    """
+    The player drops mid-scene and the frontend reconnects them to a new room;
+    the new job picks the show up from the first one's checkpoint.
+    """
+    checkpoints = Checkpointer(CheckpointStore(str(tmp_path / "checkpoints.db")))
+    monkeypatch.setattr(agent, "checkpoints", checkpoints)
+    first = _mid_show()
+    checkpoints.save(checkpoint_key("improv-p1-1000"), first)
+
+    state = SessionState("job-2")
+    assert not await resume_state(SessionState("job-3"), checkpoint_key("improv-p2-2000"))
+    assert await resume_state(state, checkpoint_key("improv-p1-2000"))
+    assert state.current_scenario == first.current_scenario
+
+    fake_tts = FakeTTS(latency=0)
+    session = AgentSession(llm=ScriptedLLM(lambda _ctx: "Hello!", ttft=0), tts=fake_tts)
+    session.output.audio = CaptureAudioOutput()
+    await session.start(SpotlightHost(state, checkpoints=checkpoints, checkpoint_key=checkpoint_key("improv-p1-2000")))
+    try:
+        await asyncio.sleep(0)
+        while session.current_speech is not None:
+            await session.current_speech.wait_for_playout()
+            await asyncio.sleep(0)
+    finally:
+        await session.aclose()
+
+    assert "Welcome back, Ana!" in " ".join(fake_tts.calls)
+    assert (await checkpoints.load("player:p1"))["current_round"] == 1
+    await checkpoints.aclose()
+
+
+@pytest.mark.asyncio
+async def test_show_stopped_after_last_round_resumes_to_closing(tmp_path) -> None:
+    checkpoints = Checkpointer(CheckpointStore(str(tmp_path / "checkpoints.db")))
+    state = _mid_show()
+    state.rounds = [{**state.rounds[0], "round_index": i + 1} for i in range(state.max_rounds)]
+    for record in state.rounds[1:]:
+        state.aggregates.add_round(record)
+    state.current_round = state.max_rounds
+    state.current_scenario = None
+    state.phase = "reacting"
+
+    scripted = ScriptedLLM(lambda _ctx: "Hello!", ttft=0)
+    fake_tts = FakeTTS(latency=0)
+    session = AgentSession(llm=scripted, tts=fake_tts)
+    session.output.audio = CaptureAudioOutput()
+    await session.start(SpotlightHost(state, checkpoints=checkpoints, checkpoint_key="room-a"))
+    try:
+        await asyncio.sleep(0)
+        while session.current_speech is not None:
+            await session.current_speech.wait_for_playout()
+            await asyncio.sleep(0)
+    finally:
+        await session.aclose()
+
+    assert "Final thoughts for Ana" in " ".join(fake_tts.calls)
+    assert state.phase == "finished" and scripted.requests == 0
+    assert await checkpoints.load("room-a") is None
+    await checkpoints.aclose()
@@ -0,0 +1,61 @@
+import pytest
+from livekit.agents import llm
+
+from agent import SpotlightHost
+from context_window import ContextWindow, summarize_rounds
+from session_state import SessionState
+
+ROUND = {
+    "round_index": 1,
+    "scenario_title": "Talking Soup",
+    "scenario_prompt": "You are a chef whose soup keeps talking back. " * 10,
+    "player_text": "I hand the soup a microphone and let it host the dinner party tonight.",
+    "host_reaction": "Delightful!",
+    "reaction_tone": "positive",
+}
+
+
+def _history() -> llm.ChatContext:
+    ctx = llm.ChatContext()
+    ctx.add_message(role="system", content="You are the host.")
+    ctx.add_message(role="user", content="I'm ready")
+    ctx.add_message(role="assistant", content=ROUND["scenario_prompt"])
+    ctx.add_message(role="user", content=ROUND["player_text"])
+    ctx.add_message(role="user", content="Next one please")
+    ctx.add_message(role="assistant", content="Round two!")
+    return ctx
+
+
+def test_view_keeps_prefix_summary_and_current_round() -> None:
+    ctx = _history()
+    window = ContextWindow()
+    assert window.view(ctx, "Ada", [ROUND]) is ctx  # no round started yet
+
+    ctx_before_round_two = llm.ChatContext(ctx.items[:5])
+    window.mark_round_start(ctx_before_round_two)
+    view = window.view(ctx, "Ada", [ROUND])
+
+    texts = [item.text_content for item in view.items]
+    assert texts[0] == "You are the host."
+    assert texts[1] == summarize_rounds("Ada", [ROUND])
+    assert texts[2:] == ["Next one please", "Round two!"]
+    assert "talking back" not in " ".join(texts)
+    # the summary message is reused until another round finishes
+    assert window.view(ctx, "Ada", [ROUND]).items[1] is view.items[1]
+
+
+@pytest.mark.asyncio
+async def test_tools_return_counts_and_fetch_details_on_demand() -> None:
+    state = SessionState()
+    state.player_name = "Ada"
+    state.rounds.append(dict(ROUND))
+    state.current_round = 1
+    host = SpotlightHost(state)
+
+    ended = await host.finish_show(None)
+    assert "rounds" not in ended
+    assert ended["rounds_completed"] == 1
+
+    details = await host.round_details(None, 1)
+    assert details["player_text"] == ROUND["player_text"]
+    assert "error" in await host.round_details(None, 2)
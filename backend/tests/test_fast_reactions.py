@@ -0,0 +1,84 @@
+import asyncio
+import re
+
+import pytest
+from livekit.agents import AgentSession, llm
+
+from agent import HANDOFF_LINE, SpotlightHost
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM, ToolCall, last_item
+
+
+def _script(chat_ctx: llm.ChatContext):
+    item = last_item(chat_ctx)
+    if item is None:
+        return None
+    if item.type == "message" and item.role == "user":
+        return ToolCall("complete_improv")
+    if item.type == "function_call_output" and item.name == "complete_improv":
+        if "reaction_spoken" in item.output:
+            return None
+        return "That was fun."
+    return None
+
+
+async def _settle(session: AgentSession) -> None:
+    await asyncio.sleep(0)
+    while session.current_speech is not None:
+        await session.current_speech.wait_for_playout()
+        await asyncio.sleep(0)
+
+
+async def _end_scene(fast: bool, max_rounds: int):
+    state = SessionState()
+    state.max_rounds = max_rounds
+    host = SpotlightHost(state, fast_reactions=fast)
+    scripted = ScriptedLLM(_script, ttft=0)
+    fake_tts = FakeTTS(latency=0)
+    session = AgentSession(llm=scripted, tts=fake_tts)
+    session.output.audio = CaptureAudioOutput()
+    await session.start(host)
+    try:
+        await host.next_scene(None)
+        # ignore the greeting turns from on_enter
+        await _settle(session)
+        scripted.requests = 0
+        fake_tts.calls.clear()
+        await session.run(user_input="End scene")
+    finally:
+        await session.aclose()
+    return state, scripted, fake_tts
+
+
+@pytest.mark.asyncio
+async def test_fast_mode_speaks_reaction_and_handoff_directly() -> None:
+    state, scripted, fake_tts = await _end_scene(fast=True, max_rounds=4)
+
+    reaction = state.rounds[0]["host_reaction"]
+    spoken = " ".join(fake_tts.calls)
+    # sentence by sentence: the next intro renders alongside and can interleave
+    for sentence in re.split(r"(?<=[.!?])\s+", reaction):
+        assert any(sentence in call for call in fake_tts.calls)
+    assert HANDOFF_LINE in spoken
+    # the prepared next scene follows the reaction without another LLM turn
+    assert scripted.requests == 1
+    assert state.phase == "waiting_for_improv"
+    assert state.current_scenario["id"] != state.rounds[0]["scenario_id"]
+
+
+@pytest.mark.asyncio
+async def test_fast_mode_skips_llm_turn_on_final_round() -> None:
+    state, scripted, fake_tts = await _end_scene(fast=True, max_rounds=1)
+
+    assert state.phase == "finished"
+    # only the turn that called complete_improv reached the LLM
+    assert scripted.requests == 1
+    assert any("Final thoughts" in c for c in fake_tts.calls)
+
+
+@pytest.mark.asyncio
+async def test_default_mode_hands_reaction_to_llm() -> None:
+    _, scripted, fake_tts = await _end_scene(fast=False, max_rounds=1)
+
+    assert scripted.requests == 2
+    assert fake_tts.calls == ["That was fun."]
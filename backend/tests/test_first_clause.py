@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from livekit.agents import tokenize
+
+from first_clause import FirstClauseTokenizer
+
+INTRO = "Welcome back to the stage, my fearless friend, for a scene that will test you. Ready? Go!"
+
+
+def _tokenizer(**options) -> FirstClauseTokenizer:
+    return FirstClauseTokenizer(tokenize.basic.SentenceTokenizer(min_sentence_len=2), **options)
+
+
+async def _collect(stream) -> list:
+    return [ev.token async for ev in stream]
+
+
+def test_tokenize_splits_off_the_first_clause() -> None:
+    t = _tokenizer()
+    assert t.tokenize(INTRO) == [
+        "Welcome back to the stage,",
+        "my fearless friend, for a scene that will test you.",
+        "Ready?",
+        "Go!",
+    ]
+    # too short to stand alone: the break is skipped
+    assert t.tokenize("Hi! Welcome to the show, friend.") == ["Hi! Welcome to the show,", "friend."]
+    assert t.tokenize("Great job.") == ["Great job."]
+
+
+@pytest.mark.asyncio
+async def test_stream_releases_clause_before_sentence_ends() -> None:
+    stream = _tokenizer().stream()
+    pushed = []
+    # words pushed by the time each token came out
+    arrivals = []
+
+    async def consume() -> None:
+        async for ev in stream:
+            arrivals.append((ev.token, len(pushed)))
+
+    consumer = asyncio.create_task(consume())
+    for word in INTRO.split(" "):
+        pushed.append(word)
+        stream.push_text(word + " ")
+        await asyncio.sleep(0)
+    stream.end_input()
+    await consumer
+
+    assert arrivals[0] == ("Welcome back to the stage,", 5)
+    assert [token for token, _ in arrivals[1:]] == [
+        "my fearless friend, for a scene that will test you.",
+        "Ready?",
+        "Go!",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_releases_complete_words_at_the_deadline() -> None:
+    stream = _tokenizer(max_wait=0.05).stream()
+    tokens = asyncio.create_task(_collect(stream))
+    stream.push_text("Picture a quiet library at midni")
+    await asyncio.sleep(0.1)
+    stream.push_text("ght where every book whispers.")
+    stream.end_input()
+
+    assert await tokens == ["Picture a quiet library at", "midnight where every book whispers."]
@@ -0,0 +1,123 @@
+import asyncio
+import dataclasses
+import inspect
+import logging
+
+import numpy as np
+import pytest
+from livekit import rtc
+from livekit.agents.vad import VADEventType
+from livekit.plugins import silero
+from livekit.plugins.silero import onnx_model
+
+from inference_sidecar import (
+    BatchedVAD,
+    InferenceSidecar,
+    RemoteVADModel,
+    SidecarVAD,
+    StreamState,
+)
+
+WINDOW = 512
+
+
+def _speechy(seed: int, windows: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(WINDOW * windows) / 16000
+    tone = 0.3 * np.sin(2 * np.pi * (180 + 40 * seed) * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    return (tone + 0.02 * rng.standard_normal(t.size)).astype(np.float32).reshape(windows, WINDOW)
+
+
+def _one_by_one(model: BatchedVAD, audio: np.ndarray) -> list:
+    stream = StreamState(16000)
+    return [float(model.run(16000, [(stream, w)])[0]) for w in audio]
+
+
+@pytest.fixture(scope="module")
+def session():
+    return onnx_model.new_inference_session(force_cpu=True)
+
+
+def test_batch_keeps_each_streams_state(session) -> None:
+    model = BatchedVAD(session)
+    audio = [_speechy(seed, 8) for seed in range(3)]
+    expected = [_one_by_one(model, a) for a in audio]
+
+    streams = [StreamState(16000) for _ in audio]
+    batched = [model.run(16000, list(zip(streams, [a[i] for a in audio]))) for i in range(8)]
+
+    np.testing.assert_allclose(np.array(batched).T, np.array(expected), atol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_sidecar_batches_windows_from_concurrent_streams(session, tmp_path) -> None:
+    sidecar = InferenceSidecar(str(tmp_path / "vad.sock"), max_wait=0.005, session=session)
+    await sidecar.start()
+    audio = [_speechy(seed, 10) for seed in range(6)]
+    expected = [_one_by_one(BatchedVAD(session), a) for a in audio]
+
+    def run_stream(a: np.ndarray) -> list:
+        model = RemoteVADModel(sidecar.socket_path, 16000, fallback=lambda: None)
+        assert model.window_size_samples == WINDOW
+        return [model(w) for w in a]
+
+    try:
+        results = await asyncio.gather(*(asyncio.to_thread(run_stream, a) for a in audio))
+    finally:
+        await sidecar.aclose()
+
+    np.testing.assert_allclose(results, expected, atol=1e-5)
+    assert sidecar.windows == 60
+    assert sidecar.batches < sidecar.windows
+
+
+def test_vad_runs_in_process_without_sidecar(tmp_path) -> None:
+    vad = SidecarVAD(str(tmp_path / "missing.sock"))
+    model = RemoteVADModel(vad.socket_path, 16000, fallback=vad._local_model)
+
+    p = model(_speechy(0, 1)[0])
+    assert 0.0 <= p <= 1.0
+    assert isinstance(model._local, onnx_model.OnnxModel)
+
+
+@pytest.mark.asyncio
+async def test_sidecar_vad_matches_silero_internals(tmp_path) -> None:
+    """
+    SidecarVAD relies on private parts of the pinned silero plugin; this
+    fails if an upgrade changes them.
+    """
+    fields = {f.name for f in dataclasses.fields(silero.vad._VADOptions)}
+    assert fields == {
+        "min_speech_duration", "min_silence_duration", "prefix_padding_duration",
+        "max_buffered_speech", "activation_threshold", "sample_rate",
+    }
+    assert list(inspect.signature(silero.vad.VADStream).parameters) == ["vad", "opts", "model"]
+
+    # a whole stream, with the local fallback standing in for the sidecar
+    vad = SidecarVAD(str(tmp_path / "missing.sock"))
+    stream = vad.stream()
+    pcm = (_speechy(1, 20).reshape(-1) * 32767).astype(np.int16)
+    stream.push_frame(rtc.AudioFrame(pcm.tobytes(), 16000, 1, pcm.size))
+    stream.end_input()
+    events = [ev async for ev in stream]
+    await stream.aclose()
+
+    assert sum(ev.type == VADEventType.INFERENCE_DONE for ev in events) == 20
+
+
+@pytest.mark.asyncio
+async def test_lost_sidecar_falls_back_with_warning(session, tmp_path, caplog) -> None:
+    sidecar = InferenceSidecar(str(tmp_path / "vad.sock"), session=session)
+    await sidecar.start()
+    audio = _speechy(2, 4)
+    model = RemoteVADModel(sidecar.socket_path, 16000, fallback=lambda: onnx_model.OnnxModel(onnx_session=session, sample_rate=16000))
+    try:
+        await asyncio.to_thread(model, audio[0])
+    finally:
+        await sidecar.aclose()
+
+    with caplog.at_level(logging.WARNING, logger="improv_spotlight"):
+        p = await asyncio.to_thread(model, audio[1])
+    assert 0.0 <= p <= 1.0
+    assert isinstance(model._local, onnx_model.OnnxModel)
+    assert "model state resets" in caplog.text
@@ -0,0 +1,32 @@
+import pytest
+
+from agent import SpotlightHost
+from load_harness import LoadConfig, percentile, run_load, timed_host_class
+
+FAST = LoadConfig(stt_latency=0, llm_ttft=0, llm_token_delay=0, tts_latency=0, perform_seconds=0, rounds=2)
+
+
+def test_percentile() -> None:
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(50, abs=1)
+    assert percentile(values, 99) == pytest.approx(99, abs=1)
+    assert percentile([], 95) == 0.0
+
+
+def test_timed_host_keeps_tool_metadata() -> None:
+    sink = {}
+    timed = timed_host_class(SpotlightHost, sink)()
+    names = {t.__name__ for t in timed.tools}
+    assert {"next_scene", "complete_improv", "finish_show", "session_status", "set_player"} <= names
+
+
+@pytest.mark.asyncio
+async def test_small_load_completes_every_show() -> None:
+    report = await run_load(5, FAST)
+
+    assert report.failures == []
+    assert len(report.tool_latencies["next_scene"]) == 5 * FAST.rounds
+    assert len(report.tool_latencies["complete_improv"]) == 5 * FAST.rounds
+    summary = report.summary()
+    assert summary["tool_calls"] == 5 * (2 * FAST.rounds + 1)
+    assert summary["loop_lag_p95_ms"] >= 0
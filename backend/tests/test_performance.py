@@ -0,0 +1,89 @@
+import pytest
+
+from agent import REACTION_CUES, REACTION_TEMPLATES
+from performance import PerformanceAnalyzer, choose_reaction
+
+SCENE = {
+    "title": "The Pirate Landlord",
+    "scenario": "You are a pirate landlord collecting rent in doubloons from tenants who paid in seashells.",
+}
+
+STRONG = [
+    "Ahoy tenants, the rent is due and I want my doubloons today",
+    "Seashells? You paid me in seashells? This ship is not a beach, matey",
+    "Fine, I shall accept one golden seashell, but the parrot stays with me",
+    "Next month the landlord expects treasure, or you walk the plank together",
+]
+
+WEAK = ["um so", "uh I am a", "um yeah"]
+
+
+def _perform(analyzer: PerformanceAnalyzer, lines, words_per_second: float, pause: float) -> None:
+    """
+    Each line is spoken as one utterance: an interim when it starts, a final when it ends.
+    """
+    t = 0.0
+    for line in lines:
+        analyzer.observe(line.split(" ")[0], is_final=False, at=t)
+        t += len(line.split()) / words_per_second
+        analyzer.observe(line, is_final=True, at=t)
+        t += pause
+
+
+def test_features_update_per_segment() -> None:
+    analyzer = PerformanceAnalyzer()
+    analyzer.start(SCENE)
+    _perform(analyzer, STRONG, words_per_second=2.5, pause=3.0)
+    p = analyzer.finish()
+
+    assert p.words == sum(len(line.split()) for line in STRONG)
+    assert p.rate == pytest.approx(2.5)
+    assert p.mean_pause == pytest.approx(3.0)
+    assert p.long_pause_share == 1.0 and p.pauses == [0, 0, 0, 3, 0]
+    assert 0.7 < p.diversity <= 1.0
+    assert p.coverage > 0.3  # pirate, landlord, rent, doubloons, seashells ...
+
+    # a new scene starts from nothing
+    analyzer.start(SCENE)
+    assert analyzer.finish().words == 0
+
+
+def test_tone_follows_the_performance() -> None:
+    strong, weak = PerformanceAnalyzer(), PerformanceAnalyzer()
+    strong.start(SCENE)
+    weak.start(SCENE)
+    _perform(strong, STRONG, words_per_second=2.5, pause=0.8)
+    _perform(weak, WEAK, words_per_second=1.0, pause=5.0)
+
+    tone, reaction = choose_reaction(strong.finish(), REACTION_TEMPLATES, REACTION_CUES)
+    assert tone == "positive" and reaction in REACTION_TEMPLATES["positive"]
+    tone, _ = choose_reaction(weak.finish(), REACTION_TEMPLATES, REACTION_CUES)
+    assert tone == "gentle_critique"
+
+    silent = PerformanceAnalyzer()
+    silent.start(SCENE)
+    assert choose_reaction(silent.finish(), REACTION_TEMPLATES, REACTION_CUES)[0] == "neutral"
+
+
+def test_fast_delivery_gets_the_rushed_critique_and_no_repeats() -> None:
+    analyzer = PerformanceAnalyzer()
+    analyzer.start(SCENE)
+    _perform(analyzer, ["so I um", "uh rent please now"], words_per_second=6.0, pause=4.0)
+    performance = analyzer.finish()
+
+    tone, first = choose_reaction(performance, REACTION_TEMPLATES, REACTION_CUES)
+    assert tone == "gentle_critique"
+    assert "rushed" in first
+    _, second = choose_reaction(performance, REACTION_TEMPLATES, REACTION_CUES, used=[first])
+    assert second != first
+
+
+def test_template_without_a_cue_is_refused() -> None:
+    assert all(len(REACTION_CUES[tone]) == len(lines) for tone, lines in REACTION_TEMPLATES.items())
+
+    analyzer = PerformanceAnalyzer()
+    analyzer.start(SCENE)
+    _perform(analyzer, ["so I um", "uh rent please now"], words_per_second=6.0, pause=4.0)
+    templates = {**REACTION_TEMPLATES, "gentle_critique": [*REACTION_TEMPLATES["gentle_critique"], "One more."]}
+    with pytest.raises(ValueError):
+        choose_reaction(analyzer.finish(), templates, REACTION_CUES)
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import pytest
+from livekit.agents import AgentSession, llm
+
+from agent import OPENING_LINE, SpotlightHost
+from player_identity import PlayerNameResolver, player_name_from_metadata
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeRoom, FakeTTS, ScriptedLLM
+
+
+def _meta(name: str) -> str:
+    return json.dumps({"playerName": name})
+
+
+def test_name_from_metadata() -> None:
+    assert player_name_from_metadata(_meta(" Ada ")) == "Ada"
+    assert player_name_from_metadata("not json") is None
+    assert player_name_from_metadata('["playerName"]') is None
+    assert player_name_from_metadata("") is None
+
+
+@pytest.mark.asyncio
+async def test_resolver_picks_up_late_metadata_and_prefers_it() -> None:
+    room = FakeRoom()
+    resolver = PlayerNameResolver(room)
+    seen = []
+    resolver.start()
+    resolver.subscribe(seen.append)
+
+    assert await resolver.wait(0.01) is None
+
+    room.join("guest-1")
+    assert resolver.name == "guest-1"
+    room.set_participant_metadata("guest-1", _meta("Ada"))
+    assert resolver.name == "Ada"
+    # room metadata ranks below the participant's own
+    room.set_metadata(_meta("Someone else"))
+    assert resolver.name == "Ada"
+    assert seen == ["guest-1", "Ada"]
+
+    resolver.stop()
+    room.join("guest-2", _meta("Grace"))
+    assert resolver.name == "Ada"
+
+
+@pytest.mark.asyncio
+async def test_greeting_starts_before_name_and_uses_late_name() -> None:
+    room = FakeRoom()
+    resolver = PlayerNameResolver(room)
+    resolver.start()
+    state = SessionState()
+    instructions = []
+
+    def script(chat_ctx: llm.ChatContext):
+        instructions.append([i.text_content for i in chat_ctx.items if i.type == "message"])
+        return "Here are the rules."
+
+    fake_tts = FakeTTS(latency=0)
+    session = AgentSession(llm=ScriptedLLM(script, ttft=0), tts=fake_tts)
+    session.output.audio = CaptureAudioOutput()
+    await session.start(SpotlightHost(state, player_names=resolver))
+    try:
+        await asyncio.sleep(0.05)
+        # the opening went out while the name was still unknown
+        assert OPENING_LINE in fake_tts.calls
+        room.join("guest-1", _meta("Ada"))
+        await asyncio.sleep(0.05)
+        assert state.player_name == "Ada"
+        # the greeting reply was generated with the name, not a request for it
+        assert any("Welcome Ada by name" in (text or "") for msgs in instructions for text in msgs)
+    finally:
+        await session.aclose()
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from providers import ProviderRegistry, plugins_for_session, stt_providers
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def test_import_agent_does_not_load_model_plugins() -> None:
+    code = "import sys, agent; print(','.join(m for m in sys.modules if m.startswith('livekit.plugins')))"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": SRC},
+    ).stdout.strip()
+    assert out == ""
+
+
+def test_registry_selects_by_env(monkeypatch) -> None:
+    registry = ProviderRegistry("stt", "TEST_STT", "a")
+    registry.register("a", "silero")(lambda mod: ("a", mod.__name__))
+    registry.register("b", "silero")(lambda mod: ("b", mod.__name__))
+
+    assert registry.create() == ("a", "livekit.plugins.silero")
+    monkeypatch.setenv("TEST_STT", "b")
+    assert registry.create()[0] == "b"
+
+    monkeypatch.setenv("TEST_STT", "nope")
+    with pytest.raises(ValueError, match="TEST_STT"):
+        registry.create()
+
+
+def test_session_plugins_follow_config(monkeypatch) -> None:
+    monkeypatch.setenv("SPOTLIGHT_STT", "assemblyai")
+    assert stt_providers.plugin_for() == "assemblyai"
+    assert "assemblyai" in plugins_for_session()
+    assert "deepgram" not in plugins_for_session()
@@ -0,0 +1,78 @@
+import pytest
+from livekit.agents import AgentSession, llm
+
+from agent import TracedSpotlightHost
+from replay import SessionRecorder, Trace, compare_traces, regressions, replay_show
+from session_state import SessionState
+from stand_ins import (
+    CaptureAudioOutput,
+    FakeTTS,
+    ScriptedLLM,
+    ToolCall,
+    last_item,
+    transcribe,
+)
+from tracing import TurnTracer
+
+
+def _script(chat_ctx: llm.ChatContext):
+    item = last_item(chat_ctx)
+    if item is None:
+        return None
+    if item.type == "message" and item.role == "user":
+        return ToolCall("next_scene")
+    if item.type == "function_call_output":
+        return "Here is your scene. Make it big."
+    return None
+
+
+def _texts(trace: Trace):
+    return ["".join(d[1] for d in e["d"]) for e in trace.of_kind("llm")]
+
+
+async def _record_show() -> Trace:
+    state = SessionState("recorded-show")
+    tracer = TurnTracer(state)
+    recorder = SessionRecorder(state.session_key)
+    session = AgentSession(llm=recorder.wrap_llm(ScriptedLLM(_script, ttft=0.08)), tts=FakeTTS(latency=0.03))
+    session.output.audio = CaptureAudioOutput()
+    tracer.attach(session)
+    recorder.attach(session, tracer)
+    try:
+        await session.start(TracedSpotlightHost(state, tracer=tracer))
+        transcribe(session, "I'm ready")
+        await session.run(user_input="I'm ready")
+    finally:
+        await session.aclose()
+    return recorder.trace
+
+
+@pytest.mark.asyncio
+async def test_recorded_show_replays_with_its_timings(tmp_path) -> None:
+    path = str(tmp_path / "show.trace.jsonl.gz")
+    trace = await _record_show()
+    trace.save(path)
+    recorded = Trace.load(path)
+    assert {"stt", "user", "llm", "tts", "stage"} <= {e["k"] for e in recorded.events}
+    assert any(call[1] == "next_scene" for e in recorded.of_kind("llm") for call in e["calls"])
+
+    replayed = await replay_show(recorded, lambda state, tracer: TracedSpotlightHost(state, tracer=tracer))
+
+    assert [e["text"] for e in replayed.of_kind("user")] == ["I'm ready"]
+    assert _texts(replayed) == _texts(recorded)
+    rows = compare_traces(recorded, replayed)
+    first_token = rows["llm_first_token"]
+    assert first_token["replayed_n"] == first_token["recorded_n"]
+    assert first_token["replayed_p50"] == pytest.approx(first_token["recorded_p50"], abs=40)
+    assert rows["tool:next_scene"]["replayed_n"] == 1
+    assert "llm_first_token" not in regressions(rows)
+
+
+def test_regressions_flag_slower_stages() -> None:
+    def trace(tool_ms: float) -> Trace:
+        events = [{"t": i, "k": "stage", "stage": "tool", "tool": "next_scene", "ms": tool_ms} for i in range(5)]
+        events.append({"t": 10, "k": "stage", "stage": "response", "ms": 500.0})
+        return Trace("show", 0.0, events)
+
+    assert regressions(compare_traces(trace(2.0), trace(40.0))) == ["tool", "tool:next_scene"]
+    assert regressions(compare_traces(trace(2.0), trace(15.0))) == []
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from agent import SpotlightHost
+from round_log import RoundLogStore, RoundLogWriter
+from session_state import SessionState
+
+
+def _record(player: str, i: int) -> dict:
+    return {"player_name": player, "round_index": i, "scenario_id": f"s-{i}", "reaction_tone": "neutral"}
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_and_flushes(tmp_path) -> None:
+    store = RoundLogStore(str(tmp_path / "rounds.db"))
+    writer = RoundLogWriter(store, batch_size=10, flush_interval=0.05)
+    batches = []
+    append_many = store.append_many
+    store.append_many = lambda records: (batches.append(len(records)), append_many(records))
+
+    for i in range(25):
+        await writer.put(_record("ana", i))
+    await writer.flush()
+
+    assert writer.written == 25
+    assert max(batches) == 10 and sum(batches) == 25
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_applies_backpressure(tmp_path) -> None:
+    store = RoundLogStore(str(tmp_path / "rounds.db"))
+    writer = RoundLogWriter(store, max_pending=2, batch_size=1, flush_interval=0)
+    loop = asyncio.get_running_loop()
+    release = asyncio.Event()
+    append_many = store.append_many
+
+    def slow_append(records):
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+        append_many(records)
+
+    store.append_many = slow_append
+
+    for i in range(3):  # one in flight, two queued
+        await writer.put(_record("ana", i))
+    blocked = asyncio.ensure_future(writer.put(_record("ana", 3)))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, 1)
+    await writer.aclose()
+    assert writer.written == 4
+
+
+@pytest.mark.asyncio
+async def test_player_history_pages_newest_first(tmp_path) -> None:
+    writer = RoundLogWriter(RoundLogStore(str(tmp_path / "rounds.db")), flush_interval=0.01)
+    for i in range(7):
+        await writer.put(_record("ana", i))
+        await writer.put(_record("ben", i))
+    await writer.flush()
+
+    page = await writer.rounds_for_player("ana", limit=3)
+    assert [r["round_index"] for r in page] == [6, 5, 4]
+    nxt = await writer.rounds_for_player("ana", limit=3, before_id=page[-1]["id"])
+    assert [r["round_index"] for r in nxt] == [3, 2, 1]
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_complete_improv_queues_round(tmp_path) -> None:
+    writer = RoundLogWriter(RoundLogStore(str(tmp_path / "rounds.db")), flush_interval=0.01)
+    host = SpotlightHost(SessionState("job-1"), round_log=writer)
+    await host.set_player(None, "Ana")
+    await host.next_scene(None)
+    host.state.transcript.append("hello")
+    await host.complete_improv(None)
+    await writer.flush()
+
+    (row,) = await writer.rounds_for_player("Ana")
+    assert row["session_key"] == "job-1"
+    assert row["player_text"] == "hello"
+    await writer.aclose()
+
+
+class BlockedLog:
+    """
+    Round log whose queue is full until `release` is set.
+    """
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.records = []
+
+    async def put(self, record: dict) -> None:
+        await self.release.wait()
+        self.records.append(record)
+
+
+@pytest.mark.asyncio
+async def test_completion_during_backpressure_is_not_recorded_twice() -> None:
+    log = BlockedLog()
+    host = SpotlightHost(SessionState("job-1"), round_log=log)
+    await host.next_scene(None)
+    host.state.transcript.append("hello")
+
+    first = asyncio.ensure_future(host.complete_improv(None))
+    await asyncio.sleep(0)
+    # e.g. the stop-phrase path while the LLM's call waits on the queue
+    assert "error" in await asyncio.wait_for(host.complete_improv(None), 1)
+
+    log.release.set()
+    await first
+    assert len(host.state.rounds) == 1 and len(log.records) == 1
+    assert host.state.current_round == 1
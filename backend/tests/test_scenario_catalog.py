@@ -0,0 +1,167 @@
+import json
+import os
+import random
+import sqlite3
+
+import pytest
+
+from scenario_catalog import CatalogStore, ScenarioDeck, load_catalog
+from scenario_store import CompiledCatalog, compile_catalog
+
+
+def _write_catalog(path, n: int) -> None:
+    scenarios = [
+        {
+            "id": f"s-{i}",
+            "title": f"Scene {i}",
+            "scenario": "...",
+            "category": "comedy" if i % 2 else "drama",
+            "difficulty": "easy" if i % 3 else "hard",
+        }
+        for i in range(n)
+    ]
+    path.write_text(json.dumps({"scenarios": scenarios}), encoding="utf-8")
+
+
+def test_catalog_indexes(tmp_path) -> None:
+    path = tmp_path / "scenarios.json"
+    _write_catalog(path, 12)
+    catalog = load_catalog(str(path))
+
+    assert len(catalog) == 12
+    assert catalog.get("s-3")["title"] == "Scene 3"
+    assert set(catalog.ids_for(category="comedy")) == {f"s-{i}" for i in range(1, 12, 2)}
+    assert set(catalog.ids_for(difficulty="hard")) == {"s-0", "s-3", "s-6", "s-9"}
+    assert catalog.ids_for(category="comedy", difficulty="hard") == ("s-3", "s-9")
+    with pytest.raises(TypeError):
+        catalog.by_id["new"] = {}  # type: ignore[index]
+
+
+def test_compiled_catalog_matches_json(tmp_path) -> None:
+    path = tmp_path / "scenarios.json"
+    _write_catalog(path, 12)
+    db = str(tmp_path / "scenarios.db")
+    assert compile_catalog(str(path), db) == 12
+
+    source = load_catalog(str(path))
+    compiled = load_catalog(db)
+    assert isinstance(compiled, CompiledCatalog)
+    assert len(compiled) == 12
+    assert compiled.ids == source.ids
+    assert compiled.at(3) == source.at(3) == source.get("s-3")
+    assert compiled.get("s-3")["title"] == "Scene 3"
+    assert compiled.get("nope") is None
+    for category, difficulty in [("comedy", None), (None, "hard"), ("comedy", "hard")]:
+        assert compiled.ids_for(category, difficulty) == source.ids_for(category, difficulty)
+
+
+def test_failed_compile_leaves_no_tmp_file(tmp_path) -> None:
+    path = tmp_path / "scenarios.json"
+    # a category sqlite can't store makes the insert fail
+    path.write_text(json.dumps({"scenarios": [{"id": "s-1", "category": {"bad": 1}}]}))
+    with pytest.raises(sqlite3.Error):
+        compile_catalog(str(path), str(tmp_path / "scenarios.db"))
+    assert os.listdir(tmp_path) == ["scenarios.json"]
+
+
+def test_deck_over_large_compiled_catalog_stays_small(tmp_path) -> None:
+    path = tmp_path / "scenarios.json"
+    _write_catalog(path, 5000)
+    db = str(tmp_path / "scenarios.db")
+    compile_catalog(str(path), db)
+    deck = ScenarioDeck(CatalogStore(db), rng=random.Random(3))
+
+    drawn = [deck.draw()["id"] for _ in range(50)]
+    assert len(set(drawn)) == 50
+    # only the swapped positions are remembered, not a shuffled copy of the catalog
+    assert len(deck._swaps) <= 50
+    assert deck.remaining() == 4950
+
+
+def test_missing_file_gives_empty_catalog(tmp_path) -> None:
+    catalog = load_catalog(str(tmp_path / "nope.json"))
+    assert len(catalog) == 0
+    deck = ScenarioDeck(CatalogStore(str(tmp_path / "nope.json")))
+    assert deck.draw() is None
+
+
+def test_deck_draws_without_repeats_then_resets(tmp_path) -> None:
+    path = tmp_path / "scenarios.json"
+    _write_catalog(path, 5)
+    deck = ScenarioDeck(CatalogStore(str(path)), rng=random.Random(7))
+
+    first = [deck.draw()["id"] for _ in range(5)]
+    assert sorted(first) == [f"s-{i}" for i in range(5)]
+    assert deck.remaining() == 0
+
+    # exhausted: everything is allowed again
+    assert deck.draw() is not None
+    assert len(deck.drawn) == 1
+
+
+@pytest.mark.asyncio
+async def test_reload_only_on_mtime_change(tmp_path) -> None:
+    path = tmp_path / "scenarios.json"
+    _write_catalog(path, 3)
+    store = CatalogStore(str(path))
+    store.load()
+    deck = ScenarioDeck(store)
+    drawn = deck.draw()["id"]
+
+    assert await store.refresh() is False
+    assert store.current.version == 0
+
+    _write_catalog(path, 6)
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+    assert await store.refresh() is True
+    assert store.current.version == 1
+    assert len(store.current) == 6
+
+    # deck picks up the new catalog but keeps its no-repeat history
+    rest = [deck.draw()["id"] for _ in range(5)]
+    assert drawn not in rest
+    assert len(set(rest)) == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_previous_catalog(tmp_path) -> None:
+    path = tmp_path / "scenarios.json"
+    _write_catalog(path, 3)
+    store = CatalogStore(str(path))
+    store.load()
+
+    # read halfway through a save
+    path.write_text('{"scenarios": [{"id": "s-0", "ti', encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+    assert await store.refresh() is False
+    assert len(store.current) == 3 and store.current.version == 0
+
+    # the save completes: the next poll picks it up
+    _write_catalog(path, 4)
+    os.utime(path, (st.st_atime, st.st_mtime + 20))
+    assert await store.refresh() is True
+    assert len(store.current) == 4
+
+
+@pytest.mark.asyncio
+async def test_json_edits_recompile_and_close_the_old_catalog(tmp_path) -> None:
+    path = tmp_path / "scenarios.json"
+    _write_catalog(path, 3)
+    db = str(tmp_path / "scenarios.db")
+    compile_catalog(str(path), db)
+    store = CatalogStore(db, source=str(path))
+    old = store.load()
+    assert isinstance(old, CompiledCatalog) and len(old) == 3
+
+    _write_catalog(path, 5)
+    st = os.stat(db)
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+    assert await store.refresh() is True
+    assert isinstance(store.current, CompiledCatalog) and len(store.current) == 5
+    assert os.stat(db).st_mtime >= os.stat(path).st_mtime
+    # the replaced catalog's connection (and its mmap) is released
+    with pytest.raises(sqlite3.ProgrammingError):
+        old.get("s-0")
+    assert await store.refresh() is False
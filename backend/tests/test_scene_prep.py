@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from agent import SpotlightHost
+from scene_prep import ScenePrep
+from session_state import SessionState
+from stand_ins import FakeTTS
+
+SCENES = [{"id": f"s{i}", "title": f"Scene {i}", "scenario": f"Scenario {i}."} for i in range(3)]
+
+
+def _prep() -> ScenePrep:
+    deck = list(SCENES)
+    return ScenePrep(lambda: deck.pop(0) if deck else None, lambda n, s: f"Round {n}. {s['scenario']} Go!")
+
+
+@pytest.mark.asyncio
+async def test_prepared_intro_audio_is_rendered_ahead() -> None:
+    synth = FakeTTS(latency=0)
+    prep = _prep()
+    prep.prepare(1, synth)
+    await asyncio.sleep(0.05)
+
+    prepared = prep.take(1)
+    assert prepared.scene["id"] == "s0"
+    assert prepared.has_audio and prepared.first_audio_at is not None
+    frames = [f async for f in prepared.audio()]
+    assert frames
+    assert synth.calls == ["Round 1.", "Scenario 0.", "Go!"]
+    assert prep.take(2) is None
+
+
+@pytest.mark.asyncio
+async def test_wrong_round_keeps_scene_but_rewrites_intro() -> None:
+    prep = _prep()
+    prep.prepare(2, FakeTTS(latency=0.5))
+    prepared = prep.take(1)
+    assert prepared.scene["id"] == "s0"
+    assert prepared.intro.startswith("Round 1.")
+    assert not prepared.has_audio
+
+
+@pytest.mark.asyncio
+async def test_finish_show_cancels_speculative_round() -> None:
+    state = SessionState()
+    host = SpotlightHost(state)
+    host.scene_prep.prepare(2, FakeTTS(latency=10))
+    pending = host.scene_prep.pending
+
+    await host.finish_show(None)
+
+    assert host.scene_prep.pending is None
+    await asyncio.sleep(0)
+    assert pending._task.cancelled() or pending._task.done()
@@ -0,0 +1,70 @@
+import asyncio
+import random
+import tracemalloc
+
+import pytest
+
+from agent import SpotlightHost
+from session_state import SessionRegistry
+
+NUM_SESSIONS = 300
+
+
+async def _play_show(host: SpotlightHost, name: str) -> None:
+    await host.set_player(None, name)
+    for _ in range(host.state.max_rounds):
+        await host.next_scene(None)
+        # yield so other shows interleave between tool calls
+        await asyncio.sleep(random.random() * 0.002)
+        host.state.transcript.append(f"{name} performs")
+        await host.complete_improv(None)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sessions_stay_isolated() -> None:
+    """
+    Hundreds of simulated shows on one event loop must never see each
+    other's players, rounds or scenarios.
+    """
+    reg = SessionRegistry()
+    hosts = {}
+    for i in range(NUM_SESSIONS):
+        key = f"job-{i}"
+        hosts[key] = SpotlightHost(reg.acquire(key))
+
+    await asyncio.gather(*(_play_show(h, key) for key, h in hosts.items()))
+
+    assert len(reg) == NUM_SESSIONS
+    for key, host in hosts.items():
+        st = reg.get(key)
+        assert st is host.state
+        assert st.player_name == key
+        assert st.phase == "finished"
+        assert st.current_round == st.max_rounds
+        assert all(r["player_text"] == f"{key} performs" for r in st.rounds)
+        ids = [r["scenario_id"] for r in st.rounds]
+        assert len(ids) == len(set(ids))
+
+    for key in hosts:
+        reg.release(key)
+        reg.release(key)  # idempotent
+    assert len(reg) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_per_session() -> None:
+    """
+    Reports the Python heap cost of one finished show (host + state).
+    """
+    reg = SessionRegistry()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    hosts = [SpotlightHost(reg.acquire(f"job-{i}")) for i in range(100)]
+    await asyncio.gather(*(_play_show(h, f"p{i}") for i, h in enumerate(hosts)))
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_session = (after - before) / len(hosts)
+    print(f"\nheap per finished session: {per_session / 1024:.1f} KiB")
+    assert per_session < 256 * 1024
@@ -0,0 +1,146 @@
+import pytest
+from livekit.agents import AgentSession, StopResponse, UserInputTranscribedEvent, llm
+
+from agent import SpotlightHost
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM, transcribe
+from stop_phrases import StopPhraseSpotter, edit_distance
+
+PHRASES = {"end scene": "end_scene", "stop game": "stop_game", "end show": "stop_game"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_edit_distance() -> None:
+    assert edit_distance("and scene", "end scene", 1) == 1
+    assert edit_distance("abc", "abcdef", 1) == 2
+
+
+def test_matches_phrase_only_at_the_very_end() -> None:
+    spotter = StopPhraseSpotter(PHRASES)
+    assert spotter.match("so the soup wins. End scene!") == "end_scene"
+    assert spotter.match("STOP GAME") == "stop_game"
+    # mentioned mid-sentence, or followed by more words
+    assert spotter.match("the end scene of the movie was great") is None
+    assert spotter.match("the end scene of") is None
+    assert spotter.match("end scene please") is None
+    assert spotter.match("") is None
+
+
+def test_fuzzy_match_keeps_word_boundaries() -> None:
+    spotter = StopPhraseSpotter(PHRASES)
+    # mis-heard endings of the configured phrases
+    assert spotter.match("okay end scenes") == "end_scene"
+    assert spotter.match("ends scene") == "end_scene"
+    assert spotter.match("stop games") == "stop_game"
+    # a different word one edit away is ordinary speech
+    assert spotter.match("let me show you and show") is None
+    assert spotter.match("okay and scene") is None
+    # one edit in total, not one per word
+    assert spotter.match("ends scenes") is None
+
+
+def test_interim_acts_once_stable_or_confirmed() -> None:
+    spotter = StopPhraseSpotter(PHRASES)
+    assert spotter.feed("and then it sings, end scene", is_final=False) is None
+    assert spotter.feed("and then it sings, end scene", is_final=False) == "end_scene"
+
+    # the player kept talking: the tail moved on
+    assert spotter.feed("the end scene", is_final=False) is None
+    assert spotter.feed("the end scene of", is_final=False) is None
+    assert spotter.feed("the end scene of the movie", is_final=True) is None
+
+    # a final confirms a single interim
+    assert spotter.feed("so end scene", is_final=False) is None
+    assert spotter.feed("so end scene", is_final=True) == "end_scene"
+
+
+def test_debounce_fires_once_per_utterance() -> None:
+    clock = FakeClock()
+    spotter = StopPhraseSpotter(PHRASES, debounce=2.0, clock=clock)
+    assert spotter.fire(spotter.feed("and end scene"))
+    clock.now = 0.4
+    assert not spotter.fire(spotter.feed("and end scene."))
+    assert spotter.recently_fired("end_scene")
+    clock.now = 3.0
+    assert spotter.fire(spotter.feed("end scene"))
+
+
+def test_cut_before_keeps_the_performance() -> None:
+    spotter = StopPhraseSpotter(PHRASES)
+    assert spotter.cut_before("I juggle the soup, end scene") == "I juggle the soup"
+    assert spotter.cut_before("no stop phrase here") == "no stop phrase here"
+
+
+@pytest.mark.asyncio
+async def test_spotted_end_scene_reacts_without_llm_turn() -> None:
+    clock = FakeClock()
+    state = SessionState()
+    scripted = ScriptedLLM(lambda _ctx: None, ttft=0)
+    session = AgentSession(llm=scripted, tts=FakeTTS(latency=0))
+    session.output.audio = CaptureAudioOutput()
+    host = SpotlightHost(state, stop_phrases=StopPhraseSpotter(PHRASES, clock=clock))
+    await session.start(host)
+    try:
+        await host.next_scene(None)
+        transcribe(session, "I juggle the talking soup.")
+        requests = scripted.requests
+        # one interim ending on the phrase is not acted on, the next that agrees is
+        interim = UserInputTranscribedEvent(transcript="and then it sings, end scene", is_final=False)
+        session.emit("user_input_transcribed", interim)
+        assert host._stop_task is None
+        session.emit("user_input_transcribed", interim)
+        assert host._stop_task is not None
+        # the final of the same utterance arrives while the reaction starts
+        session.emit(
+            "user_input_transcribed",
+            UserInputTranscribedEvent(transcript="and then it sings, end scene", is_final=True),
+        )
+        await host._stop_task
+
+        assert state.rounds[0]["player_text"] == "I juggle the talking soup. and then it sings"
+        assert state.current_round == 1
+        assert scripted.requests == requests
+        # the committed "End scene" turn is swallowed instead of reaching the LLM,
+        # even when endpointing took longer than the debounce
+        clock.now = 10.0
+        with pytest.raises(StopResponse):
+            await host.on_user_turn_completed(
+                session.history, llm.ChatMessage(role="user", content=["End scene."])
+            )
+        assert state.current_scenario["id"] != state.rounds[0]["scenario_id"]
+        # a late complete_improv between scenes changes nothing
+        state.phase = "reacting"
+        assert "error" in await host.complete_improv(None)
+        assert state.current_round == 1 and len(state.rounds) == 1
+    finally:
+        await session.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stop_game_asks_for_confirmation_first() -> None:
+    clock = FakeClock()
+    state = SessionState()
+    session = AgentSession(llm=ScriptedLLM(lambda _ctx: None, ttft=0), tts=FakeTTS(latency=0))
+    session.output.audio = CaptureAudioOutput()
+    host = SpotlightHost(state, stop_phrases=StopPhraseSpotter(PHRASES, clock=clock))
+    await session.start(host)
+    try:
+        await host.next_scene(None)
+        transcribe(session, "I'll show you the way to the end show")
+        assert host._stop_task is None
+        assert state.phase == "waiting_for_improv"
+        assert "I'll show you the way to the" in state.transcript.text()
+
+        clock.now = 3.0
+        transcribe(session, "End show.")
+        await host._stop_task
+        assert state.phase == "finished"
+    finally:
+        await session.aclose()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from livekit.agents import AgentSession, llm
+from prometheus_client import REGISTRY
+
+from agent import SpotlightHost, TracedSpotlightHost
+from session_state import SessionState
+from stand_ins import CaptureAudioOutput, FakeTTS, ScriptedLLM, ToolCall, last_item
+from tracing import TraceFile, TurnTracer
+
+
+def _script(chat_ctx: llm.ChatContext):
+    item = last_item(chat_ctx)
+    if item is None:
+        return None
+    if item.type == "message" and item.role == "user":
+        return ToolCall("next_scene")
+    if item.type == "function_call_output":
+        return "Here is your scene."
+    return None
+
+
+def _tool_count(name: str) -> float:
+    return REGISTRY.get_sample_value("spotlight_tool_seconds_count", {"tool": name}) or 0.0
+
+
+def test_traced_host_keeps_every_tool() -> None:
+    plain = {t.__name__ for t in SpotlightHost().tools}
+    traced = {t.__name__ for t in TracedSpotlightHost().tools}
+    assert traced == plain
+
+
+@pytest.mark.asyncio
+async def test_tracer_records_stages_per_round(tmp_path) -> None:
+    state = SessionState("trace-test")
+    trace = TraceFile(str(tmp_path / "trace.jsonl"))
+    tracer = TurnTracer(state, trace)
+    before = _tool_count("next_scene")
+
+    session = AgentSession(llm=ScriptedLLM(_script, ttft=0.01), tts=FakeTTS(latency=0.01))
+    session.output.audio = CaptureAudioOutput()
+    tracer.attach(session)
+    try:
+        await session.start(TracedSpotlightHost(state, tracer=tracer))
+        await session.run(user_input="I'm ready")
+    finally:
+        await session.aclose()
+    trace.close()
+
+    assert _tool_count("next_scene") == before + 1
+    assert len(tracer.rounds[1]["tool"]) == 1
+    stages = {stage for timings in tracer.rounds.values() for stage in timings}
+    assert {"llm_first_token", "tts_first_byte"} <= stages
+
+    records = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    assert {"session": "trace-test", "round": 1, "stage": "tool", "tool": "next_scene"}.items() <= next(
+        r for r in records if r["stage"] == "tool"
+    ).items()
@@ -0,0 +1,21 @@
+from transcript_buffer import TranscriptBuffer
+
+
+def test_joins_segments_and_strips_end_phrase() -> None:
+    buf = TranscriptBuffer()
+    buf.append("I sold ice ")
+    buf.append("")
+    buf.append("to a penguin. Okay, end scene!")
+    assert buf.text() == "I sold ice to a penguin. Okay"
+
+    buf.clear()
+    assert buf.text() == "" and len(buf) == 0
+
+
+def test_cap_bounds_memory_and_marks_truncation() -> None:
+    buf = TranscriptBuffer(max_chars=20)
+    for _ in range(100):
+        buf.append("la la la la")
+    assert len(buf) == 20
+    assert buf.dropped == 100 * 11 - 20
+    assert buf.text().endswith(" ...")
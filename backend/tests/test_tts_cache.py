@@ -0,0 +1,71 @@
+import pytest
+from livekit.agents import tokenize
+
+from stand_ins import SAMPLE_RATE, FakeTTS
+from tts_cache import CachedTTS, cache_key
+
+
+def test_key_normalizes_whitespace_but_not_voice() -> None:
+    assert cache_key("v", "s", "p", "Hello  there ") == cache_key("v", "s", "p", "Hello there")
+    assert cache_key("v", "s", "p", "Hello") != cache_key("other", "s", "p", "Hello")
+    assert cache_key("v", "s", "p", "Hello") != cache_key("v", "s", "p", "hello")
+
+
+@pytest.mark.asyncio
+async def test_memory_hit_skips_inner_tts() -> None:
+    inner = FakeTTS()
+    cached = CachedTTS(inner, voice="v")
+
+    first = await cached.synthesize("Great energy throughout!").collect()
+    second = await cached.synthesize("Great  energy throughout!").collect()
+
+    assert inner.calls == ["Great energy throughout!"]
+    assert first.duration == pytest.approx(second.duration)
+    stats = cached.stats.snapshot()
+    assert stats["misses"] == 1 and stats["memory_hits"] == 1
+    assert stats["avg_hit_ttfb_ms"] < stats["avg_miss_ttfb_ms"]
+
+
+@pytest.mark.asyncio
+async def test_disk_store_survives_new_instance(tmp_path) -> None:
+    cached = CachedTTS(FakeTTS(), voice="v", cache_dir=str(tmp_path))
+    await cached.synthesize("Nice phrasing.").collect()
+
+    inner = FakeTTS()
+    fresh = CachedTTS(inner, voice="v", cache_dir=str(tmp_path))
+    frame = await fresh.synthesize("Nice phrasing.").collect()
+
+    assert inner.calls == []
+    assert fresh.stats.disk_hits == 1
+    assert frame.sample_rate == SAMPLE_RATE
+
+
+@pytest.mark.asyncio
+async def test_persist_filter_and_lru_bound(tmp_path) -> None:
+    cached = CachedTTS(
+        FakeTTS(latency=0),
+        voice="v",
+        cache_dir=str(tmp_path),
+        persist=lambda text: text == "keep",
+    )
+    await cached.synthesize("keep").collect()
+    one_line = cached.memory.size
+    cached.memory.max_bytes = one_line * 2
+    for text in ("aaaa", "bbbb", "cccc"):
+        await cached.synthesize(text).collect()
+
+    assert cached.memory.size <= one_line * 2
+    assert len(cached.memory) == 2
+    assert len(list(tmp_path.rglob("*.wav"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_renders_each_sentence_once(tmp_path) -> None:
+    inner = FakeTTS(latency=0)
+    cached = CachedTTS(inner, voice="v", cache_dir=str(tmp_path))
+    tokenizer = tokenize.basic.SentenceTokenizer(min_sentence_len=2)
+    lines = ["Great energy throughout! Consider letting it breathe.", "Great energy throughout!"]
+
+    assert await cached.warm(lines, tokenizer) == 2
+    assert await cached.warm(lines, tokenizer) == 0
+    assert len(inner.calls) == 2
@@ -0,0 +1,35 @@
+import agent
+from warmup import REPORT_KEY, run_prewarm, take_asset
+
+
+def _boom():
+    raise RuntimeError("no model files")
+
+
+def test_run_prewarm_records_each_step() -> None:
+    userdata = {}
+    report = run_prewarm(
+        userdata,
+        [("prompt", lambda: "hello"), ("vad", _boom), ("empty", lambda: None)],
+    )
+
+    assert userdata["prompt"] == "hello"
+    assert "vad" not in userdata and "empty" not in userdata
+    assert report["prompt"]["ok"] and not report["vad"]["ok"]
+    assert report["vad"]["error"] == "no model files"
+    assert userdata[REPORT_KEY] is report
+
+
+def test_take_asset_falls_back_to_factory() -> None:
+    userdata = {"llm": "prewarmed"}
+    calls = []
+
+    assert take_asset(userdata, "llm", lambda: calls.append(1)) == "prewarmed"
+    assert take_asset(userdata, "stt", lambda: "built") == "built"
+    assert userdata["stt"] == "built"
+    assert calls == []
+
+
+def test_prewarm_steps_cover_session_assets() -> None:
+    names = [name for name, _ in agent.prewarm_steps()]
+    assert names == ["catalog", "host_prompt", "vad", "stt", "llm", "tts", "noise_cancellation"]
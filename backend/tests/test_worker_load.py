@@ -0,0 +1,161 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from livekit.agents import WorkerOptions, worker
+from livekit.agents.ipc import proc_pool
+from livekit.agents.worker import AgentServer
+
+import agent
+from agent import LOAD_THRESHOLD, entrypoint, report_load, worker_load_options
+from worker_load import LoopLagProbe, WorkerLoad, read_loop_lags
+
+SHOW_CPU = 0.12
+BASE_CPU = 0.05
+MAX_IDLE = 4
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_load_is_the_worse_of_cpu_and_loop_lag() -> None:
+    lags = {}
+    load = WorkerLoad(threshold=0.7, lag_budget=0.1, cpu=lambda: 0.2, lags=lambda: lags)
+    assert load.update(active_jobs=2) == pytest.approx(0.2)
+
+    lags["AJ_1234"] = 0.08
+    assert load.update(active_jobs=2) == pytest.approx(0.8)
+    assert load.job_cost == pytest.approx(0.4)
+
+
+def test_burst_between_samples_is_refused_before_threshold() -> None:
+    clock = FakeClock()
+    load = WorkerLoad(threshold=0.7, job_cost=0.2, cpu=lambda: 0.1, lags=dict, clock=clock)
+    load.update(active_jobs=0)
+
+    # no new sample arrives during the burst: admitted shows still count
+    assert [load.admit() for _ in range(4)] == [True, True, False, False]
+
+    # once they are running (or the estimate settles) there is room again
+    clock.now += load.settle
+    assert load.admit()
+
+
+class FakeProcPool:
+    """
+    Stands in for LiveKit's ProcPool inside a real AgentServer: holds the
+    running shows and records the warm-pool size the server asks for.
+    """
+
+    def __init__(self, **_kwargs):
+        self.processes = []
+        self.samples = []  # (target idle processes, running shows)
+
+    def on(self, *_args) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def set_target_idle_processes(self, num_idle_processes: int) -> None:
+        self.samples.append((num_idle_processes, len(self.processes)))
+
+    async def sampled(self, count: int) -> None:
+        target = len(self.samples) + count
+
+        async def wait() -> None:
+            while len(self.samples) < target:
+                await asyncio.sleep(0.001)
+
+        await asyncio.wait_for(wait(), 5)
+
+
+@pytest.mark.asyncio
+async def test_simulated_traffic_sizes_pool_and_refuses_bursts(monkeypatch) -> None:
+    """
+    Shows arrive in bursts against a worker whose CPU grows with each one.
+    LiveKit's own load loop samples report_load and sizes the warm pool: the
+    pool shrinks as headroom runs out and regrows as shows end, and bursts
+    are refused before the reported load crosses the threshold.
+    """
+    clock = FakeClock()
+    pools = []
+    monkeypatch.setattr(worker, "UPDATE_LOAD_INTERVAL", 0.001)
+    monkeypatch.setattr(worker._InferenceRunner, "registered_runners", {})
+    monkeypatch.setattr(proc_pool, "ProcPool", lambda **kw: pools.append(FakeProcPool(**kw)) or pools[-1])
+    load = WorkerLoad(
+        threshold=LOAD_THRESHOLD,
+        job_cost=SHOW_CPU,
+        cpu=lambda: BASE_CPU + SHOW_CPU * len(pools[0].processes),
+        lags=dict,
+        clock=clock,
+    )
+    monkeypatch.setattr(agent, "_worker_load", load)
+    for name, value in [("LIVEKIT_URL", "ws://localhost"), ("LIVEKIT_API_KEY", "key"), ("LIVEKIT_API_SECRET", "secret")]:
+        monkeypatch.setenv(name, value)
+
+    options = {**worker_load_options(), "num_idle_processes": MAX_IDLE}
+    server = AgentServer.from_server_options(
+        WorkerOptions(entrypoint_fnc=entrypoint, port=0, **options)
+    )
+    running = asyncio.ensure_future(server.run(devmode=False, unregistered=True))
+    while not pools:
+        await asyncio.sleep(0.001)
+    pool = pools[0]
+    await pool.sampled(1)
+
+    refused, peak = 0, 0.0
+    try:
+        for tick in range(120):
+            clock.now = tick * 0.5
+            pool.processes[:] = [p for p in pool.processes if p.ends > clock.now]
+            # a burst of 6 requests every 10 s, one request every other tick otherwise
+            for _ in range(6 if tick % 20 == 0 else tick % 2):
+                if await asyncio.to_thread(load.admit):
+                    pool.processes.append(SimpleNamespace(running_job=object(), ends=clock.now + 15.0))
+                else:
+                    refused += 1
+            # one sample may have started before the arrivals; the next sees them
+            await pool.sampled(2)
+            peak = max(peak, load.load)
+    finally:
+        await server.aclose()
+        await running
+
+    targets = [target for target, _ in pool.samples]
+    assert refused > 0
+    assert peak <= LOAD_THRESHOLD
+    assert targets[0] == MAX_IDLE and min(targets) <= 1
+    # the pool grows back once shows finish and free headroom
+    assert max(targets[targets.index(min(targets)):]) > min(targets)
+
+
+def test_pool_size_left_to_livekit_unless_configured() -> None:
+    assert "num_idle_processes" not in worker_load_options()
+    server = AgentServer.from_server_options(WorkerOptions(entrypoint_fnc=entrypoint, **worker_load_options()))
+    assert server._load_fnc is report_load
+    assert server._load_threshold == LOAD_THRESHOLD
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_probe_reports_blocked_loop(tmp_path) -> None:
+    probe = LoopLagProbe(str(tmp_path), "AJ_test", interval=0.01, window=0.2)
+    probe.start()
+    await asyncio.sleep(0.05)
+    time.sleep(0.15)  # block the loop like a stuck audio callback would
+    await asyncio.sleep(0.3)
+
+    lags = read_loop_lags(str(tmp_path))
+    assert lags["AJ_test"] >= 0.1
+
+    await probe.stop()
+    assert read_loop_lags(str(tmp_path)) == {}
@@ -7,7 +7,7 @@ import { NextRequest, NextResponse } from 'next/server';
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json();
-    const { player_name, room_config } = body;
+    const { player_name, player_id, room_config } = body;
 
     // Get environment variables
     const apiKey = process.env.LIVEKIT_API_KEY;
@@ -18,8 +18,11 @@ export async function POST(request: NextRequest) {
       throw new Error('Server misconfigured');
     }
 
-    // Create a unique room name
-    const roomName = `improv-${Date.now()}`;
+    // Create a unique room name. The player id in it lets the agent find the
+    // show's checkpoint when the player reconnects (backend/src/checkpoint.py)
+    const playerId =
+      typeof player_id === 'string' && /^[A-Za-z0-9-]{1,64}$/.test(player_id) ? player_id : null;
+    const roomName = playerId ? `improv-${playerId}-${Date.now()}` : `improv-${Date.now()}`;
     const participantName = player_name || 'Player';
 
     // Create access token
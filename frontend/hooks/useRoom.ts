@@ -3,6 +3,18 @@ import { Room, RoomEvent, TokenSource } from 'livekit-client';
 import { AppConfig } from '@/app-config';
 import { toastAlert } from '@/components/livekit/alert-toast';
 
+const PLAYER_ID_KEY = 'playerId';
+
+// Stable per browser, so the agent can resume a show after a reconnect
+function getPlayerId(): string {
+  let playerId = localStorage.getItem(PLAYER_ID_KEY);
+  if (!playerId) {
+    playerId = crypto.randomUUID();
+    localStorage.setItem(PLAYER_ID_KEY, playerId);
+  }
+  return playerId;
+}
+
 export function useRoom(appConfig: AppConfig) {
   const aborted = useRef(false);
   const room = useMemo(() => new Room(), []);
@@ -60,6 +72,7 @@ export function useRoom(appConfig: AppConfig) {
             },
             body: JSON.stringify({
               player_name: playerName, // ← CRITICAL: Send player name
+              player_id: getPlayerId(),
               room_config: appConfig.agentName
                 ? {
                     agents: [{ agent_name: appConfig.agentName }],